@@ -1,5 +1,26 @@
 from django.contrib import admin
 
-from book.models import Book
+from book.models import Book, BookStats, Notification
 
 admin.site.register(Book)
+admin.site.register(Notification)
+
+
+@admin.register(BookStats)
+class BookStatsAdmin(admin.ModelAdmin):
+    list_display = (
+        "book",
+        "active_loans",
+        "total_loans",
+        "average_loan_days",
+        "overdue_returns",
+    )
+    list_select_related = ("book",)
+    ordering = ("-total_loans",)
+    search_fields = ("book__title",)
+
+    def has_add_permission(self, request) -> bool:
+        return False
+
+    def has_change_permission(self, request, obj=None) -> bool:
+        return False
@@ -0,0 +1,212 @@
+import math
+from functools import wraps
+from typing import Any, Callable
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.db.models import QuerySet
+from django.http import HttpResponse
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from book.fast_serializers import ValuesSerializer
+from book.pagination import LibraryPagination
+from book.renderers import FastJSONRenderer
+from user.authentication import has_user_claims
+
+JSON_MEDIA_TYPES = ("", "*/*", "application/json")
+
+
+class Fallback(Exception):
+    """Hand the request over to the synchronous DRF view."""
+
+
+def accepts_json(request) -> bool:
+    media_type = request.headers.get("Accept", "").split(",")[0]
+
+    return (
+        "format" not in request.GET
+        and media_type.split(";")[0].strip() in JSON_MEDIA_TYPES
+    )
+
+
+def async_read_view(sync_view: Callable) -> Callable:
+    """Serve plain JSON ``GET`` requests with the decorated coroutine.
+
+    Everything else (writes, the browsable API, errors, cursor pages)
+    goes to ``sync_view`` in a worker thread, as does any request the
+    coroutine gives up on by raising ``Fallback``. The async path only
+    covers the common case; the DRF view stays the reference.
+    """
+    fallback = sync_to_async(sync_view)
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        async def view(request, *args, **kwargs) -> Any:
+            if request.method == "GET" and accepts_json(request):
+                try:
+                    return await func(request, *args, **kwargs)
+                except Fallback:
+                    pass
+
+            return await fallback(request, *args, **kwargs)
+
+        view.csrf_exempt = True
+        return view
+
+    return decorator
+
+
+async def authenticate(request) -> Any:
+    """The user of the request's JWT, or ``AnonymousUser`` without one.
+
+    With ``JWT_STATELESS_AUTH`` the user is built from the token's claims,
+    as ``StatelessJWTAuthentication`` does.
+    Invalid tokens and unknown or inactive users fall back, so the sync
+    view answers them with its usual 401.
+    """
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+
+    if header is None:
+        return AnonymousUser()
+
+    try:
+        raw_token = authentication.get_raw_token(header)
+        if raw_token is None:
+            return AnonymousUser()
+        token = authentication.get_validated_token(raw_token)
+        user_id = token[jwt_settings.USER_ID_CLAIM]
+    except (APIException, KeyError):
+        raise Fallback
+
+    if settings.JWT_STATELESS_AUTH and has_user_claims(token):
+        return jwt_settings.TOKEN_USER_CLASS(token)
+
+    user = await get_user_model().objects.filter(
+        **{jwt_settings.USER_ID_FIELD: user_id}
+    ).afirst()
+
+    if user is None or not user.is_active:
+        raise Fallback
+
+    return user
+
+
+def _throttle_durations(request: Request, view: Any) -> list:
+    # Every throttle records the request, as in APIView.check_throttles.
+    return [
+        throttle.wait()
+        for throttle in (
+            throttle_class() for throttle_class in APIView.throttle_classes
+        )
+        if not throttle.allow_request(request, view)
+    ]
+
+
+async def api_request(request, view: Any = None) -> Request:
+    """Wrap ``request`` for DRF, authenticated and throttled, with the
+    ``throttle_scope`` of ``view`` if it has one.
+
+    The outcome is kept on ``request``, so if the sync view takes over it
+    reuses it through ``AsyncThrottleMixin`` instead of throttling again.
+    """
+    drf_request = Request(request)
+    drf_request.user = await authenticate(request)
+
+    durations = await sync_to_async(_throttle_durations)(drf_request, view)
+    request.throttle_durations = durations
+
+    if durations:
+        raise Fallback
+
+    return drf_request
+
+
+class AsyncThrottleMixin:
+    """Skip throttling requests the async view already throttled."""
+
+    def check_throttles(self, request) -> None:
+        durations = getattr(request._request, "throttle_durations", None)
+
+        if durations is None:
+            return super().check_throttles(request)
+
+        if durations:
+            self.throttled(
+                request,
+                max(
+                    (
+                        duration for duration in durations
+                        if duration is not None
+                    ),
+                    default=None,
+                ),
+            )
+
+
+async def paginate(
+    request: Request, queryset: QuerySet, serializer: ValuesSerializer
+) -> dict:
+    """The page ``LibraryPagination`` would return for ``queryset``."""
+    pagination = LibraryPagination()
+    page_query_param = pagination.page_query_param
+
+    cursor_query_param = pagination.keyset_pagination_class.cursor_query_param
+    if cursor_query_param in request.query_params:
+        raise Fallback
+
+    page_size = pagination.get_page_size(request)
+    count = await queryset.acount()
+    num_pages = max(math.ceil(count / page_size), 1)
+
+    page = request.query_params.get(page_query_param, 1)
+    if page in pagination.last_page_strings:
+        page = num_pages
+
+    try:
+        page = int(page)
+    except (TypeError, ValueError):
+        raise Fallback
+
+    if not 1 <= page <= num_pages:
+        raise Fallback
+
+    offset = (page - 1) * page_size
+    rows = [
+        row async for row in serializer.values(queryset)[
+            offset:offset + page_size
+        ]
+    ]
+
+    url = request.build_absolute_uri()
+    next_link = previous_link = None
+
+    if page < num_pages:
+        next_link = replace_query_param(url, page_query_param, page + 1)
+    if page == 2:
+        previous_link = remove_query_param(url, page_query_param)
+    elif page > 2:
+        previous_link = replace_query_param(url, page_query_param, page - 1)
+
+    return {
+        "count": count,
+        "next": next_link,
+        "previous": previous_link,
+        "results": serializer.serialize(rows),
+    }
+
+
+def json_response(data: Any) -> HttpResponse:
+    response = HttpResponse(
+        FastJSONRenderer().render(data), content_type="application/json"
+    )
+    response["Vary"] = "Accept"
+
+    return response
@@ -0,0 +1,133 @@
+from typing import Any, Callable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+
+from book.async_api import (
+    Fallback,
+    api_request,
+    async_read_view,
+    json_response,
+    paginate,
+)
+from book.cache import (
+    CATALOG_HITS_KEY,
+    CATALOG_MISSES_KEY,
+    _aincrement,
+    acatalog_cache_key,
+)
+from book.conditional import (
+    list_version_aggregates,
+    set_version_headers,
+    version_etag,
+    version_last_modified,
+)
+from book.fast_serializers import BookValuesSerializer
+from book.views import BookViewSet
+from library_service.replicas import CATALOG_PIN, replica_reads, user_pin
+
+book_list_view = BookViewSet.as_view(
+    {"get": "list", "post": "create"}, basename="book", detail=False
+)
+book_detail_view = BookViewSet.as_view(
+    {
+        "get": "retrieve",
+        "put": "update",
+        "patch": "partial_update",
+        "delete": "destroy",
+    },
+    basename="book",
+    detail=True,
+)
+
+
+def _cache_timeout() -> int:
+    return BookViewSet.cache_timeout or settings.BOOK_CATALOG_CACHE_TIMEOUT
+
+
+async def _conditional_catalog_response(
+    request,
+    version_of: Callable,
+    data_of: Callable,
+    with_last_modified: bool = True,
+) -> Any:
+    """``BookViewSet``'s conditional, cached response, sharing its cache
+    entries. Lists go without ``Last-Modified``, as in
+    ``ConditionalGetMixin``."""
+    key = await acatalog_cache_key(request)
+    version = await cache.aget(f"{key}:version")
+
+    if version is None:
+        version = await version_of()
+        if version is None:
+            # Not found: the sync view answers with its usual 404.
+            raise Fallback
+        await cache.aset(f"{key}:version", version, _cache_timeout())
+
+    etag = version_etag("json", version)
+    last_modified = None
+    if with_last_modified:
+        last_modified = version_last_modified(version)
+
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+
+    if response is None:
+        data = await cache.aget(key)
+        if data is not None:
+            await _aincrement(CATALOG_HITS_KEY)
+        else:
+            await _aincrement(CATALOG_MISSES_KEY)
+            data = await data_of()
+            if data is None:
+                raise Fallback
+            await cache.aset(key, data, _cache_timeout())
+
+        response = json_response(data)
+
+    set_version_headers(response, etag, last_modified)
+    return response
+
+
+@async_read_view(book_list_view)
+async def book_list(request) -> Any:
+    drf_request = await api_request(request, BookViewSet)
+    queryset = BookViewSet(
+        request=drf_request, action="list", kwargs={}, format_kwarg=None
+    ).get_queryset()
+
+    async def version_of() -> tuple:
+        version = await queryset.order_by().aaggregate(
+            **list_version_aggregates(BookViewSet.version_fields)
+        )
+        return tuple(version.values())
+
+    with await replica_reads([user_pin(drf_request.user), CATALOG_PIN]):
+        return await _conditional_catalog_response(
+            request,
+            version_of,
+            lambda: paginate(drf_request, queryset, BookValuesSerializer()),
+            with_last_modified=False,
+        )
+
+
+@async_read_view(book_detail_view)
+async def book_detail(request, pk: int) -> Any:
+    drf_request = await api_request(request, BookViewSet)
+    queryset = BookViewSet(
+        request=drf_request, action="retrieve", kwargs={}, format_kwarg=None
+    ).get_queryset().filter(pk=pk)
+
+    async def data_of() -> Any:
+        serializer = BookValuesSerializer()
+        row = await serializer.values(queryset).afirst()
+        return serializer.serialize([row])[0] if row else None
+
+    with await replica_reads([user_pin(drf_request.user), CATALOG_PIN]):
+        return await _conditional_catalog_response(
+            request,
+            queryset.values_list(*BookViewSet.version_fields).afirst,
+            data_of,
+        )
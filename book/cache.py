@@ -0,0 +1,128 @@
+import hashlib
+import time
+from typing import Any, Callable
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+from library_service.replicas import CATALOG_PIN, pin_to_primary
+
+CATALOG_VERSION_KEY = "book:catalog:version"
+CATALOG_HITS_KEY = "book:catalog:hits"
+CATALOG_MISSES_KEY = "book:catalog:misses"
+
+
+def _new_version() -> int:
+    # A fresh version never collides with one used before the key was
+    # evicted, so stale entries can't be served again.
+    return time.time_ns()
+
+
+def get_catalog_version() -> int:
+    version = cache.get(CATALOG_VERSION_KEY)
+
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, _new_version(), timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY)
+
+    return version
+
+
+async def aget_catalog_version() -> int:
+    version = await cache.aget(CATALOG_VERSION_KEY)
+
+    if version is None:
+        await cache.aadd(CATALOG_VERSION_KEY, _new_version(), timeout=None)
+        version = await cache.aget(CATALOG_VERSION_KEY)
+
+    return version
+
+
+def bump_catalog_version() -> None:
+    """Invalidate every cached catalog response at once."""
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        cache.add(CATALOG_VERSION_KEY, _new_version(), timeout=None)
+
+    pin_to_primary(CATALOG_PIN)
+
+
+def _increment(key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, timeout=None)
+
+
+async def _aincrement(key: str) -> None:
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        await cache.aadd(key, 1, timeout=None)
+
+
+def get_catalog_cache_stats() -> dict:
+    return {
+        "hits": cache.get(CATALOG_HITS_KEY, 0),
+        "misses": cache.get(CATALOG_MISSES_KEY, 0),
+    }
+
+
+def _url_hash(request) -> str:
+    return hashlib.md5(request.build_absolute_uri().encode()).hexdigest()
+
+
+def catalog_cache_key(request) -> str:
+    return f"book:catalog:{get_catalog_version()}:{_url_hash(request)}"
+
+
+async def acatalog_cache_key(request) -> str:
+    version = await aget_catalog_version()
+    return f"book:catalog:{version}:{_url_hash(request)}"
+
+
+class CatalogCacheMixin:
+    """Serve safe catalog responses from the cache, keyed by full URL."""
+
+    cache_timeout = None
+
+    def cached_value(self, suffix: str, compute: Callable) -> Any:
+        """Cache ``compute()`` for the request URL until the catalog
+        changes."""
+        key = f"{catalog_cache_key(self.request)}:{suffix}"
+        value = cache.get(key)
+
+        if value is None:
+            value = compute()
+            cache.set(
+                key,
+                value,
+                self.cache_timeout or settings.BOOK_CATALOG_CACHE_TIMEOUT,
+            )
+
+        return value
+
+    def cached_response(
+        self, handler: Callable, request, *args, **kwargs
+    ) -> Any:
+        key = catalog_cache_key(request)
+        data = cache.get(key)
+
+        if data is not None:
+            _increment(CATALOG_HITS_KEY)
+            return Response(data)
+
+        _increment(CATALOG_MISSES_KEY)
+        response = handler(request, *args, **kwargs)
+
+        if response.status_code == status.HTTP_200_OK:
+            cache.set(
+                key,
+                response.data,
+                self.cache_timeout or settings.BOOK_CATALOG_CACHE_TIMEOUT,
+            )
+
+        return response
@@ -0,0 +1,102 @@
+import hashlib
+from calendar import timegm
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def list_version_aggregates(version_fields: tuple) -> dict:
+    """Row count and latest ``updated_at`` of every timestamp field."""
+    aggregates = {"count": Count("pk")}
+    for index, field in enumerate(version_fields):
+        if field.endswith("updated_at"):
+            aggregates[f"version_{index}"] = Max(field)
+
+    return aggregates
+
+
+def version_etag(renderer_format: str, version: tuple) -> str:
+    values = [renderer_format, *version]
+    return quote_etag(hashlib.md5(repr(values).encode()).hexdigest())
+
+
+def version_last_modified(version: tuple) -> Optional[int]:
+    timestamps = [value for value in version if isinstance(value, datetime)]
+
+    if not timestamps:
+        return None
+
+    return timegm(max(timestamps).utctimetuple())
+
+
+def set_version_headers(
+    response, etag: str, last_modified: Optional[int]
+) -> None:
+    if response.status_code in (200, 304):
+        response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified)
+
+
+class ConditionalGetMixin:
+    """Answer ``If-None-Match`` and ``If-Modified-Since`` with 304 before
+    anything is serialized.
+
+    The version of a single object is ``version_fields`` read with one
+    query. For a list it is the row count and the latest of the
+    ``updated_at`` timestamps in ``version_fields``, read with one
+    aggregate over the filtered queryset. Timestamps of joined rows
+    belong in ``version_fields`` whenever the serializer shows them.
+    Lists only get an ``ETag``: deleting a row changes their count but
+    not their latest timestamp, so ``Last-Modified`` would stay put.
+    """
+
+    version_fields = ("updated_at",)
+
+    def conditional_response(
+        self, handler: Callable, request, *args, **kwargs
+    ) -> Any:
+        if self.action == "list":
+            version = self.get_list_version()
+        else:
+            version = self.get_object_version()
+
+        if version is None:
+            return handler(request, *args, **kwargs)
+
+        etag = version_etag(request.accepted_renderer.format, version)
+        last_modified = None
+        if self.action != "list":
+            last_modified = version_last_modified(version)
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+
+        set_version_headers(response, etag, last_modified)
+        return response
+
+    def get_list_version(self) -> tuple:
+        version = self.filter_queryset(
+            self.get_queryset()
+        ).order_by().aggregate(**list_version_aggregates(self.version_fields))
+
+        return tuple(version.values())
+
+    def get_object_version(self) -> Optional[tuple]:
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset())
+
+        try:
+            return queryset.filter(
+                **{self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            ).values_list(*self.version_fields).first()
+        except (TypeError, ValueError, ValidationError):
+            # Let the handler answer with its usual 404.
+            return None
@@ -0,0 +1,89 @@
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+
+from book.cache import bump_catalog_version
+from book.models import Book
+
+
+def reserve_copies(book_id: int, count: int = 1) -> bool:
+    """Take ``count`` copies of a book off the shelf.
+
+    The check and the decrement run as one conditional ``UPDATE``, so
+    concurrent checkouts can never push the inventory below zero.
+    Returns ``False`` when not enough copies are left.
+    """
+    reserved = Book.objects.filter(
+        pk=book_id, inventory__gte=count
+    ).update(inventory=F("inventory") - count, updated_at=timezone.now())
+
+    if reserved:
+        transaction.on_commit(bump_catalog_version)
+
+    return bool(reserved)
+
+
+def release_copies(book_id: int, count: int = 1) -> None:
+    """Put ``count`` returned copies of a book back on the shelf."""
+    Book.objects.filter(pk=book_id).update(
+        inventory=F("inventory") + count, updated_at=timezone.now()
+    )
+    transaction.on_commit(bump_catalog_version)
+
+
+class _NotEnoughCopies(Exception):
+    pass
+
+
+def _copies_per_book(counts: dict) -> Case:
+    return Case(
+        *(
+            When(pk=book_id, then=Value(count))
+            for book_id, count in counts.items()
+        ),
+        output_field=IntegerField(),
+    )
+
+
+def reserve_books(counts: dict) -> list:
+    """Take copies of several books off the shelf, all or nothing.
+
+    ``counts`` maps book ids to the number of copies. Stock is checked
+    and decremented for every book in one conditional ``UPDATE``; if it
+    can't cover all of them the update is rolled back. Returns the ids
+    of the books without enough copies, empty when all were reserved.
+    """
+    copies = _copies_per_book(counts)
+
+    try:
+        with transaction.atomic():
+            reserved = Book.objects.filter(
+                pk__in=counts, inventory__gte=copies
+            ).update(
+                inventory=F("inventory") - copies, updated_at=timezone.now()
+            )
+
+            if reserved != len(counts):
+                raise _NotEnoughCopies
+    except _NotEnoughCopies:
+        inventory = dict(
+            Book.objects.filter(pk__in=counts).values_list("id", "inventory")
+        )
+        return [
+            book_id
+            for book_id, count in counts.items()
+            if inventory.get(book_id, 0) < count
+        ]
+
+    transaction.on_commit(bump_catalog_version)
+    return []
+
+
+def release_books(counts: dict) -> None:
+    """Put returned copies of several books back with one ``UPDATE``."""
+    copies = _copies_per_book(counts)
+
+    Book.objects.filter(pk__in=counts).update(
+        inventory=F("inventory") + copies, updated_at=timezone.now()
+    )
+    transaction.on_commit(bump_catalog_version)
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from book.stats import REBUILD_BATCH_SIZE, rebuild_book_stats
+
+
+class Command(BaseCommand):
+    """Django command to recompute the loan stats of every book from
+    the borrowings, to backfill them or repair drift"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=REBUILD_BATCH_SIZE
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            books = rebuild_book_stats(batch_size=options["batch_size"])
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt the stats of {books} books")
+        )
@@ -0,0 +1,75 @@
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from book.inventory import reserve_copies
+from book.models import Book
+
+
+class Command(BaseCommand):
+    """Django command to hammer one book with concurrent checkouts
+    and check that no more copies are handed out than were in stock"""
+
+    def add_arguments(self, parser):
+        parser.add_argument("--inventory", type=int, default=50)
+        parser.add_argument("--workers", type=int, default=16)
+        parser.add_argument("--attempts", type=int, default=20)
+
+    def handle(self, *args, **options):
+        inventory = options["inventory"]
+        workers = options["workers"]
+        attempts = options["attempts"]
+
+        book = Book.objects.create(
+            title="Inventory stress test", inventory=inventory, daily_fee=1
+        )
+        reserved = []
+        lock = threading.Lock()
+        start = threading.Barrier(workers)
+
+        def checkout() -> None:
+            successes = 0
+            try:
+                start.wait()
+                for _ in range(attempts):
+                    successes += reserve_copies(book.id)
+            finally:
+                connection.close()
+
+            with lock:
+                reserved.append(successes)
+
+        threads = [
+            threading.Thread(target=checkout) for _ in range(workers)
+        ]
+
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        book.refresh_from_db()
+        total_reserved = sum(reserved)
+        total_attempts = workers * attempts
+        book.delete()
+
+        self.stdout.write(
+            f"{total_attempts} attempts from {workers} workers in "
+            f"{elapsed:.3f}s ({total_attempts / elapsed:.0f} attempts/s)"
+        )
+        self.stdout.write(
+            f"Reserved {total_reserved} of {inventory} copies, "
+            f"{book.inventory} left on the shelf"
+        )
+
+        if (
+            total_reserved > inventory
+            or total_reserved + book.inventory != inventory
+        ):
+            self.stdout.write(self.style.ERROR("Inventory was oversold"))
+        else:
+            self.stdout.write(self.style.SUCCESS("No oversell detected"))
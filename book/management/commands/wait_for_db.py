@@ -10,11 +10,12 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         self.stdout.write("Waiting for database...")
 
-        db_connect = None
+        db_connect = False
 
         while not db_connect:
             try:
-                db_connect = connections["default"]
+                connections["default"].ensure_connection()
+                db_connect = True
             except OperationalError:
                 self.stdout.write("Database unavailable, waiting 1 second...")
                 time.sleep(1)
@@ -0,0 +1,34 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("book", "0005_book_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BookStats",
+            fields=[
+                (
+                    "book",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to="book.book",
+                    ),
+                ),
+                ("active_loans", models.PositiveIntegerField(default=0)),
+                ("total_loans", models.PositiveIntegerField(default=0)),
+                ("returned_loans", models.PositiveIntegerField(default=0)),
+                ("loan_days", models.PositiveIntegerField(default=0)),
+                ("overdue_returns", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name_plural": "book stats",
+            },
+        ),
+    ]
@@ -17,9 +17,91 @@ class Book(models.Model):
     )
     inventory = models.PositiveIntegerField()
     daily_fee = models.DecimalField(max_digits=5, decimal_places=2)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ("title",)
+        indexes = [
+            models.Index(fields=("title", "id"), name="book_title_id_idx"),
+        ]
 
     def __str__(self) -> str:
         return self.title
+
+
+class BookStats(models.Model):
+    """Loan counters of a book, updated in the transaction of every
+    borrow and return. ``rebuild_book_stats`` recomputes them from the
+    borrowings."""
+
+    book = models.OneToOneField(
+        Book, on_delete=models.CASCADE, primary_key=True, related_name="stats"
+    )
+    active_loans = models.PositiveIntegerField(default=0)
+    total_loans = models.PositiveIntegerField(default=0)
+    returned_loans = models.PositiveIntegerField(default=0)
+    loan_days = models.PositiveIntegerField(default=0)
+    overdue_returns = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = "book stats"
+
+    def __str__(self) -> str:
+        return f"Stats of book {self.book_id}"
+
+    @property
+    def average_loan_days(self) -> float:
+        """Average length of the returned loans, in days."""
+        if not self.returned_loans:
+            return 0.0
+        return self.loan_days / self.returned_loans
+
+
+class OverdueWatermark(models.Model):
+    """Single row recording how far the overdue report has got: every
+    active borrowing due before ``due_date`` has been reported."""
+
+    due_date = models.DateField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"Overdue borrowings reported up to {self.due_date}"
+
+
+class NotificationQuerySet(models.QuerySet):
+    def pending(self) -> models.QuerySet:
+        """Rows neither delivered nor given up on."""
+        return self.filter(sent_at__isnull=True, failed_at__isnull=True)
+
+
+class Notification(models.Model):
+    """Outbox row for a Telegram message waiting to be delivered."""
+
+    chat_id = models.CharField(max_length=64)
+    text = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+    # A worker delivering the row holds it until then.
+    claimed_until = models.DateTimeField(blank=True, null=True)
+    # Parts of a text longer than one message already delivered.
+    parts_sent = models.PositiveIntegerField(default=0)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    failed_at = models.DateTimeField(blank=True, null=True)
+
+    objects = NotificationQuerySet.as_manager()
+
+    class Meta:
+        ordering = ("id",)
+        indexes = [
+            models.Index(
+                fields=("id",),
+                condition=models.Q(
+                    sent_at__isnull=True, failed_at__isnull=True
+                ),
+                name="notification_pending_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"Notification {self.id} to {self.chat_id}"
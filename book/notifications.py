@@ -1,14 +1,234 @@
+import logging
+import math
+import time
+from datetime import date, timedelta
+from itertools import groupby
+from operator import itemgetter
+from typing import Iterable, Iterator
+
 import telebot
 from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, DateTimeField, F, Q, Value, When
 from django.utils import timezone
+from telebot.apihelper import ApiTelegramException
 
+from book.models import Notification, OverdueWatermark
 from borrowing.models import Borrowing, Payment
 
+MESSAGE_LIMIT = 4096
+MESSAGE_SEPARATOR = "\n\n"
+OVERDUE_REPORT_HEADER = "The following borrowings are overdue:\n\n"
+NO_OVERDUE_MESSAGE = "No borrowings overdue today!"
+
 bot = telebot.TeleBot(settings.TELEGRAM_BOT_TOKEN)
+logger = logging.getLogger(__name__)
+
+
+def enqueue_notifications(*texts: str, chat_id: str = None) -> None:
+    """Write messages to the outbox and schedule their delivery.
+
+    The rows are part of the caller's transaction and delivery is only
+    scheduled once it commits, so the request never waits on Telegram.
+    """
+    chat_id = chat_id or settings.TELEGRAM_CHAT_ID
+
+    if not texts:
+        return
+
+    if not chat_id:
+        logger.warning("TELEGRAM_CHAT_ID is not set, dropping notifications")
+        return
+
+    Notification.objects.bulk_create(
+        Notification(chat_id=chat_id, text=text) for text in texts
+    )
+    transaction.on_commit(schedule_notifications_delivery)
+
+
+def schedule_notifications_delivery() -> None:
+    from book.tasks import run_deliver_notifications
+
+    try:
+        run_deliver_notifications.delay()
+    except Exception:
+        logger.exception(
+            "Could not schedule notifications delivery, "
+            "pending messages stay in the outbox"
+        )
+
+
+def split_message(text: str) -> Iterator[str]:
+    for start in range(0, len(text), MESSAGE_LIMIT):
+        yield text[start:start + MESSAGE_LIMIT]
+
+
+def count_parts(text: str) -> int:
+    return math.ceil(len(text) / MESSAGE_LIMIT)
+
+
+def coalesce_notifications(
+    notifications: Iterable[Notification],
+) -> Iterator[tuple]:
+    """Merge pending rows per chat into as few messages as possible.
+
+    Yields ``(chat_id, text, ids)`` where ``text`` never exceeds
+    ``MESSAGE_LIMIT`` and ``ids`` are the rows it delivers. Rows too long
+    for one message go out alone, in the parts not sent yet.
+    """
+    rows = sorted(notifications, key=lambda row: (row.chat_id, row.id))
+
+    for chat_id, chat_rows in groupby(rows, key=lambda row: row.chat_id):
+        text, ids = "", []
+
+        for row in chat_rows:
+            if len(row.text) > MESSAGE_LIMIT:
+                if ids:
+                    yield chat_id, text, ids
+                    text, ids = "", []
+                parts = list(split_message(row.text))[row.parts_sent:]
+                for part in parts:
+                    yield chat_id, part, [row.id]
+                continue
+
+            merged = (
+                f"{text}{MESSAGE_SEPARATOR}{row.text}" if ids else row.text
+            )
+
+            if len(merged) > MESSAGE_LIMIT:
+                yield chat_id, text, ids
+                text, ids = row.text, [row.id]
+            else:
+                text, ids = merged, ids + [row.id]
+
+        if ids:
+            yield chat_id, text, ids
+
+
+def is_permanent_failure(exc: Exception) -> bool:
+    """Whether Telegram refused the message itself, so that sending it
+    again won't help. Rate limits, server and network errors pass."""
+    return (
+        isinstance(exc, ApiTelegramException)
+        and 400 <= exc.error_code < 500
+        and exc.error_code != 429
+    )
+
+
+def claim_pending_notifications(batch_size: int) -> list:
+    """Lock one batch of pending rows for ``NOTIFICATIONS_CLAIM_SECONDS``.
+
+    The claim is committed right away, so the rows stay with this worker
+    without a transaction open while they are delivered. Rows of a worker
+    that died are claimed again once their claim runs out.
+    """
+    now = timezone.now()
+
+    with transaction.atomic():
+        rows = list(
+            Notification.objects.pending().select_for_update(
+                skip_locked=True
+            ).filter(
+                Q(claimed_until__isnull=True) | Q(claimed_until__lt=now)
+            ).order_by("id")[:batch_size]
+        )
+        Notification.objects.filter(id__in=[row.id for row in rows]).update(
+            claimed_until=now + timedelta(
+                seconds=settings.NOTIFICATIONS_CLAIM_SECONDS
+            )
+        )
+
+    return rows
+
+
+def _record_delivery(row: Notification, ids: list) -> int:
+    now = timezone.now()
+
+    if count_parts(row.text) > 1:
+        # Only the last part delivers the row, so a failure halfway
+        # resends just the parts still missing.
+        row.parts_sent += 1
+        delivered = row.parts_sent == count_parts(row.text)
+        Notification.objects.filter(id=row.id).update(
+            parts_sent=row.parts_sent, sent_at=now if delivered else None
+        )
+        return int(delivered)
+
+    Notification.objects.filter(id__in=ids).update(sent_at=now)
+    return len(ids)
+
+
+def _record_failure(ids: list, exc: Exception, permanent: bool) -> None:
+    changes = {
+        "attempts": F("attempts") + 1,
+        "last_error": f"{type(exc).__name__}: {exc}",
+    }
+
+    if permanent:
+        changes["failed_at"] = Case(
+            When(
+                attempts__gte=settings.NOTIFICATIONS_MAX_ATTEMPTS - 1,
+                then=Value(timezone.now()),
+            ),
+            default=Value(None),
+            output_field=DateTimeField(),
+        )
+
+    Notification.objects.filter(id__in=ids).update(**changes)
+
+
+def deliver_pending_notifications(batch_size: int = None) -> int:
+    """Send one batch of pending outbox rows and mark them as sent.
+
+    Rows are claimed first, so several workers can drain the outbox
+    concurrently, and every message is recorded as sent on its own as
+    soon as Telegram accepts it. A message Telegram rejects counts a
+    failed attempt on its rows, which are given up on after
+    ``NOTIFICATIONS_MAX_ATTEMPTS``, and delivery goes on with the next
+    one. Rate limits, server and network errors stop the batch and are
+    re-raised for the caller to retry the rest.
+    """
+    batch_size = batch_size or settings.NOTIFICATIONS_BATCH_SIZE
+    rows = {row.id: row for row in claim_pending_notifications(batch_size)}
+    failed = set()
+    delivered = 0
+
+    try:
+        for index, (chat_id, text, ids) in enumerate(
+            coalesce_notifications(rows.values())
+        ):
+            if failed.intersection(ids):
+                continue
+
+            if index:
+                time.sleep(settings.TELEGRAM_SEND_INTERVAL)
+
+            try:
+                bot.send_message(chat_id=chat_id, text=text)
+            except Exception as exc:
+                permanent = is_permanent_failure(exc)
+                _record_failure(ids, exc, permanent)
+                if not permanent:
+                    raise
+                logger.warning(
+                    "Telegram rejected notifications %s: %s", ids, exc
+                )
+                failed.update(ids)
+                continue
+
+            delivered += _record_delivery(rows[ids[0]], ids)
+    finally:
+        Notification.objects.filter(
+            id__in=list(rows), sent_at__isnull=True
+        ).update(claimed_until=None)
+
+    return delivered
 
 
 def send_new_borrowing_notification(borrowing_id: int) -> None:
-    borrowing = Borrowing.objects.get(id=borrowing_id)
+    borrowing = Borrowing.objects.select_related(
+        "book", "borrower"
+    ).get(id=borrowing_id)
     days_borrowed = (
         borrowing.expected_return_date - borrowing.borrow_date
     ).days
@@ -22,49 +242,156 @@ def send_new_borrowing_notification(borrowing_id: int) -> None:
         f"Amount: ${borrowing_amount}"
     )
 
-    bot.send_message(chat_id=settings.TELEGRAM_CHAT_ID, text=message)
+    enqueue_notifications(message)
+
+
+def send_new_borrowings_notification(borrowing_ids: Iterable[int]) -> None:
+    """One message per borrower for borrowings checked out together."""
+    borrowings = Borrowing.objects.filter(
+        id__in=borrowing_ids
+    ).with_amount_due().order_by("borrower_id", "id").values(
+        "borrower_id",
+        "borrower__first_name",
+        "borrower__last_name",
+        "book__title",
+        "rental_fee",
+    )
 
+    messages = []
+    for _, group in groupby(borrowings, key=itemgetter("borrower_id")):
+        group = list(group)
+        books = "\n".join(
+            f"- {row['book__title']}: ${row['rental_fee']:.2f}"
+            for row in group
+        )
+        total = sum(row["rental_fee"] for row in group)
+        messages.append(
+            f"{len(group)} new borrowings have been created!\n\n"
+            f"Borrower Name: "
+            f"{group[0]['borrower__first_name']} "
+            f"{group[0]['borrower__last_name']}\n"
+            f"Books:\n{books}\n"
+            f"Amount: ${total:.2f}"
+        )
 
-def send_overdue_borrowings_notification() -> None:
-    overdue_borrowings = Borrowing.objects.filter(
-        expected_return_date__lt=timezone.now(),
+    enqueue_notifications(*messages)
+
+
+def overdue_borrowings(today: date = None):
+    """Values of the active borrowings due before ``today``, with the
+    borrowing fee priced in SQL, oldest due date first."""
+    return Borrowing.objects.filter(
+        expected_return_date__lt=today or timezone.localdate(),
         actual_return_date__isnull=True
+    ).with_amount_due().order_by("expected_return_date", "id").values(
+        "id",
+        "borrower__first_name",
+        "borrower__last_name",
+        "rental_fee",
+        "expected_return_date",
     )
 
-    message = "The following borrowings are overdue:\n\n"
-    for borrowing in overdue_borrowings:
-
-        if borrowing:
-            days_borrowed = (
-                borrowing.expected_return_date - borrowing.borrow_date
-            ).days
-            borrowing_amount = borrowing.book.daily_fee * days_borrowed
-
-            message += (
-                f"Borrower Name: "
-                f"{borrowing.borrower.first_name} "
-                f"{borrowing.borrower.last_name}\n"
-                f"Amount: ${borrowing_amount}\nDue Date: "
-                f"{borrowing.expected_return_date}\n"
-                f"The fine is twice the fixed daily "
-                f"fee for each overdue day!\n\n"
+
+def iter_overdue_borrowings(chunk_size: int = None) -> Iterator[dict]:
+    """Stream every overdue borrowing, reported or not."""
+    return overdue_borrowings().iterator(
+        chunk_size=chunk_size or settings.OVERDUE_REPORT_CHUNK_SIZE
+    )
+
+
+def build_overdue_report(borrowings: Iterable[dict]) -> Iterator[str]:
+    """Yield the overdue report split into messages Telegram accepts."""
+    message = OVERDUE_REPORT_HEADER
+    is_empty = True
+
+    for borrowing in borrowings:
+        entry = (
+            f"Borrower Name: "
+            f"{borrowing['borrower__first_name']} "
+            f"{borrowing['borrower__last_name']}\n"
+            f"Amount: ${borrowing['rental_fee']:.2f}\nDue Date: "
+            f"{borrowing['expected_return_date']}\n"
+            f"The fine is twice the fixed daily "
+            f"fee for each overdue day!\n\n"
+        )
+
+        if len(message) + len(entry) > MESSAGE_LIMIT:
+            yield message.rstrip()
+            message = ""
+
+        message += entry
+        is_empty = False
+
+    yield message.rstrip() if not is_empty else NO_OVERDUE_MESSAGE
+
+
+def send_overdue_borrowings_notification(batch_size: int = None) -> int:
+    """Report one batch of the borrowings that became overdue since the
+    last run, and mark them as reported.
+
+    Only borrowings due on or after the watermark, minus
+    ``OVERDUE_LOOKBACK_DAYS`` for loans created already late, and not
+    reported yet are read, so a run costs as much as the new overdue
+    loans rather than the whole backlog. Runs are serialized by a lock
+    on the watermark row. Returns the number of borrowings reported; a
+    full batch means more may be waiting.
+    """
+    batch_size = batch_size or settings.OVERDUE_BATCH_SIZE
+    today = timezone.localdate()
+
+    with transaction.atomic():
+        watermark, _ = OverdueWatermark.objects.select_for_update(
+        ).get_or_create(pk=1)
+
+        pending = overdue_borrowings(today).filter(
+            overdue_notified_at__isnull=True
+        )
+        if watermark.due_date is not None:
+            pending = pending.filter(
+                expected_return_date__gte=watermark.due_date - timedelta(
+                    days=settings.OVERDUE_LOOKBACK_DAYS
+                )
             )
+        batch = list(pending[:batch_size])
+
+        if batch:
+            now = timezone.now()
+            Borrowing.objects.filter(
+                id__in=[row["id"] for row in batch]
+            ).update(overdue_notified_at=now, updated_at=now)
+            enqueue_notifications(*build_overdue_report(batch))
 
-        else:
-            message += "No borrowings overdue today!"
+        # Loans due on the last reported date may not all fit in a full
+        # batch, so the watermark only moves past that date once caught
+        # up.
+        watermark.due_date = (
+            batch[-1]["expected_return_date"]
+            if len(batch) == batch_size
+            else today
+        )
+        watermark.save(update_fields=["due_date", "updated_at"])
 
-    bot.send_message(chat_id=settings.TELEGRAM_CHAT_ID, text=message)
+    return len(batch)
 
 
 def send_successful_payment_notification(payment_id: int) -> None:
-    payment = Payment.objects.get(id=payment_id)
+    send_successful_payment_notifications([payment_id])
 
-    message = (
-        f"Payment successful!\n\n"
-        f"Borrower Name: "
-        f"{payment.borrowing.borrower.first_name} "
-        f"{payment.borrowing.borrower.last_name}\n"
-        f"Amount: {payment.money_to_pay}\n"
+
+def send_successful_payment_notifications(payment_ids: Iterable[int]) -> None:
+    payments = Payment.objects.filter(id__in=payment_ids).order_by(
+        "id"
+    ).values_list(
+        "borrowing__borrower__first_name",
+        "borrowing__borrower__last_name",
+        "money_to_pay",
     )
 
-    bot.send_message(chat_id=settings.TELEGRAM_CHAT_ID, text=message)
+    enqueue_notifications(*(
+        f"Payment successful!\n\n"
+        f"Borrower Name: "
+        f"{first_name} "
+        f"{last_name}\n"
+        f"Amount: {money_to_pay}\n"
+        for first_name, last_name, money_to_pay in payments
+    ))
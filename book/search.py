@@ -0,0 +1,43 @@
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramWordSimilarity,
+)
+from django.db import connections
+from django.db.models import Q, QuerySet
+from django.db.models.functions import Greatest
+
+SEARCH_CONFIG = "simple"
+
+
+def search_books(queryset: QuerySet, query: str) -> QuerySet:
+    """Return books matching ``query`` ordered by relevance.
+
+    On PostgreSQL the lookup is served by the trigram GIN indexes on
+    ``title`` and ``author``: word similarity gives typo tolerance and
+    full-text rank orders the matches. Other backends fall back to a
+    plain case-insensitive substring match.
+    """
+    if connections[queryset.db].vendor != "postgresql":
+        return queryset.filter(
+            Q(title__icontains=query) | Q(author__icontains=query)
+        )
+
+    vector = SearchVector(
+        "title", weight="A", config=SEARCH_CONFIG
+    ) + SearchVector("author", weight="B", config=SEARCH_CONFIG)
+    search_query = SearchQuery(
+        query, config=SEARCH_CONFIG, search_type="websearch"
+    )
+
+    return queryset.filter(
+        Q(title__trigram_word_similar=query)
+        | Q(author__trigram_word_similar=query)
+    ).annotate(
+        rank=SearchRank(vector, search_query),
+        similarity=Greatest(
+            TrigramWordSimilarity(query, "title"),
+            TrigramWordSimilarity(query, "author"),
+        ),
+    ).order_by("-rank", "-similarity", "title", "id")
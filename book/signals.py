@@ -0,0 +1,18 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from book.cache import bump_catalog_version
+from book.models import Book, BookStats
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+def invalidate_catalog_cache(sender, **kwargs) -> None:
+    transaction.on_commit(bump_catalog_version)
+
+
+@receiver(post_save, sender=Book)
+def create_book_stats(sender, instance: Book, created: bool, **kwargs) -> None:
+    if created:
+        BookStats.objects.create(book=instance)
@@ -0,0 +1,160 @@
+from collections import defaultdict
+from datetime import date
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    IntegerField,
+    Q,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from book.cache import bump_catalog_version
+from book.models import Book, BookStats
+from borrowing.expressions import DaysBetween
+from borrowing.models import Borrowing
+
+REBUILD_BATCH_SIZE = 1000
+
+
+def _per_book(values: dict) -> Case:
+    return Case(
+        *(
+            When(book_id=book_id, then=Value(value))
+            for book_id, value in values.items()
+        ),
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+
+def _update_stats(book_ids: Iterable[int], **changes: dict) -> None:
+    """Add ``changes[field][book_id]`` to every counter in one
+    ``UPDATE``, creating the rows of books that have none yet."""
+    book_ids = set(book_ids)
+    # Never below zero, for returns of loans made before the stats were
+    # built.
+    increments = {
+        field: Greatest(F(field) + _per_book(values), Value(0))
+        for field, values in changes.items()
+    }
+
+    updated = BookStats.objects.filter(book_id__in=book_ids).update(
+        **increments
+    )
+
+    if updated < len(book_ids):
+        missing = book_ids - set(
+            BookStats.objects.filter(book_id__in=book_ids).values_list(
+                "book_id", flat=True
+            )
+        )
+        BookStats.objects.bulk_create(
+            (BookStats(book_id=book_id) for book_id in missing),
+            ignore_conflicts=True,
+        )
+        BookStats.objects.filter(book_id__in=missing).update(**increments)
+
+
+def record_loans(counts: dict) -> None:
+    """Count new loans; ``counts`` maps book ids to copies borrowed."""
+    _update_stats(counts, active_loans=counts, total_loans=counts)
+
+
+def record_returns(
+    borrowings: Iterable[tuple], returned_on: date
+) -> None:
+    """Count returned loans, given as ``(book_id, borrow_date,
+    expected_return_date)`` of every borrowing returned on
+    ``returned_on``."""
+    returned = defaultdict(int)
+    loan_days = defaultdict(int)
+    overdue = defaultdict(int)
+
+    for book_id, borrow_date, expected_return_date in borrowings:
+        returned[book_id] += 1
+        loan_days[book_id] += max((returned_on - borrow_date).days, 0)
+        overdue[book_id] += returned_on > expected_return_date
+
+    negative = {book_id: -count for book_id, count in returned.items()}
+
+    _update_stats(
+        returned,
+        active_loans=negative,
+        returned_loans=returned,
+        loan_days=loan_days,
+        overdue_returns=overdue,
+    )
+
+
+def rebuild_book_stats(batch_size: int = REBUILD_BATCH_SIZE) -> int:
+    """Recompute the stats of every book from its borrowings.
+
+    Returns the number of books. Run it while nothing is borrowed or
+    returned, or those loans may be counted twice or not at all.
+    Books whose stats change get a new ``updated_at``, so the catalog's
+    cached pages and ETags sorted by them go stale.
+    """
+    returned = Q(actual_return_date__isnull=False)
+    loans = Borrowing.objects.order_by().values("book_id").annotate(
+        active_loans=Count("id", filter=Q(actual_return_date__isnull=True)),
+        total_loans=Count("id"),
+        returned_loans=Count("id", filter=returned),
+        loan_days=Coalesce(
+            Sum(
+                DaysBetween("actual_return_date", "borrow_date"),
+                filter=returned,
+            ),
+            0,
+        ),
+        overdue_returns=Count(
+            "id",
+            filter=Q(actual_return_date__gt=F("expected_return_date")),
+        ),
+    )
+    loans = {row.pop("book_id"): row for row in loans}
+
+    book_ids = list(Book.objects.order_by("id").values_list("id", flat=True))
+    fields = [
+        "active_loans",
+        "total_loans",
+        "returned_loans",
+        "loan_days",
+        "overdue_returns",
+    ]
+
+    current = {
+        row.pop("book_id"): row
+        for row in BookStats.objects.values("book_id", *fields)
+    }
+    unchanged = dict.fromkeys(fields, 0)
+
+    for start in range(0, len(book_ids), batch_size):
+        batch = book_ids[start:start + batch_size]
+        BookStats.objects.bulk_create(
+            (
+                BookStats(book_id=book_id, **loans.get(book_id, {}))
+                for book_id in batch
+            ),
+            update_conflicts=True,
+            unique_fields=["book"],
+            update_fields=fields,
+        )
+        Book.objects.filter(
+            id__in=[
+                book_id for book_id in batch
+                if current.get(book_id)
+                != {**unchanged, **loans.get(book_id, {})}
+            ]
+        ).update(updated_at=timezone.now())
+
+    transaction.on_commit(bump_catalog_version)
+
+    return len(book_ids)
@@ -1,8 +1,37 @@
 from celery import shared_task
+from django.conf import settings
+from requests import RequestException
+from telebot.apihelper import ApiTelegramException
 
-from book.notifications import send_overdue_borrowings_notification
+from book.models import Notification
+from book.notifications import (
+    deliver_pending_notifications,
+    send_overdue_borrowings_notification,
+)
 
 
 @shared_task
-def run_send_overdue_borrowings_notification() -> None:
-    send_overdue_borrowings_notification()
+def run_send_overdue_borrowings_notification() -> int:
+    reported = send_overdue_borrowings_notification()
+
+    if reported >= settings.OVERDUE_BATCH_SIZE:
+        run_send_overdue_borrowings_notification.delay()
+
+    return reported
+
+
+@shared_task(bind=True, max_retries=8)
+def run_deliver_notifications(self) -> int:
+    try:
+        delivered = deliver_pending_notifications()
+    except ApiTelegramException as exc:
+        parameters = exc.result_json.get("parameters") or {}
+        countdown = parameters.get("retry_after", 2 ** self.request.retries)
+        raise self.retry(exc=exc, countdown=countdown)
+    except RequestException as exc:
+        raise self.retry(exc=exc, countdown=2 ** self.request.retries)
+
+    if delivered and Notification.objects.pending().exists():
+        run_deliver_notifications.delay()
+
+    return delivered
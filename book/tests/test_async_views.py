@@ -0,0 +1,127 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import AsyncRequestFactory, TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from book.async_views import book_detail, book_list
+from book.models import Book
+from library_service import throttling
+
+BOOK_URL = reverse("library:book-list")
+
+
+def detail_url(book_id: int) -> str:
+    return reverse("library:book-detail", args=[book_id])
+
+
+class AsyncBookViewsTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.factory = AsyncRequestFactory()
+        for index in range(12):
+            Book.objects.create(
+                title=f"Book {index:02}",
+                author="Author",
+                inventory=index,
+                daily_fee="1.50",
+            )
+
+    async def test_list_matches_sync_view(self) -> None:
+        for query in ("", "?page=2", "?page=last", "?title=1&page_size=2"):
+            await cache.aclear()
+            expected = await self.async_client.get(
+                BOOK_URL + query, ACCEPT="application/json"
+            )
+            await cache.aclear()
+            response = await book_list(self.factory.get(BOOK_URL + query))
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.content, expected.content)
+            self.assertEqual(response["ETag"], expected["ETag"])
+            self.assertNotIn("Last-Modified", response)
+
+    async def test_detail_matches_sync_view(self) -> None:
+        book = await Book.objects.afirst()
+        expected = await self.async_client.get(detail_url(book.id))
+        await cache.aclear()
+
+        response = await book_detail(
+            self.factory.get(detail_url(book.id)), pk=book.id
+        )
+
+        self.assertEqual(response.content, expected.content)
+        self.assertEqual(response["ETag"], expected["ETag"])
+
+    async def test_list_not_modified(self) -> None:
+        response = await book_list(self.factory.get(BOOK_URL))
+
+        response = await book_list(
+            self.factory.get(BOOK_URL, **{"if-none-match": response["ETag"]})
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    async def test_unhandled_requests_fall_back_to_sync_view(self) -> None:
+        response = await book_list(self.factory.get(BOOK_URL + "?page=9"))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = await book_detail(
+            self.factory.get(detail_url(0)), pk=0
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = await book_list(
+            self.factory.post(BOOK_URL, {"title": "new"})
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        response = await book_list(
+            self.factory.get(BOOK_URL, authorization="Bearer invalid")
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class AsyncThrottleTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.factory = AsyncRequestFactory()
+        self.script = mock.Mock(return_value=0)
+        patcher = mock.patch.object(
+            throttling, "get_token_bucket_script", return_value=self.script
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def scopes(self) -> list:
+        # One call per throttle of each request, in order.
+        return [
+            call.kwargs["keys"][0].split("_")[1]
+            for call in self.script.call_args_list
+        ]
+
+    async def test_fallback_is_throttled_once(self) -> None:
+        response = await book_list(self.factory.get(BOOK_URL + "?page=9"))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = await book_detail(self.factory.get(detail_url(0)), pk=0)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        self.assertEqual(self.scopes(), ["anon", "user", "catalog"] * 2)
+
+    async def test_throttled_request_is_answered_by_sync_view(self) -> None:
+        self.script.side_effect = lambda keys, args: (
+            1500 if keys[0].startswith("throttle_catalog_") else 0
+        )
+
+        response = await book_list(self.factory.get(BOOK_URL))
+
+        self.assertEqual(
+            response.status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        self.assertEqual(response["Retry-After"], "2")
+        self.assertEqual(self.scopes(), ["anon", "user", "catalog"])
@@ -1,6 +1,9 @@
+import json
+from base64 import urlsafe_b64encode
 from typing import Any
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
 
@@ -32,6 +35,7 @@ def detail_url(book_id: int) -> Any:
 
 class UnauthenticatedBookApi(TestCase):
     def setUp(self) -> None:
+        cache.clear()
         self.client = APIClient()
 
     def test_list_book(self) -> None:
@@ -64,6 +68,7 @@ class UnauthenticatedBookApi(TestCase):
 
 class AuthenticatedBookApiTests(TestCase):
     def setUp(self) -> None:
+        cache.clear()
         self.client = APIClient()
         self.user = get_user_model().objects.create_user(
             "test@user.com",
@@ -86,6 +91,7 @@ class AuthenticatedBookApiTests(TestCase):
 
 class AdminBookApiTests(TestCase):
     def setUp(self) -> None:
+        cache.clear()
         self.client = APIClient()
         self.user = get_user_model().objects.create_user(
             "admin@test.com",
@@ -123,3 +129,64 @@ class AdminBookApiTests(TestCase):
 
         if serializer.is_valid():
             self.assertEqual(response.data, serializer.data)
+
+    def test_search_book_by_title_or_author(self) -> None:
+        by_title = sample_book(title="Love Story", author="Erich Segal")
+        by_author = sample_book(title="Sample", author="Lovecraft")
+        sample_book(title="Other", author="Someone")
+
+        response = self.client.get(BOOK_URL, {"q": "love"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {book["id"] for book in response.data["results"]},
+            {by_title.id, by_author.id}
+        )
+
+    def test_list_books_with_cursor_pagination(self) -> None:
+        titles = [f"Book {index}" for index in range(7)]
+        for title in titles:
+            sample_book(title=title)
+
+        response = self.client.get(BOOK_URL, {"cursor": ""})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", response.data)
+        self.assertIsNone(response.data["previous"])
+        self.assertEqual(
+            [book["title"] for book in response.data["results"]],
+            titles[:5]
+        )
+
+        response = self.client.get(response.data["next"])
+
+        self.assertEqual(
+            [book["title"] for book in response.data["results"]],
+            titles[5:]
+        )
+        self.assertIsNone(response.data["next"])
+
+        response = self.client.get(response.data["previous"])
+
+        self.assertEqual(
+            [book["title"] for book in response.data["results"]],
+            titles[:5]
+        )
+
+    def test_list_books_with_invalid_cursor(self) -> None:
+        response = self.client.get(BOOK_URL, {"cursor": "invalid"})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_books_with_forged_cursor(self) -> None:
+        sample_book()
+
+        for position in (["a", "abc"], ["a", [1]], ["a", None], "a"):
+            payload = json.dumps({"p": position, "r": 0}).encode()
+            response = self.client.get(
+                BOOK_URL, {"cursor": urlsafe_b64encode(payload).decode()}
+            )
+
+            self.assertEqual(
+                response.status_code, status.HTTP_404_NOT_FOUND
+            )
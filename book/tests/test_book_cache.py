@@ -0,0 +1,76 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from book.cache import get_catalog_cache_stats
+from book.inventory import release_copies, reserve_copies
+from book.models import Book
+
+
+BOOK_URL = reverse("book:book-list")
+
+
+def detail_url(book_id: int) -> str:
+    return reverse("book:book-detail", args=[book_id])
+
+
+class BookCatalogCacheTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.book = Book.objects.create(
+            title="Cached", inventory=3, daily_fee=5.00
+        )
+
+    def test_list_is_served_from_cache(self) -> None:
+        self.client.get(BOOK_URL)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(BOOK_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"][0]["title"], "Cached")
+        self.assertEqual(get_catalog_cache_stats(), {"hits": 1, "misses": 1})
+
+    def test_query_params_are_cached_separately(self) -> None:
+        Book.objects.create(title="Other", inventory=3, daily_fee=5.00)
+
+        self.client.get(BOOK_URL)
+        response = self.client.get(BOOK_URL, {"title": "other"})
+
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(get_catalog_cache_stats()["misses"], 2)
+
+    def test_admin_update_invalidates_cache(self) -> None:
+        admin = get_user_model().objects.create_user(
+            "admin@test.com", "adminpass", is_staff=True
+        )
+        self.client.get(detail_url(self.book.id))
+        self.client.force_authenticate(admin)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(detail_url(self.book.id), {"inventory": 7})
+
+        self.client.force_authenticate(None)
+        response = self.client.get(detail_url(self.book.id))
+
+        self.assertEqual(response.data["inventory"], 7)
+
+    def test_inventory_change_invalidates_cache(self) -> None:
+        self.client.get(detail_url(self.book.id))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            reserve_copies(self.book.id)
+
+        response = self.client.get(detail_url(self.book.id))
+        self.assertEqual(response.data["inventory"], 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            release_copies(self.book.id)
+
+        response = self.client.get(detail_url(self.book.id))
+        self.assertEqual(response.data["inventory"], 3)
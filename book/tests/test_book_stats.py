@@ -0,0 +1,137 @@
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from book.models import Book, BookStats
+from book.stats import rebuild_book_stats
+from borrowing.models import Borrowing
+
+BOOK_URL = reverse("library:book-list")
+BORROWING_URL = reverse("borrowing:borrowing-list")
+BULK_RETURN_URL = reverse("borrowing:borrowing-bulk-return")
+
+
+def return_url(borrowing_id: int) -> str:
+    return reverse("borrowing:borrowing-return-book", args=[borrowing_id])
+
+
+class BookStatsTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_user(
+            "admin@test.com", "adminpass", is_staff=True
+        )
+        self.client.force_authenticate(self.admin)
+        self.popular = Book.objects.create(
+            title="Popular", inventory=3, daily_fee=1
+        )
+        self.quiet = Book.objects.create(
+            title="Quiet", inventory=1, daily_fee=1
+        )
+
+    def borrow(self, book: Book, days_ago: int, days: int = 3) -> int:
+        borrow_date = date.today() - timedelta(days=days_ago)
+        response = self.client.post(
+            BORROWING_URL,
+            {
+                "borrow_date": borrow_date,
+                "expected_return_date": borrow_date + timedelta(days=days),
+                "book": book.id,
+                "borrower": self.admin.id,
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        return response.data["id"]
+
+    def test_borrow_and_return_update_stats(self) -> None:
+        on_time = self.borrow(self.popular, days_ago=2)
+        late = self.borrow(self.popular, days_ago=6)
+        self.borrow(self.popular, days_ago=1)
+
+        self.client.post(return_url(on_time))
+        self.client.post(BULK_RETURN_URL, {"borrowings": [late]}, format="json")
+
+        stats = BookStats.objects.get(book=self.popular)
+        self.assertEqual(stats.total_loans, 3)
+        self.assertEqual(stats.active_loans, 1)
+        self.assertEqual(stats.returned_loans, 2)
+        self.assertEqual(stats.average_loan_days, 4)
+        self.assertEqual(stats.overdue_returns, 1)
+
+    def test_rebuild_matches_incremental_stats(self) -> None:
+        self.client.post(return_url(self.borrow(self.popular, days_ago=5)))
+        self.borrow(self.popular, days_ago=1)
+        self.borrow(self.quiet, days_ago=1)
+        expected = list(BookStats.objects.order_by("book_id").values())
+
+        BookStats.objects.all().delete()
+        rebuild_book_stats(batch_size=1)
+
+        self.assertEqual(
+            list(BookStats.objects.order_by("book_id").values()), expected
+        )
+
+    def test_stats_are_created_for_books_without_a_row(self) -> None:
+        book = Book.objects.bulk_create(
+            [Book(title="Bulk", inventory=1, daily_fee=1)]
+        )[0]
+
+        self.client.post(return_url(self.borrow(book, days_ago=1)))
+
+        stats = BookStats.objects.get(book=book)
+        self.assertEqual((stats.total_loans, stats.active_loans), (1, 0))
+
+    def test_order_by_popularity_and_filter_available(self) -> None:
+        self.borrow(self.popular, days_ago=1)
+        self.borrow(self.popular, days_ago=1)
+        self.borrow(self.quiet, days_ago=1)
+        Book.objects.create(title="New", inventory=1, daily_fee=1)
+
+        response = self.client.get(BOOK_URL, {"ordering": "-popularity"})
+        titles = [book["title"] for book in response.data["results"]]
+        self.assertEqual(titles, ["Popular", "Quiet", "New"])
+
+        response = self.client.get(
+            BOOK_URL, {"ordering": "-popularity", "available": "true"}
+        )
+        titles = [book["title"] for book in response.data["results"]]
+        self.assertEqual(titles, ["Popular", "New"])
+
+        response = self.client.get(BOOK_URL, {"available": "false"})
+        titles = [book["title"] for book in response.data["results"]]
+        self.assertEqual(titles, ["Quiet"])
+
+    def test_rebuild_invalidates_the_cached_catalog(self) -> None:
+        today = date.today()
+        Borrowing.objects.create(
+            borrow_date=today,
+            expected_return_date=today + timedelta(days=3),
+            book=self.quiet,
+            borrower=self.admin,
+        )
+        before = self.client.get(BOOK_URL, {"ordering": "-popularity"})
+        popular_updated_at = Book.objects.get(pk=self.popular.pk).updated_at
+
+        with self.captureOnCommitCallbacks(execute=True):
+            rebuild_book_stats()
+
+        response = self.client.get(
+            BOOK_URL,
+            {"ordering": "-popularity"},
+            HTTP_IF_NONE_MATCH=before["ETag"],
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        titles = [book["title"] for book in response.json()["results"]]
+        self.assertEqual(titles, ["Quiet", "Popular"])
+        self.assertEqual(
+            Book.objects.get(pk=self.popular.pk).updated_at,
+            popular_updated_at,
+        )
@@ -0,0 +1,135 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.http import http_date
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from book.inventory import reserve_copies
+from book.models import Book
+from borrowing.models import Borrowing
+
+BOOK_URL = reverse("library:book-list")
+
+
+class BookConditionalGetTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.book = Book.objects.create(
+            title="test", inventory=3, daily_fee=1
+        )
+
+    def test_list_not_modified(self) -> None:
+        response = self.client.get(BOOK_URL)
+        etag = response["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(BOOK_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+
+    def test_list_etag_changes_with_inventory(self) -> None:
+        etag = self.client.get(BOOK_URL)["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            reserve_copies(self.book.id)
+
+        response = self.client.get(BOOK_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(response.data["results"][0]["inventory"], 2)
+
+    def test_list_etag_changes_when_book_is_deleted(self) -> None:
+        Book.objects.create(title="other", inventory=1, daily_fee=1)
+        etag = self.client.get(BOOK_URL)["ETag"]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.book.delete()
+
+        response = self.client.get(BOOK_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_has_no_last_modified(self) -> None:
+        Book.objects.create(title="other", inventory=1, daily_fee=1)
+        response = self.client.get(BOOK_URL)
+        self.assertNotIn("Last-Modified", response)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.book.delete()
+
+        response = self.client.get(
+            BOOK_URL, HTTP_IF_MODIFIED_SINCE=http_date(time.time())
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_detail_if_modified_since(self) -> None:
+        url = reverse("library:book-detail", args=[self.book.id])
+        last_modified = self.client.get(url)["Last-Modified"]
+
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_detail_of_missing_book(self) -> None:
+        response = self.client.get(
+            reverse("library:book-detail", args=[self.book.id + 1])
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class BorrowingConditionalGetTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "admin@test.com", "testpassword", is_staff=True
+        )
+        self.client.force_authenticate(self.user)
+        book = Book.objects.create(title="test", inventory=3, daily_fee=1)
+        self.borrowing = Borrowing.objects.create(
+            borrow_date="2023-01-01",
+            expected_return_date="2023-01-05",
+            book=book,
+            borrower=self.user,
+        )
+        self.url = reverse(
+            "borrowing:borrowing-detail", args=[self.borrowing.id]
+        )
+
+    def test_detail_not_modified(self) -> None:
+        etag = self.client.get(self.url)["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_etag_changes_after_return(self) -> None:
+        etag = self.client.get(self.url)["ETag"]
+
+        self.client.post(
+            reverse("borrowing:borrowing-return-book", args=[self.borrowing.id])
+        )
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNotNone(response.data["actual_return_date"])
+
+    def test_etag_changes_with_borrower_name(self) -> None:
+        etag = self.client.get(self.url)["ETag"]
+
+        self.user.first_name = "Renamed"
+        self.user.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
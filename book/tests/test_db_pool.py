@@ -0,0 +1,102 @@
+from django.db.utils import OperationalError
+from django.test import SimpleTestCase
+from psycopg2.extensions import (
+    TRANSACTION_STATUS_IDLE,
+    TRANSACTION_STATUS_INTRANS,
+)
+
+from library_service import db_pool
+from library_service.db_pool import ConnectionPool
+from library_service.metrics import registry
+
+
+class FakeInfo:
+    transaction_status = TRANSACTION_STATUS_IDLE
+
+
+class FakeConnection:
+    def __init__(self) -> None:
+        self.closed = 0
+        self.info = FakeInfo()
+        self.rolled_back = False
+
+    def rollback(self) -> None:
+        self.rolled_back = True
+        self.info.transaction_status = TRANSACTION_STATUS_IDLE
+
+    def close(self) -> None:
+        self.closed = 1
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.pool = ConnectionPool(max_size=2, timeout=0.01)
+
+    def test_released_connection_is_reused(self) -> None:
+        connection = self.pool.acquire(FakeConnection)
+        self.pool.release(connection)
+
+        self.assertIs(self.pool.acquire(FakeConnection), connection)
+        self.assertEqual(self.pool.stats()["size"], 1)
+        self.assertEqual(self.pool.stats()["in_use"], 1)
+
+    def test_open_transaction_is_rolled_back_on_release(self) -> None:
+        connection = self.pool.acquire(FakeConnection)
+        connection.info.transaction_status = TRANSACTION_STATUS_INTRANS
+
+        self.pool.release(connection)
+
+        self.assertTrue(connection.rolled_back)
+        self.assertEqual(self.pool.stats()["idle"], 1)
+
+    def test_broken_connections_are_replaced(self) -> None:
+        closed = self.pool.acquire(FakeConnection)
+        unhealthy = self.pool.acquire(FakeConnection)
+        self.pool.release(unhealthy)
+        closed.closed = 1
+        self.pool.release(closed)
+
+        connection = self.pool.acquire(
+            FakeConnection, check=lambda connection: False
+        )
+
+        self.assertIsNot(connection, unhealthy)
+        self.assertTrue(unhealthy.closed)
+        self.assertEqual(self.pool.stats()["discarded"], 2)
+        self.assertEqual(self.pool.stats()["size"], 1)
+
+    def test_exhausted_pool_times_out(self) -> None:
+        self.pool.acquire(FakeConnection)
+        self.pool.acquire(FakeConnection)
+
+        with self.assertRaises(OperationalError):
+            self.pool.acquire(FakeConnection)
+
+        stats = self.pool.stats()
+        self.assertEqual(stats["waits"], 1)
+        self.assertEqual(stats["timeouts"], 1)
+        self.assertEqual(stats["size"], 2)
+
+    def test_failed_connect_frees_its_slot(self) -> None:
+        def connect():
+            raise OperationalError("refused")
+
+        for _ in range(3):
+            with self.assertRaises(OperationalError):
+                self.pool.acquire(connect)
+
+        self.assertEqual(self.pool.stats()["waits"], 0)
+
+    def test_pool_usage_is_exported(self) -> None:
+        pool = db_pool.get_pool("test-pool", {"POOL": {"MAX_SIZE": 3}})
+        self.addCleanup(db_pool._pools.pop, "test-pool")
+        pool.acquire(FakeConnection)
+
+        rendered = registry.render()
+
+        self.assertIn(
+            'library_db_pool_max_size{database="test-pool"} 3', rendered
+        )
+        self.assertIn(
+            'library_db_pool_in_use{database="test-pool"} 1', rendered
+        )
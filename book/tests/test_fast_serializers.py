@@ -0,0 +1,100 @@
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from book.fast_serializers import BookValuesSerializer
+from book.models import Book
+from book.renderers import FastJSONRenderer
+from book.serializers import BookSerializer
+from borrowing.fast_serializers import BorrowingListValuesSerializer
+from borrowing.models import Borrowing
+from borrowing.serializers import BorrowingListSerializer
+
+BOOK_URL = reverse("library:book-list")
+BORROWING_URL = reverse("borrowing:borrowing-list")
+
+
+class FastListSerializationTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "testpassword", first_name="Ada", last_name=""
+        )
+        self.books = Book.objects.bulk_create(
+            Book(
+                title=f"Book {index}  ",
+                author="Тарас Шевченко",
+                cover=Book.SOFT if index % 2 else Book.HARD,
+                inventory=index,
+                daily_fee=f"{index}.5",
+            )
+            for index in range(12)
+        )
+        borrow_date = date(2023, 1, 1)
+        Borrowing.objects.bulk_create(
+            Borrowing(
+                borrow_date=borrow_date + timedelta(days=index),
+                expected_return_date=borrow_date + timedelta(days=7),
+                actual_return_date=(
+                    borrow_date + timedelta(days=3) if index % 3 else None
+                ),
+                book=book,
+                borrower=self.user,
+            )
+            for index, book in enumerate(self.books)
+        )
+
+    def assert_same_response(self, url: str, params: dict = None) -> None:
+        cache.clear()
+        expected = self.client.get(url, params)
+
+        cache.clear()
+        with override_settings(FAST_LIST_SERIALIZATION=True):
+            response = self.client.get(url, params)
+
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(response.content, expected.content)
+
+    def test_serializers_match_model_serializers(self) -> None:
+        books = Book.objects.order_by("id")
+        borrowings = Borrowing.objects.order_by("id")
+        book_serializer = BookValuesSerializer()
+        borrowing_serializer = BorrowingListValuesSerializer()
+
+        self.assertEqual(
+            book_serializer.serialize(book_serializer.values(books)),
+            BookSerializer(books, many=True).data,
+        )
+        self.assertEqual(
+            borrowing_serializer.serialize(
+                borrowing_serializer.values(borrowings)
+            ),
+            BorrowingListSerializer(borrowings, many=True).data,
+        )
+
+    def test_book_list_matches(self) -> None:
+        self.assert_same_response(BOOK_URL)
+        self.assert_same_response(BOOK_URL, {"page": 2, "page_size": 10})
+        self.assert_same_response(BOOK_URL, {"title": "book 1"})
+        self.assert_same_response(BOOK_URL, {"cursor": ""})
+
+    def test_borrowing_list_matches(self) -> None:
+        self.client.force_authenticate(self.user)
+
+        self.assert_same_response(BORROWING_URL, {"page_size": 100})
+        self.assert_same_response(BORROWING_URL, {"is_active": "true"})
+        self.assert_same_response(BORROWING_URL, {"cursor": ""})
+
+    def test_fast_renderer_matches_json_renderer(self) -> None:
+        data = self.client.get(BOOK_URL, {"page_size": 100}).data
+
+        self.assertEqual(
+            FastJSONRenderer().render(data), JSONRenderer().render(data)
+        )
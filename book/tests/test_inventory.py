@@ -0,0 +1,75 @@
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from book.inventory import release_copies, reserve_copies
+from book.models import Book
+
+
+class InventoryTests(TestCase):
+    def setUp(self) -> None:
+        self.book = Book.objects.create(
+            title="test", inventory=2, daily_fee=5.00
+        )
+
+    def test_reserve_copies_until_out_of_stock(self) -> None:
+        self.assertTrue(reserve_copies(self.book.id))
+        self.assertTrue(reserve_copies(self.book.id))
+        self.assertFalse(reserve_copies(self.book.id))
+
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 0)
+
+    def test_reserve_more_copies_than_in_stock(self) -> None:
+        self.assertFalse(reserve_copies(self.book.id, count=3))
+
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 2)
+
+    def test_release_copies(self) -> None:
+        release_copies(self.book.id, count=2)
+
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 4)
+
+
+class StressInventoryCommandTests(TransactionTestCase):
+    def stress(self, **options) -> str:
+        out = StringIO()
+        call_command("stress_inventory", stdout=out, **options)
+
+        self.assertFalse(Book.objects.exists())
+        return out.getvalue()
+
+    def test_no_oversell(self) -> None:
+        out = self.stress(inventory=5, workers=1, attempts=10)
+
+        self.assertIn("Reserved 5 of 5 copies", out)
+        self.assertIn("No oversell detected", out)
+
+    @skipUnless(
+        connection.vendor == "postgresql",
+        "Concurrent checkouts need a PostgreSQL server",
+    )
+    def test_no_oversell_with_concurrent_workers(self) -> None:
+        out = self.stress(inventory=50, workers=16, attempts=20)
+
+        self.assertIn("320 attempts from 16 workers", out)
+        self.assertIn("Reserved 50 of 50 copies", out)
+        self.assertIn("No oversell detected", out)
+
+    @skipUnless(
+        connection.vendor == "sqlite",
+        "Threads sharing the SQLite test database",
+    )
+    def test_no_oversell_with_threads_on_sqlite(self) -> None:
+        # SQLite serializes the writes, so this only checks that the
+        # threads interleave without losing or duplicating a copy.
+        out = self.stress(inventory=20, workers=8, attempts=10)
+
+        self.assertIn("80 attempts from 8 workers", out)
+        self.assertIn("Reserved 20 of 20 copies", out)
+        self.assertIn("No oversell detected", out)
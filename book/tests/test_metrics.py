@@ -0,0 +1,111 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from book.models import Book
+from library_service.metrics import registry
+from library_service.testing import QueryBudgetTestMixin
+
+BOOK_URL = reverse("library:book-list")
+
+
+class RequestMetricsTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        registry.reset()
+        Book.objects.create(title="test", inventory=1, daily_fee=1)
+
+    def test_request_is_recorded(self) -> None:
+        self.client.get(BOOK_URL)
+
+        metrics = registry.snapshot()[("library:book-list", "GET")]
+        self.assertEqual(metrics["count"], 1)
+        self.assertEqual(metrics["queries"], 3)
+        self.assertGreater(metrics["duration"], 0)
+        self.assertGreater(metrics["db_duration"], 0)
+        self.assertGreater(metrics["serialization"], 0)
+        self.assertLessEqual(
+            metrics["db_duration"] + metrics["serialization"],
+            metrics["duration"],
+        )
+
+    @override_settings(METRICS_ENABLED=True)
+    def test_metrics_endpoint(self) -> None:
+        self.client.get(BOOK_URL)
+
+        response = self.client.get(reverse("metrics"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.content.decode()
+        self.assertIn(
+            'library_http_responses_total{view="library:book-list",'
+            'method="GET",status="200"} 1',
+            body,
+        )
+        self.assertIn(
+            'library_db_queries_total{view="library:book-list",'
+            'method="GET"} 3',
+            body,
+        )
+
+    def test_metrics_endpoint_is_off_by_default(self) -> None:
+        response = self.client.get(reverse("metrics"))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(METRICS_ENABLED=True, METRICS_TOKEN="secret")
+    def test_metrics_endpoint_needs_token(self) -> None:
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        response = self.client.get(
+            reverse("metrics"), HTTP_AUTHORIZATION="Bearer wrong"
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        response = self.client.get(
+            reverse("metrics"), HTTP_AUTHORIZATION="Bearer secret"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(QUERY_BUDGETS={"library:book-list": 1})
+    def test_warning_over_query_budget(self) -> None:
+        with self.assertLogs("library_service.metrics", "WARNING") as logs:
+            self.client.get(BOOK_URL)
+
+        self.assertIn("over its budget of 1", logs.output[0])
+
+
+class BookQueryBudgetTests(QueryBudgetTestMixin, TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        user = get_user_model().objects.create_user(
+            "test@test.com", "testpassword"
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}"
+        )
+        self.books = Book.objects.bulk_create(
+            Book(title=f"Book {index}", inventory=1, daily_fee=1)
+            for index in range(20)
+        )
+
+    def test_book_list(self) -> None:
+        with self.assert_query_budget("library:book-list"):
+            response = self.client.get(BOOK_URL, {"page": 2})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_book_detail(self) -> None:
+        with self.assert_query_budget("library:book-detail"):
+            response = self.client.get(
+                reverse("library:book-detail", args=[self.books[0].id])
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,378 @@
+from datetime import date, timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APIClient
+from telebot.apihelper import ApiTelegramException
+
+from book.models import Book, Notification, OverdueWatermark
+from book.notifications import (
+    MESSAGE_LIMIT,
+    NO_OVERDUE_MESSAGE,
+    OVERDUE_REPORT_HEADER,
+    build_overdue_report,
+    claim_pending_notifications,
+    coalesce_notifications,
+    deliver_pending_notifications,
+    enqueue_notifications,
+    iter_overdue_borrowings,
+    schedule_notifications_delivery,
+    send_overdue_borrowings_notification,
+)
+from book.tasks import (
+    run_deliver_notifications,
+    run_send_overdue_borrowings_notification,
+)
+from borrowing.models import Borrowing
+
+
+BORROWING_URL = reverse("borrowing:borrowing-list")
+
+
+def telegram_error(error_code: int) -> ApiTelegramException:
+    return ApiTelegramException(
+        "sendMessage",
+        None,
+        {"error_code": error_code, "description": "Bad Request"},
+    )
+
+
+@override_settings(TELEGRAM_CHAT_ID="42", TELEGRAM_SEND_INTERVAL=0)
+class NotificationOutboxTests(TestCase):
+    def test_create_borrowing_writes_outbox_row(self) -> None:
+        client = APIClient()
+        admin = get_user_model().objects.create_user(
+            "admin@test.com", "adminpass", is_staff=True
+        )
+        client.force_authenticate(admin)
+        book = Book.objects.create(title="test", inventory=1, daily_fee=5)
+
+        with mock.patch("book.notifications.bot") as bot:
+            with self.captureOnCommitCallbacks() as callbacks:
+                response = client.post(
+                    BORROWING_URL,
+                    {
+                        "borrow_date": "2023-01-01",
+                        "expected_return_date": "2023-01-04",
+                        "book": book.id,
+                        "borrower": admin.id,
+                    },
+                )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        bot.send_message.assert_not_called()
+        self.assertIn(schedule_notifications_delivery, callbacks)
+
+        notification = Notification.objects.get()
+        self.assertEqual(notification.chat_id, "42")
+        self.assertIn("Amount: $15.00", notification.text)
+        self.assertIsNone(notification.sent_at)
+
+    def test_coalesce_notifications_respects_message_limit(self) -> None:
+        enqueue_notifications("a" * 3000, "b" * 1000, "c" * 1000)
+        enqueue_notifications("d", chat_id="7")
+
+        messages = list(
+            coalesce_notifications(Notification.objects.order_by("id"))
+        )
+
+        self.assertEqual(
+            [(chat_id, len(ids)) for chat_id, _, ids in messages],
+            [("42", 2), ("42", 1), ("7", 1)]
+        )
+        for _, text, _ in messages:
+            self.assertLessEqual(len(text), MESSAGE_LIMIT)
+
+    def test_deliver_pending_notifications(self) -> None:
+        enqueue_notifications("first", "second")
+
+        with mock.patch("book.notifications.bot") as bot:
+            delivered = deliver_pending_notifications()
+
+        self.assertEqual(delivered, 2)
+        bot.send_message.assert_called_once_with(
+            chat_id="42", text="first\n\nsecond"
+        )
+        self.assertFalse(
+            Notification.objects.filter(sent_at__isnull=True).exists()
+        )
+
+    def test_failed_delivery_keeps_rows_pending(self) -> None:
+        enqueue_notifications("first")
+
+        with mock.patch("book.notifications.bot") as bot:
+            bot.send_message.side_effect = ConnectionError
+            with self.assertRaises(ConnectionError):
+                deliver_pending_notifications()
+
+        self.assertTrue(
+            Notification.objects.filter(sent_at__isnull=True).exists()
+        )
+
+
+    @override_settings(NOTIFICATIONS_MAX_ATTEMPTS=2)
+    def test_rejected_message_does_not_block_the_outbox(self) -> None:
+        enqueue_notifications("broken", chat_id="1")
+        enqueue_notifications("fine", chat_id="2")
+
+        def send_message(chat_id: str, text: str) -> None:
+            if chat_id == "1":
+                raise telegram_error(400)
+
+        with mock.patch("book.notifications.bot") as bot:
+            bot.send_message.side_effect = send_message
+            first = deliver_pending_notifications()
+            second = deliver_pending_notifications()
+
+        self.assertEqual((first, second), (1, 0))
+        broken = Notification.objects.get(chat_id="1")
+        self.assertEqual(broken.attempts, 2)
+        self.assertIn("400", broken.last_error)
+        self.assertIsNotNone(broken.failed_at)
+        self.assertIsNone(broken.sent_at)
+        self.assertFalse(Notification.objects.pending().exists())
+
+    def test_rate_limit_is_raised_and_releases_the_batch(self) -> None:
+        enqueue_notifications("first", chat_id="1")
+        enqueue_notifications("second", chat_id="2")
+
+        with mock.patch("book.notifications.bot") as bot:
+            bot.send_message.side_effect = telegram_error(429)
+            with self.assertRaises(ApiTelegramException):
+                deliver_pending_notifications()
+
+        self.assertEqual(bot.send_message.call_count, 1)
+        self.assertEqual(
+            list(
+                Notification.objects.order_by("id").values_list(
+                    "attempts", "failed_at", "claimed_until"
+                )
+            ),
+            [(1, None, None), (0, None, None)],
+        )
+
+    def test_long_message_resumes_from_the_first_unsent_part(self) -> None:
+        enqueue_notifications("a" * MESSAGE_LIMIT + "b" * 10)
+
+        with mock.patch("book.notifications.bot") as bot:
+            bot.send_message.side_effect = [None, ConnectionError]
+            with self.assertRaises(ConnectionError):
+                deliver_pending_notifications()
+
+            notification = Notification.objects.get()
+            self.assertEqual(notification.parts_sent, 1)
+            self.assertIsNone(notification.sent_at)
+
+            bot.send_message.side_effect = None
+            bot.send_message.reset_mock()
+            self.assertEqual(deliver_pending_notifications(), 1)
+
+        bot.send_message.assert_called_once_with(chat_id="42", text="b" * 10)
+        self.assertIsNotNone(Notification.objects.get().sent_at)
+
+    def test_messages_are_sent_outside_a_transaction(self) -> None:
+        enqueue_notifications("first", chat_id="1")
+        enqueue_notifications("second", chat_id="2")
+        depth = len(connection.atomic_blocks)
+        depths = []
+
+        with mock.patch("book.notifications.bot") as bot:
+            bot.send_message.side_effect = lambda **kwargs: depths.append(
+                len(connection.atomic_blocks)
+            )
+            deliver_pending_notifications()
+
+        self.assertEqual(depths, [depth, depth])
+
+    def test_beat_drains_the_outbox(self) -> None:
+        entry = settings.CELERY_BEAT_SCHEDULE["deliver-notifications"]
+
+        self.assertEqual(entry["task"], run_deliver_notifications.name)
+        self.assertEqual(
+            entry["schedule"], settings.NOTIFICATIONS_DELIVERY_INTERVAL
+        )
+
+    def test_claimed_rows_are_skipped_until_the_claim_runs_out(self) -> None:
+        enqueue_notifications("first")
+
+        self.assertEqual(len(claim_pending_notifications(10)), 1)
+        self.assertEqual(claim_pending_notifications(10), [])
+
+        Notification.objects.update(
+            claimed_until=timezone.now() - timedelta(seconds=1)
+        )
+        self.assertEqual(len(claim_pending_notifications(10)), 1)
+
+@override_settings(TELEGRAM_CHAT_ID="42")
+class OverdueReportTests(TestCase):
+    def setUp(self) -> None:
+        patcher = mock.patch(
+            "book.notifications.schedule_notifications_delivery"
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.book = Book.objects.create(
+            title="test", inventory=10, daily_fee=5.00
+        )
+
+    def create_overdue_borrowings(
+        self, count: int, days_overdue: int = 7
+    ) -> None:
+        borrow_date = date.today() - timedelta(days=days_overdue + 3)
+        offset = Borrowing.objects.count()
+
+        borrowers = get_user_model().objects.bulk_create(
+            get_user_model()(
+                email=f"user{offset + index}@test.com",
+                first_name="Borrower",
+                last_name=f"Number {index}",
+            )
+            for index in range(count)
+        )
+        Borrowing.objects.bulk_create(
+            Borrowing(
+                borrow_date=borrow_date,
+                expected_return_date=borrow_date + timedelta(days=3),
+                book=self.book,
+                borrower=borrower,
+            )
+            for borrower in borrowers
+        )
+
+    def test_report_lists_overdue_borrowings(self) -> None:
+        self.create_overdue_borrowings(1)
+
+        report = list(build_overdue_report(iter_overdue_borrowings()))
+
+        self.assertEqual(len(report), 1)
+        self.assertTrue(report[0].startswith(OVERDUE_REPORT_HEADER))
+        self.assertIn("Borrower Name: Borrower Number 0", report[0])
+        self.assertIn("Amount: $15.00", report[0])
+
+    def test_report_without_overdue_borrowings(self) -> None:
+        report = list(build_overdue_report(iter_overdue_borrowings()))
+
+        self.assertEqual(report, [NO_OVERDUE_MESSAGE])
+
+    def test_report_is_split_under_message_limit(self) -> None:
+        self.create_overdue_borrowings(60)
+
+        report = list(build_overdue_report(iter_overdue_borrowings()))
+
+        self.assertGreater(len(report), 1)
+        for message in report:
+            self.assertLessEqual(len(message), MESSAGE_LIMIT)
+        self.assertEqual(
+            sum(message.count("Borrower Name:") for message in report), 60
+        )
+
+    def test_report_query_count_is_constant(self) -> None:
+        query_counts = []
+
+        for count in (1, 10, 100):
+            self.create_overdue_borrowings(count)
+
+            with CaptureQueriesContext(connection) as queries:
+                list(build_overdue_report(iter_overdue_borrowings()))
+
+            query_counts.append(len(queries))
+
+        self.assertEqual(query_counts, [1, 1, 1])
+
+    def test_each_borrowing_is_reported_once(self) -> None:
+        self.create_overdue_borrowings(3)
+
+        self.assertEqual(send_overdue_borrowings_notification(), 3)
+        self.assertEqual(send_overdue_borrowings_notification(), 0)
+
+        notification = Notification.objects.get()
+        self.assertEqual(notification.text.count("Borrower Name:"), 3)
+        self.assertFalse(
+            Borrowing.objects.filter(overdue_notified_at__isnull=True)
+        )
+        self.assertEqual(
+            OverdueWatermark.objects.get().due_date, date.today()
+        )
+
+    def test_only_new_overdue_borrowings_are_reported(self) -> None:
+        self.create_overdue_borrowings(2)
+        send_overdue_borrowings_notification()
+        Borrowing.objects.create(
+            borrow_date=date.today() - timedelta(days=3),
+            expected_return_date=date.today() - timedelta(days=1),
+            book=self.book,
+            borrower=get_user_model().objects.create(
+                email="late@test.com", first_name="Late", last_name="Reader"
+            ),
+        )
+
+        self.assertEqual(send_overdue_borrowings_notification(), 1)
+        self.assertIn("Late Reader", Notification.objects.last().text)
+
+    def test_returned_and_not_yet_due_borrowings_are_skipped(self) -> None:
+        self.create_overdue_borrowings(2)
+        Borrowing.objects.filter(
+            id=Borrowing.objects.first().id
+        ).update(actual_return_date=date.today())
+        Borrowing.objects.create(
+            borrow_date=date.today(),
+            expected_return_date=date.today(),
+            book=self.book,
+            borrower=get_user_model().objects.first(),
+        )
+
+        self.assertEqual(send_overdue_borrowings_notification(), 1)
+
+    def test_full_batches_keep_watermark_on_last_date(self) -> None:
+        self.create_overdue_borrowings(3, days_overdue=5)
+        self.create_overdue_borrowings(2, days_overdue=2)
+
+        reported = [
+            send_overdue_borrowings_notification(batch_size=2)
+            for _ in range(4)
+        ]
+
+        self.assertEqual(reported, [2, 2, 1, 0])
+        self.assertEqual(Notification.objects.count(), 3)
+
+    def test_loans_far_behind_the_watermark_are_not_read(self) -> None:
+        OverdueWatermark.objects.create(pk=1, due_date=date.today())
+        self.create_overdue_borrowings(1, days_overdue=3)
+        self.create_overdue_borrowings(1, days_overdue=30)
+
+        with self.settings(OVERDUE_LOOKBACK_DAYS=7):
+            self.assertEqual(send_overdue_borrowings_notification(), 1)
+
+    def test_query_count_ignores_reported_backlog(self) -> None:
+        query_counts = []
+
+        for count in (1, 10, 100):
+            self.create_overdue_borrowings(count)
+
+            with CaptureQueriesContext(connection) as queries:
+                send_overdue_borrowings_notification()
+
+            query_counts.append(len(queries))
+
+        self.assertEqual(len(set(query_counts[1:])), 1)
+
+    def test_task_queues_another_run_after_a_full_batch(self) -> None:
+        self.create_overdue_borrowings(3)
+
+        with self.settings(OVERDUE_BATCH_SIZE=2), mock.patch.object(
+            run_send_overdue_borrowings_notification, "delay"
+        ) as delay:
+            self.assertEqual(run_send_overdue_borrowings_notification(), 2)
+            delay.assert_called_once_with()
+
+            delay.reset_mock()
+            self.assertEqual(run_send_overdue_borrowings_notification(), 1)
+            delay.assert_not_called()
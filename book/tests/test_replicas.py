@@ -0,0 +1,81 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from book.models import Book
+from library_service import replicas
+from library_service.replicas import ReplicaRouter, read_from_replicas
+
+BOOK_URL = reverse("library:book-list")
+BORROWING_URL = reverse("borrowing:borrowing-list")
+
+
+@override_settings(DATABASE_REPLICAS=["replica"])
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.router = ReplicaRouter()
+
+    def test_reads_go_to_replica_inside_block_only(self) -> None:
+        self.assertEqual(self.router.db_for_read(Book), "default")
+
+        with read_from_replicas():
+            self.assertEqual(self.router.db_for_read(Book), "replica")
+            self.assertEqual(self.router.db_for_write(Book), "default")
+
+        self.assertEqual(self.router.db_for_read(Book), "default")
+
+    def test_migrations_run_on_primary_only(self) -> None:
+        self.assertTrue(self.router.allow_migrate("default", "book"))
+        self.assertFalse(self.router.allow_migrate("replica", "book"))
+
+
+@override_settings(DATABASE_REPLICAS=["default"])
+class ReplicaReadMixinTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.admin = get_user_model().objects.create_user(
+            email="admin@library.com", password="testpass123", is_staff=True
+        )
+        self.reader = get_user_model().objects.create_user(
+            email="reader@library.com", password="testpass123"
+        )
+        self.client = APIClient()
+        patcher = mock.patch.object(
+            replicas, "choose_replica", wraps=replicas.choose_replica
+        )
+        self.choose_replica = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get(self, user, url: str) -> None:
+        self.client.force_authenticate(user)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_safe_requests_read_from_replica(self) -> None:
+        self.get(self.reader, BORROWING_URL)
+        self.get(None, BOOK_URL)
+
+        self.assertEqual(self.choose_replica.call_count, 2)
+
+    def test_writers_and_catalog_readers_are_pinned_after_write(self) -> None:
+        self.client.force_authenticate(self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                BOOK_URL,
+                {"title": "New", "author": "A", "cover": "HARD",
+                 "inventory": 1, "daily_fee": "1.00"},
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.get(self.admin, BORROWING_URL)
+        self.get(self.reader, BOOK_URL)
+        self.choose_replica.assert_not_called()
+
+        self.get(self.reader, BORROWING_URL)
+        self.choose_replica.assert_called_once()
@@ -0,0 +1,114 @@
+from datetime import date, timedelta
+from unittest import mock
+
+import redis
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from book.models import Book
+from library_service import throttling
+from library_service.throttling import ScopedTokenBucketThrottle
+
+BOOK_URL = reverse("library:book-list")
+BORROWING_URL = reverse("borrowing:borrowing-list")
+RATES = {"anon": "1000/min", "user": "1000/min", "catalog": "3/min"}
+
+
+@mock.patch.dict(ScopedTokenBucketThrottle.THROTTLE_RATES, RATES)
+class TokenBucketThrottleTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.script = mock.Mock(return_value=0)
+        patcher = mock.patch.object(
+            throttling, "get_token_bucket_script", return_value=self.script
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(setattr, throttling, "_down_until", 0.0)
+
+    def scoped_calls(self, scope: str) -> list:
+        return [
+            call for call in self.script.call_args_list
+            if call.kwargs["keys"][0].startswith(f"throttle_{scope}_")
+        ]
+
+    def test_catalog_scope_takes_a_token_per_request(self) -> None:
+        self.client.get(BOOK_URL)
+
+        (call,) = self.scoped_calls("catalog")
+        capacity, per_ms = call.kwargs["args"]
+        self.assertEqual(capacity, 3)
+        self.assertAlmostEqual(per_ms, 3 / 60000)
+
+    def test_empty_bucket_throttles_with_retry_after(self) -> None:
+        self.script.side_effect = lambda keys, args: (
+            1500 if keys[0].startswith("throttle_catalog_") else 0
+        )
+
+        response = self.client.get(BOOK_URL)
+
+        self.assertEqual(
+            response.status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        self.assertEqual(response["Retry-After"], "2")
+
+    def test_borrowing_reads_are_not_in_the_borrow_scope(self) -> None:
+        user = get_user_model().objects.create_user(
+            "test@test.com", "testpassword"
+        )
+        self.client.force_authenticate(user)
+
+        self.client.get(BORROWING_URL)
+
+        self.assertFalse(self.scoped_calls("borrow"))
+        self.assertTrue(self.scoped_calls("user"))
+
+    def test_redis_errors_fall_back_to_the_local_cache(self) -> None:
+        self.script.side_effect = redis.ConnectionError
+
+        responses = [self.client.get(BOOK_URL) for _ in range(4)]
+
+        self.assertEqual(
+            [response.status_code for response in responses],
+            [200, 200, 200, 429],
+        )
+        # Redis is left alone for THROTTLE_REDIS_RETRY seconds.
+        self.assertEqual(self.script.call_count, 1)
+
+
+@mock.patch.dict(
+    ScopedTokenBucketThrottle.THROTTLE_RATES, {"borrow": "2/min"}
+)
+class BorrowScopeTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        admin = get_user_model().objects.create_superuser(
+            "admin@test.com", "testpassword"
+        )
+        self.client.force_authenticate(admin)
+        self.payload = {
+            "borrow_date": date.today(),
+            "expected_return_date": date.today() + timedelta(days=3),
+            "book": Book.objects.create(
+                title="test", inventory=10, daily_fee=1
+            ).id,
+            "borrower": admin.id,
+        }
+
+    def test_borrowing_without_redis_uses_the_local_cache(self) -> None:
+        responses = [
+            self.client.post(BORROWING_URL, self.payload) for _ in range(3)
+        ]
+
+        self.assertEqual(
+            [response.status_code for response in responses],
+            [201, 201, 429],
+        )
+        self.assertEqual(self.client.get(BORROWING_URL).status_code, 200)
@@ -1,3 +1,5 @@
+from django.conf import settings
+from django.urls import path
 from rest_framework import routers
 
 from book.views import BookViewSet
@@ -8,4 +10,12 @@ router.register("books", BookViewSet)
 
 urlpatterns = router.urls
 
+if settings.ASYNC_READ_VIEWS:
+    from book.async_views import book_detail, book_list
+
+    urlpatterns = [
+        path("books/", book_list, name="book-list"),
+        path("books/<int:pk>/", book_detail, name="book-detail"),
+    ] + urlpatterns
+
 app_name = "book"
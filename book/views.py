@@ -1,34 +1,107 @@
+from functools import partial
 from typing import Any
 
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast, Coalesce, NullIf
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from rest_framework import viewsets
-from rest_framework.pagination import PageNumberPagination
 
+from book.async_api import AsyncThrottleMixin
+from book.cache import CatalogCacheMixin
+from book.conditional import ConditionalGetMixin
+from book.fast_serializers import BookValuesSerializer, FastListMixin
 from book.models import Book
+from book.pagination import LibraryPagination
 from book.permissions import IsAdminOrIfAllowAnyReadOnly
+from book.search import search_books
 from book.serializers import BookSerializer, BookUpdateSerializer
+from library_service.replicas import (
+    CATALOG_PIN,
+    ReplicaReadMixin,
+)
 
+ORDERING_FIELDS = {
+    "title": F("title"),
+    "inventory": F("inventory"),
+    "popularity": Coalesce("stats__total_loans", 0),
+    "active_loans": Coalesce("stats__active_loans", 0),
+    "overdue_returns": Coalesce("stats__overdue_returns", 0),
+    "average_loan_days": Coalesce(
+        Cast("stats__loan_days", FloatField())
+        / NullIf("stats__returned_loans", 0),
+        0.0,
+    ),
+}
+TRUE_VALUES = ("true", "1")
+FALSE_VALUES = ("false", "0")
 
-class LibraryPagination(PageNumberPagination):
-    page_size = 5
-    max_page_size = 100
 
-
-class BookViewSet(viewsets.ModelViewSet):
+class BookViewSet(
+    AsyncThrottleMixin,
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    CatalogCacheMixin,
+    FastListMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Book.objects.all()
     serializer_class = BookSerializer
+    fast_list_serializer_class = BookValuesSerializer
     pagination_class = LibraryPagination
+    keyset_ordering = ("title", "id")
     permission_classes = (IsAdminOrIfAllowAnyReadOnly,)
+    throttle_scope = "catalog"
 
     def get_queryset(self) -> queryset:
         title = self.request.query_params.get("title")
+        query = self.request.query_params.get("q")
+        available = self.request.query_params.get("available", "").lower()
+        ordering = self.request.query_params.get("ordering")
 
         queryset = self.queryset
 
         if title:
             queryset = queryset.filter(title__icontains=title)
 
-        return queryset.distinct()
+        if available in TRUE_VALUES:
+            queryset = queryset.filter(inventory__gt=0)
+        elif available in FALSE_VALUES:
+            queryset = queryset.filter(inventory=0)
+
+        if query:
+            queryset = search_books(queryset, query)
+
+        if ordering:
+            queryset = self.order_queryset(queryset, ordering)
+
+        return queryset
+
+    @staticmethod
+    def order_queryset(queryset: queryset, ordering: str) -> queryset:
+        """Order by the comma-separated ``ORDERING_FIELDS`` in
+        ``ordering``, descending with a leading ``-``. Unknown fields are
+        ignored."""
+        terms = []
+
+        for term in ordering.split(","):
+            name = term.strip().lstrip("-")
+            if name in ORDERING_FIELDS:
+                expression = ORDERING_FIELDS[name]
+                terms.append(
+                    expression.desc()
+                    if term.strip().startswith("-")
+                    else expression.asc()
+                )
+
+        if not terms:
+            return queryset
+
+        return queryset.order_by(*terms, "id")
+
+    def get_replica_pins(self, request) -> list:
+        # A replica that hasn't caught up with a catalog change would
+        # fill the cache under the new catalog version.
+        return super().get_replica_pins(request) + [CATALOG_PIN]
 
     def get_serializer_class(self):
         if self.action == "update":
@@ -43,7 +116,49 @@ class BookViewSet(viewsets.ModelViewSet):
                 type=str,
                 description="Filter by book title (ex. ?title=Love Story)"
             ),
+            OpenApiParameter(
+                name="q",
+                type=str,
+                description="Search by title or author, ranked by "
+                            "relevance and tolerant to typos. Cursor "
+                            "pages keep the matches but order them by "
+                            "title (ex. ?q=lvoe story)"
+            ),
+            OpenApiParameter(
+                name="available",
+                type=bool,
+                description="Only books with copies on the shelf, or "
+                            "only books without (ex. ?available=true)"
+            ),
+            OpenApiParameter(
+                name="ordering",
+                type=str,
+                description="Order by title, inventory, popularity, "
+                            "active_loans, overdue_returns or "
+                            "average_loan_days, descending with a "
+                            "leading '-'. Ignored for cursor pages "
+                            "(ex. ?ordering=-popularity,title)"
+            ),
         ]
     )
     def list(self, request, *args, **kwargs) -> Any:
-        return super().list(request, *args, **kwargs)
+        return self.conditional_response(
+            partial(self.cached_response, super().list),
+            request,
+            *args,
+            **kwargs,
+        )
+
+    def retrieve(self, request, *args, **kwargs) -> Any:
+        return self.conditional_response(
+            partial(self.cached_response, super().retrieve),
+            request,
+            *args,
+            **kwargs,
+        )
+
+    def get_list_version(self) -> tuple:
+        return self.cached_value("version", super().get_list_version)
+
+    def get_object_version(self) -> Any:
+        return self.cached_value("version", super().get_object_version)
@@ -2,5 +2,12 @@ from django.contrib import admin
 
 from borrowing.models import Borrowing, Payment
 
-admin.site.register(Borrowing)
-admin.site.register(Payment)
+
+@admin.register(Borrowing)
+class BorrowingAdmin(admin.ModelAdmin):
+    list_select_related = ("book",)
+
+
+@admin.register(Payment)
+class PaymentAdmin(admin.ModelAdmin):
+    list_select_related = ("borrowing__book",)
@@ -0,0 +1,38 @@
+from typing import Any
+
+from book.async_api import (
+    Fallback,
+    api_request,
+    async_read_view,
+    json_response,
+    paginate,
+)
+from borrowing.fast_serializers import BorrowingListValuesSerializer
+from borrowing.views import BorrowingViewSet
+from library_service.replicas import replica_reads, user_pin
+
+borrowing_list_view = BorrowingViewSet.as_view(
+    {"get": "list", "post": "create"}, basename="borrowing", detail=False
+)
+
+
+@async_read_view(borrowing_list_view)
+async def borrowing_list(request) -> Any:
+    drf_request = await api_request(request)
+
+    if not drf_request.user.is_authenticated:
+        raise Fallback
+
+    try:
+        queryset = BorrowingViewSet(
+            request=drf_request, action="list", kwargs={}, format_kwarg=None
+        ).get_queryset()
+    except ValueError:
+        raise Fallback
+
+    with await replica_reads([user_pin(drf_request.user)]):
+        data = await paginate(
+            drf_request, queryset, BorrowingListValuesSerializer()
+        )
+
+    return json_response(data)
@@ -0,0 +1,66 @@
+from datetime import date
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef, QuerySet
+
+from borrowing.models import Borrowing, Payment
+from borrowing.summary import invalidate_user_summaries
+
+
+def unbilled_borrowings(returned_on: date = None) -> QuerySet:
+    """Returned borrowings that don't have any payment yet."""
+    queryset = Borrowing.objects.filter(
+        ~Exists(Payment.objects.filter(borrowing=OuterRef("pk"))),
+        actual_return_date__isnull=False,
+    )
+
+    if returned_on:
+        queryset = queryset.filter(actual_return_date=returned_on)
+
+    return queryset
+
+
+def bill_returned_borrowings(
+    returned_on: date = None, batch_size: int = None
+) -> int:
+    """Create a pending payment for every unbilled returned borrowing.
+
+    Borrowings are priced with ``with_amount_due`` and inserted with
+    ``bulk_create`` one batch per transaction. Billed borrowings drop out
+    of the selection, so an interrupted run can simply be started again.
+    Concurrent runs skip each other's locked rows, and every batch is
+    checked for payments again once locked: the selection may have read
+    a row before another run committed its payment and released it.
+    Returns the number of payments created.
+    """
+    batch_size = batch_size or settings.BILLING_BATCH_SIZE
+    created = 0
+
+    while True:
+        with transaction.atomic():
+            batch = list(
+                unbilled_borrowings(returned_on)
+                .with_amount_due()
+                .select_for_update(skip_locked=True, of=("self",))
+                .order_by("id")
+                .values_list("id", "borrower_id", "amount_due")[:batch_size]
+            )
+
+            if not batch:
+                return created
+
+            billed = set(
+                Payment.objects.filter(
+                    borrowing_id__in=[row[0] for row in batch]
+                ).values_list("borrowing_id", flat=True)
+            )
+            batch = [row for row in batch if row[0] not in billed]
+
+            Payment.objects.bulk_create(
+                Payment(borrowing_id=borrowing_id, money_to_pay=amount_due)
+                for borrowing_id, _, amount_due in batch
+            )
+            invalidate_user_summaries(row[1] for row in batch)
+
+        created += len(batch)
@@ -0,0 +1,23 @@
+from django.db.models import Func, IntegerField
+
+
+class DaysBetween(Func):
+    """Whole days from ``start`` to ``end``, both date expressions."""
+
+    arg_joiner = " - "
+    template = "(%(expressions)s)"
+    output_field = IntegerField()
+
+    def __init__(self, end, start, **extra) -> None:
+        super().__init__(end, start, **extra)
+
+    def as_sqlite(self, compiler, connection, **extra_context) -> tuple:
+        end, start = self.get_source_expressions()
+        end_sql, end_params = compiler.compile(end)
+        start_sql, start_params = compiler.compile(start)
+
+        return (
+            f"CAST(julianday({end_sql}) - julianday({start_sql}) "
+            f"AS INTEGER)",
+            (*end_params, *start_params),
+        )
@@ -0,0 +1,23 @@
+from book.fast_serializers import (
+    ValuesField,
+    ValuesSerializer,
+    to_date,
+    to_full_name,
+)
+
+
+class BorrowingListValuesSerializer(ValuesSerializer):
+    fields = (
+        ValuesField("id"),
+        ValuesField("borrow_date", convert=to_date),
+        ValuesField("expected_return_date", convert=to_date),
+        ValuesField("actual_return_date", convert=to_date),
+        ValuesField("book_title", "book__title"),
+        ValuesField("book_inventory", "book__inventory"),
+        ValuesField(
+            "borrower_full_name",
+            "borrower__first_name",
+            "borrower__last_name",
+            convert=to_full_name,
+        ),
+    )
@@ -0,0 +1,239 @@
+import math
+import random
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import Iterator
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework.views import APIView
+
+from book.models import Book
+from book.pagination import LibraryPagination
+from borrowing.models import Payment
+
+LOAD_TEST_STAFF_EMAIL = "loadtest-staff@library.test"
+PERCENTILES = (50, 90, 99)
+SEARCH_TERMS = ("shadow", "river", "garden", "winter", "glass", "night")
+
+
+def server_name() -> str:
+    for host in settings.ALLOWED_HOSTS:
+        if host != "*" and not host.startswith("."):
+            return host
+
+    return "localhost"
+
+
+def percentile(values: list, pct: float) -> float:
+    """Nearest-rank percentile of ``values``."""
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+
+    return ordered[rank - 1]
+
+
+@contextmanager
+def throttling_disabled() -> Iterator[None]:
+    """Let the harness go past the per-user and anonymous rate limits."""
+    throttle_classes = APIView.throttle_classes
+    APIView.throttle_classes = ()
+    try:
+        yield
+    finally:
+        APIView.throttle_classes = throttle_classes
+
+
+class LoadTest:
+    """In-process load test of the browse, borrow, return and pay flows.
+
+    Requests go through the full Django stack with ``APIClient``, so
+    middleware, authentication, serialization and every query are
+    measured, but there is no network or server in between. The same
+    ``seed`` replays the same sequence of requests on the same data.
+    """
+
+    def __init__(self, seed: int = 0, browse_ratio: float = 0.8) -> None:
+        self.rng = random.Random(seed)
+        self.browse_ratio = browse_ratio
+        self.latencies = defaultdict(list)
+        self.queries = defaultdict(list)
+        self.errors = defaultdict(int)
+
+        self.staff = APIClient(SERVER_NAME=server_name())
+        self.staff.force_authenticate(self.get_staff_user())
+        self.reader = APIClient(SERVER_NAME=server_name())
+        self.reader_id = None
+        self.book_ids = list(Book.objects.values_list("id", flat=True))
+        self.user_ids = list(
+            get_user_model().objects.filter(
+                is_staff=False
+            ).values_list("id", flat=True)
+        )
+
+        if not self.book_ids or not self.user_ids:
+            raise ValueError("Seed the library before running a load test")
+
+        self.book_pages = math.ceil(
+            len(self.book_ids) / LibraryPagination.page_size
+        )
+
+    @staticmethod
+    def get_staff_user():
+        user, _ = get_user_model().objects.get_or_create(
+            email=LOAD_TEST_STAFF_EMAIL, defaults={"is_staff": True}
+        )
+
+        return user
+
+    def request(
+        self, name: str, client: APIClient, method: str, url: str, **kwargs
+    ):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = getattr(client, method)(url, **kwargs)
+            elapsed = time.perf_counter() - started
+
+        self.latencies[name].append(elapsed * 1000)
+        self.queries[name].append(len(queries))
+
+        if response.status_code >= 400:
+            self.errors[name] += 1
+
+        return response
+
+    def browse(self) -> None:
+        books_url = reverse("library:book-list")
+        self.request(
+            "book list",
+            self.reader,
+            "get",
+            books_url,
+            data={"page": self.rng.randint(1, min(self.book_pages, 20))},
+        )
+        self.request(
+            "book search",
+            self.reader,
+            "get",
+            books_url,
+            data={"q": self.rng.choice(SEARCH_TERMS)},
+        )
+        self.request(
+            "book detail",
+            self.reader,
+            "get",
+            reverse(
+                "library:book-detail", args=[self.rng.choice(self.book_ids)]
+            ),
+        )
+
+    def borrow_return_pay(self) -> None:
+        book = Book.objects.filter(
+            id__in=self.rng.sample(
+                self.book_ids, min(len(self.book_ids), 20)
+            ),
+            inventory__gt=0,
+        ).first()
+
+        if book is None:
+            return
+
+        borrow_date = date.today() - timedelta(days=self.rng.randint(1, 10))
+        response = self.request(
+            "borrow",
+            self.staff,
+            "post",
+            reverse("borrowing:borrowing-list"),
+            data={
+                "borrow_date": borrow_date,
+                "expected_return_date": borrow_date + timedelta(
+                    days=self.rng.randint(1, 14)
+                ),
+                "book": book.id,
+                "borrower": self.reader_id,
+            },
+        )
+
+        if response.status_code >= 400:
+            return
+
+        borrowing_id = response.data["id"]
+        self.request(
+            "borrowing list",
+            self.reader,
+            "get",
+            reverse("borrowing:borrowing-list"),
+            data={"is_active": "true"},
+        )
+        self.request(
+            "return",
+            self.staff,
+            "post",
+            reverse("borrowing:borrowing-return-book", args=[borrowing_id]),
+        )
+        response = self.request(
+            "pay",
+            self.staff,
+            "post",
+            reverse("borrowing:payment-list"),
+            data={
+                "borrowing": borrowing_id,
+                "status_payment": Payment.PENDING,
+                "type_payment": Payment.PAYMENT,
+            },
+        )
+
+        if response.status_code < 400:
+            self.request(
+                "payment detail",
+                self.reader,
+                "get",
+                reverse(
+                    "borrowing:payment-detail", args=[response.data["id"]]
+                ),
+            )
+
+    def run(self, iterations: int) -> dict:
+        user_model = get_user_model()
+
+        with throttling_disabled():
+            for _ in range(iterations):
+                self.reader_id = self.rng.choice(self.user_ids)
+                self.reader.force_authenticate(
+                    user_model.objects.get(id=self.reader_id)
+                )
+
+                if self.rng.random() < self.browse_ratio:
+                    self.browse()
+                else:
+                    self.borrow_return_pay()
+
+        return self.report()
+
+    def report(self) -> dict:
+        report = {}
+
+        for name, latencies in self.latencies.items():
+            queries = self.queries[name]
+            report[name] = {
+                "requests": len(latencies),
+                "errors": self.errors[name],
+                **{
+                    f"p{pct}_ms": round(percentile(latencies, pct), 2)
+                    for pct in PERCENTILES
+                },
+                "max_ms": round(max(latencies), 2),
+                "queries_avg": round(sum(queries) / len(queries), 2),
+                "queries_max": max(queries),
+            }
+
+        return report
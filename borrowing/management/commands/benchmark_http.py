@@ -0,0 +1,109 @@
+import asyncio
+import time
+
+import httpx
+from django.core.management.base import BaseCommand, CommandError
+
+from borrowing.loadtest import PERCENTILES, percentile
+
+DEFAULT_PATHS = ("/api/library/books/", "/api/library/books/?page=2")
+
+
+class Command(BaseCommand):
+    """Django command to compare the throughput of the WSGI and ASGI
+    servers under many concurrent connections to the read endpoints"""
+
+    def add_arguments(self, parser):
+        parser.add_argument("--wsgi-url", default="http://127.0.0.1:8000")
+        parser.add_argument("--asgi-url", default="http://127.0.0.1:8001")
+        parser.add_argument(
+            "--path",
+            action="append",
+            dest="paths",
+            help="Path to request, can be repeated",
+        )
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument("--duration", type=float, default=10.0)
+        parser.add_argument(
+            "--token", help="Access token sent as a Bearer token"
+        )
+
+    def handle(self, *args, **options):
+        paths = options["paths"] or DEFAULT_PATHS
+        headers = {"Accept": "application/json"}
+        if options["token"]:
+            headers["Authorization"] = f"Bearer {options['token']}"
+
+        percentile_columns = "".join(
+            f"{f'p{pct} ms':>10}" for pct in PERCENTILES
+        )
+        self.stdout.write(
+            f"{'server':<8}{'requests':>10}{'errors':>8}{'req/s':>10}"
+            f"{percentile_columns}"
+        )
+        for name in ("wsgi", "asgi"):
+            report = asyncio.run(
+                self.run(
+                    options[f"{name}_url"],
+                    paths,
+                    headers,
+                    options["concurrency"],
+                    options["duration"],
+                )
+            )
+            percentiles = "".join(
+                f"{percentile(report['latencies'], pct) * 1000:>10.2f}"
+                for pct in PERCENTILES
+            )
+            self.stdout.write(
+                f"{name:<8}{len(report['latencies']):>10}"
+                f"{report['errors']:>8}{report['rate']:>10.1f}"
+                f"{percentiles}"
+            )
+
+    @staticmethod
+    async def run(
+        base_url: str,
+        paths: tuple,
+        headers: dict,
+        concurrency: int,
+        duration: float,
+    ) -> dict:
+        latencies = []
+        errors = 0
+
+        async def worker(offset: int) -> None:
+            nonlocal errors
+            index = offset
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(paths[index % len(paths)])
+                    failed = response.status_code >= 400
+                except httpx.HTTPError:
+                    failed = True
+                latencies.append(time.perf_counter() - started)
+                errors += failed
+                index += 1
+
+        async with httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            limits=httpx.Limits(max_connections=concurrency),
+            timeout=30,
+        ) as client:
+            try:
+                await client.get(paths[0])
+            except httpx.HTTPError as exc:
+                raise CommandError(f"{base_url} is not reachable: {exc}")
+
+            started = time.perf_counter()
+            deadline = started + duration
+            await asyncio.gather(*(worker(i) for i in range(concurrency)))
+            elapsed = time.perf_counter() - started
+
+        return {
+            "latencies": latencies,
+            "errors": errors,
+            "rate": len(latencies) / elapsed,
+        }
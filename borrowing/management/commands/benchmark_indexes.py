@@ -0,0 +1,167 @@
+import json
+from datetime import date
+from statistics import median
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from borrowing.models import Borrowing, Payment
+from borrowing.seeding import seed_library
+
+# (table, columns) of the indexes added for the hot borrowing queries.
+HOT_QUERY_INDEXES = (
+    ("borrowing_borrowing", ["borrower_id", "borrow_date"]),
+    ("borrowing_borrowing", ["expected_return_date"]),
+    ("borrowing_payment", ["session_id"]),
+    ("borrowing_payment", ["borrowing_id", "status_payment"]),
+)
+
+
+class Command(BaseCommand):
+    """Django command to seed borrowings and compare EXPLAIN ANALYZE
+    timings of the hot queries with and without their indexes.
+
+    Never run it against a live database: the dropped indexes are only
+    restored by a rollback, and DROP INDEX holds an ACCESS EXCLUSIVE lock
+    on the tables until then, blocking every other query on them"""
+
+    def add_arguments(self, parser):
+        parser.add_argument("--borrowings", type=int, default=1000000)
+        parser.add_argument("--books", type=int, default=10000)
+        parser.add_argument("--users", type=int, default=50000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--skip-seed",
+            action="store_true",
+            help="Benchmark the rows already in the database",
+        )
+        parser.add_argument(
+            "--runs",
+            type=int,
+            default=5,
+            help="Timed runs of each query set, reported as the median",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "postgresql":
+            raise CommandError("EXPLAIN ANALYZE benchmark needs PostgreSQL")
+
+        if options["runs"] < 1:
+            raise CommandError("--runs must be at least 1")
+
+        if not options["skip_seed"]:
+            with transaction.atomic():
+                seed_library(
+                    books=options["books"],
+                    users=options["users"],
+                    borrowings=options["borrowings"],
+                    seed=options["seed"],
+                    log=self.stdout.write,
+                )
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+        queries = self.hot_queries()
+        # Warm the cache with the pages both query sets read, so neither
+        # pays for a cold start.
+        self.explain(queries)
+        self.explain_without_indexes(queries)
+
+        with_runs, without_runs = [], []
+        for run in range(options["runs"]):
+            # Alternate the order so caching favours neither.
+            if run % 2:
+                without_runs.append(self.explain_without_indexes(queries))
+                with_runs.append(self.explain(queries))
+            else:
+                with_runs.append(self.explain(queries))
+                without_runs.append(self.explain_without_indexes(queries))
+
+        with_indexes = self.medians(with_runs)
+        without_indexes = self.medians(without_runs)
+
+        self.stdout.write(f"Median of {options['runs']} runs")
+        self.stdout.write(f"{'query':<32}{'without':>12}{'with':>12}")
+        for name in queries:
+            self.stdout.write(
+                f"{name:<32}"
+                f"{without_indexes[name]:>10.2f}ms"
+                f"{with_indexes[name]:>10.2f}ms"
+            )
+
+    @staticmethod
+    def hot_queries() -> dict:
+        borrowing = Borrowing.objects.order_by("?").first()
+        payment = Payment.objects.order_by("?").first()
+
+        if borrowing is None or payment is None:
+            raise CommandError("Nothing to benchmark, seed some rows first")
+
+        return {
+            "user borrowings": Borrowing.objects.filter(
+                borrower_id=borrowing.borrower_id
+            ).order_by("borrow_date")[:5],
+            "user active borrowings": Borrowing.objects.filter(
+                borrower_id=borrowing.borrower_id,
+                actual_return_date__isnull=True,
+            ).order_by("borrow_date")[:5],
+            "overdue borrowings": Borrowing.objects.filter(
+                expected_return_date__lt=date.today(),
+                actual_return_date__isnull=True,
+            ),
+            "payment by session": Payment.objects.filter(
+                session_id=payment.session_id
+            ),
+            "borrowing payments by status": Payment.objects.filter(
+                borrowing_id=payment.borrowing_id,
+                status_payment=Payment.PENDING,
+            ),
+        }
+
+    @staticmethod
+    def explain(queries: dict) -> dict:
+        timings = {}
+
+        with connection.cursor() as cursor:
+            for name, queryset in queries.items():
+                sql, params = queryset.query.sql_with_params()
+                cursor.execute(
+                    f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}", params
+                )
+                plan = cursor.fetchone()[0]
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                timings[name] = plan[0]["Execution Time"]
+
+        return timings
+
+    def explain_without_indexes(self, queries: dict) -> dict:
+        with transaction.atomic():
+            self.drop_hot_query_indexes()
+            timings = self.explain(queries)
+            transaction.set_rollback(True)
+
+        return timings
+
+    @staticmethod
+    def medians(runs: list) -> dict:
+        return {name: median(run[name] for run in runs) for name in runs[0]}
+
+    @staticmethod
+    def drop_hot_query_indexes() -> None:
+        with connection.cursor() as cursor:
+            for table, columns in HOT_QUERY_INDEXES:
+                constraints = connection.introspection.get_constraints(
+                    cursor, table
+                )
+                for name, constraint in constraints.items():
+                    if (
+                        constraint["index"]
+                        and not constraint["unique"]
+                        and not constraint["primary_key"]
+                        and constraint["columns"] == columns
+                    ):
+                        cursor.execute(
+                            f"DROP INDEX {connection.ops.quote_name(name)}"
+                        )
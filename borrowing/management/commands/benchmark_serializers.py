@@ -0,0 +1,100 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from book.fast_serializers import BookValuesSerializer
+from book.models import Book
+from book.renderers import FastJSONRenderer
+from book.serializers import BookSerializer
+from borrowing.fast_serializers import BorrowingListValuesSerializer
+from borrowing.models import Borrowing
+from borrowing.seeding import seed_library
+from borrowing.serializers import BorrowingListSerializer
+
+
+class Command(BaseCommand):
+    """Django command to compare rows per second of the model serializers
+    and the values-based list serializers, rendering included"""
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=100)
+        parser.add_argument("--repeat", type=int, default=200)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+
+        with transaction.atomic():
+            if Borrowing.objects.count() < rows:
+                seed_library(
+                    books=rows,
+                    users=rows,
+                    borrowings=rows,
+                    seed=options["seed"],
+                )
+
+            books = Book.objects.order_by("id")[:rows]
+            borrowings = Borrowing.objects.select_related(
+                "book", "borrower"
+            ).order_by("id")[:rows]
+
+            book_values = BookValuesSerializer()
+            borrowing_values = BorrowingListValuesSerializer()
+            cases = (
+                (
+                    "BookSerializer",
+                    list(books),
+                    lambda page: BookSerializer(page, many=True).data,
+                    JSONRenderer(),
+                ),
+                (
+                    "BookValuesSerializer",
+                    list(book_values.values(books)),
+                    book_values.serialize,
+                    FastJSONRenderer(),
+                ),
+                (
+                    "BorrowingListSerializer",
+                    list(borrowings),
+                    lambda page: BorrowingListSerializer(page, many=True).data,
+                    JSONRenderer(),
+                ),
+                (
+                    "BorrowingListValuesSerializer",
+                    list(borrowing_values.values(borrowings)),
+                    borrowing_values.serialize,
+                    FastJSONRenderer(),
+                ),
+            )
+
+            transaction.set_rollback(True)
+
+        if not cases[0][1]:
+            raise CommandError("No rows to serialize")
+
+        self.stdout.write(
+            f"{'serializer':<32}{'rows/s':>12}{'with rendering':>16}"
+        )
+        for name, page, serialize, renderer in cases:
+            serialized = self.rows_per_second(
+                page, serialize, options["repeat"]
+            )
+            rendered = self.rows_per_second(
+                page,
+                lambda page: renderer.render(serialize(page)),
+                options["repeat"],
+            )
+            self.stdout.write(
+                f"{name:<32}{serialized:>12.0f}{rendered:>16.0f}"
+            )
+
+    @staticmethod
+    def rows_per_second(page: list, func, repeat: int) -> float:
+        started = time.perf_counter()
+        for _ in range(repeat):
+            func(page)
+        elapsed = time.perf_counter() - started
+
+        return len(page) * repeat / elapsed
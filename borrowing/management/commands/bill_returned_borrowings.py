@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from borrowing.billing import bill_returned_borrowings
+
+
+class Command(BaseCommand):
+    """Django command to create payments for returned borrowings
+    that haven't been billed yet"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--date",
+            dest="returned_on",
+            help="Only bill borrowings returned on this day (YYYY-MM-DD)",
+        )
+        parser.add_argument("--batch-size", type=int)
+
+    def handle(self, *args, **options):
+        returned_on = None
+
+        if options["returned_on"]:
+            returned_on = parse_date(options["returned_on"])
+            if returned_on is None:
+                raise CommandError("Date must be in YYYY-MM-DD format")
+
+        started = time.perf_counter()
+        created = bill_returned_borrowings(
+            returned_on=returned_on, batch_size=options["batch_size"]
+        )
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {created} payments in {elapsed:.3f}s "
+                f"({created / elapsed:.0f} rows/s)"
+            )
+        )
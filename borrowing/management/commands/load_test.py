@@ -0,0 +1,50 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from borrowing.loadtest import PERCENTILES, LoadTest
+
+
+class Command(BaseCommand):
+    """Django command to replay the browse, borrow, return and pay flows
+    in-process and report latency percentiles and queries per request"""
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=500)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--browse-ratio", type=float, default=0.8)
+        parser.add_argument(
+            "--output",
+            help="Write the report as JSON to compare it between releases",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            load_test = LoadTest(
+                seed=options["seed"], browse_ratio=options["browse_ratio"]
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        report = load_test.run(options["iterations"])
+
+        percentile_columns = "".join(
+            f"{f'p{pct} ms':>10}" for pct in PERCENTILES
+        )
+        self.stdout.write(
+            f"{'endpoint':<16}{'requests':>10}{'errors':>8}"
+            f"{percentile_columns}{'max ms':>10}{'queries':>9}"
+        )
+        for name, row in sorted(report.items()):
+            percentiles = "".join(
+                f"{row[f'p{pct}_ms']:>10.2f}" for pct in PERCENTILES
+            )
+            self.stdout.write(
+                f"{name:<16}{row['requests']:>10}{row['errors']:>8}"
+                f"{percentiles}{row['max_ms']:>10.2f}"
+                f"{row['queries_avg']:>9.1f}"
+            )
+
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(report, output, indent=2, sort_keys=True)
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from borrowing.seeding import seed_library
+
+
+class Command(BaseCommand):
+    """Django command to bulk-generate books, users, borrowings and
+    payments from a seedable random generator"""
+
+    def add_arguments(self, parser):
+        parser.add_argument("--books", type=int, default=1000)
+        parser.add_argument("--users", type=int, default=5000)
+        parser.add_argument("--borrowings", type=int, default=100000)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+
+        with transaction.atomic():
+            created = seed_library(
+                books=options["books"],
+                users=options["users"],
+                borrowings=options["borrowings"],
+                seed=options["seed"],
+                log=self.stdout.write,
+            )
+
+        elapsed = time.perf_counter() - started
+        summary = ", ".join(
+            f"{count} {name}" for name, count in created.items()
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Created {summary} in {elapsed:.1f}s")
+        )
@@ -1,15 +1,62 @@
 from datetime import date, timedelta
+from decimal import Decimal
 
 from django.conf import settings
 from django.db import models
+from django.db.models import Case, DecimalField, F, Value, When
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
 
 from book.models import Book
+from borrowing.expressions import DaysBetween
 
 
 def default_return_expecting_date():
     return date.today() + timedelta(days=3)
 
 
+class BorrowingQuerySet(models.QuerySet):
+    def with_amount_due(self, on_date: date = None) -> models.QuerySet:
+        """Annotate every borrowing with its price computed in SQL.
+
+        Adds ``days_borrowed``, ``days_actual``, ``overdue_days``,
+        ``rental_fee`` and ``amount_due``. Borrowings that are not
+        returned yet are priced as if returned on ``on_date`` (today by
+        default). Overdue days cost ``FINE_MULTIPLIER`` times the fee.
+        """
+        return_date = Coalesce(
+            "actual_return_date",
+            Value(on_date or timezone.localdate(), models.DateField()),
+        )
+        daily_fee = F("book__daily_fee")
+        money = DecimalField(max_digits=10, decimal_places=2)
+
+        return self.annotate(
+            days_borrowed=DaysBetween("expected_return_date", "borrow_date"),
+            days_actual=DaysBetween(return_date, "borrow_date"),
+        ).annotate(
+            overdue_days=Greatest(
+                F("days_actual") - F("days_borrowed"), Value(0)
+            ),
+            rental_fee=models.ExpressionWrapper(
+                daily_fee * F("days_borrowed"), output_field=money
+            ),
+            amount_due=Case(
+                When(days_borrowed=0, then=Value(Decimal(0))),
+                When(
+                    overdue_days__gt=0,
+                    then=daily_fee * F("days_borrowed") + (
+                        daily_fee
+                        * F("overdue_days")
+                        * Value(settings.FINE_MULTIPLIER)
+                    ),
+                ),
+                default=daily_fee * F("days_actual"),
+                output_field=money,
+            ),
+        )
+
+
 class Borrowing(models.Model):
     borrow_date = models.DateField()
     expected_return_date = models.DateField(
@@ -26,9 +73,35 @@ class Borrowing(models.Model):
         on_delete=models.CASCADE,
         related_name="borrowings"
     )
+    overdue_notified_at = models.DateTimeField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = BorrowingQuerySet.as_manager()
 
     class Meta:
         ordering = ("borrow_date",)
+        indexes = [
+            models.Index(
+                fields=("borrow_date", "id"), name="borrowing_date_id_idx"
+            ),
+            models.Index(
+                fields=("borrower", "borrow_date"),
+                name="borrowing_borrower_date_idx",
+            ),
+            models.Index(
+                fields=("expected_return_date",),
+                condition=models.Q(actual_return_date__isnull=True),
+                name="borrowing_active_due_idx",
+            ),
+            models.Index(
+                fields=("expected_return_date", "id"),
+                condition=models.Q(
+                    actual_return_date__isnull=True,
+                    overdue_notified_at__isnull=True,
+                ),
+                name="borrowing_overdue_pending_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.id}: ('{self.book.title}')"
@@ -62,10 +135,42 @@ class Payment(models.Model):
         max_length=10, choices=TYPE_CHOICES, default=PAYMENT
     )
     session_url = models.URLField(max_length=500, blank=True)
-    session_id = models.CharField(max_length=255, blank=True)
+    session_id = models.CharField(max_length=255, blank=True, db_index=True)
     money_to_pay = models.DecimalField(
         max_digits=10, decimal_places=2, default=0
     )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=("borrowing", "status_payment"),
+                name="payment_borrowing_status_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"Payment {self.id} ({self.borrowing.book.title})"
+
+
+class StripeEvent(models.Model):
+    """Append-only log of verified Stripe webhook events."""
+
+    event_id = models.CharField(max_length=255, unique=True)
+    event_type = models.CharField(max_length=255)
+    payload = models.JSONField()
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ("id",)
+        indexes = [
+            models.Index(
+                fields=("id",),
+                condition=models.Q(processed_at__isnull=True),
+                name="stripe_event_pending_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.event_type} ({self.event_id})"
@@ -0,0 +1,125 @@
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Callable, Optional
+
+from django.contrib.auth import get_user_model
+
+from book.models import Book
+from book.stats import rebuild_book_stats
+from borrowing.models import Borrowing, Payment
+
+SEED_BATCH_SIZE = 10000
+SEED_EMAIL_DOMAIN = "seed.library.test"
+
+TITLE_WORDS = (
+    "Shadow", "River", "Garden", "Empire", "Silent", "Winter", "Glass",
+    "Golden", "Last", "Hidden", "Broken", "Northern", "Secret", "Paper",
+    "Iron", "Wild", "Night", "City", "Ocean", "Stone",
+)
+FIRST_NAMES = (
+    "Olena", "Taras", "Maria", "Andrii", "Iryna", "Dmytro", "Sofia",
+    "Mykola", "Anna", "Petro", "Kateryna", "Ivan",
+)
+LAST_NAMES = (
+    "Shevchenko", "Kovalenko", "Bondarenko", "Tkachenko", "Kravchenko",
+    "Melnyk", "Boyko", "Oliynyk", "Lysenko", "Marchenko",
+)
+
+
+def seed_library(
+    books: int,
+    users: int,
+    borrowings: int,
+    seed: int = 0,
+    today: date = None,
+    log: Optional[Callable[[str], None]] = None,
+) -> dict:
+    """Bulk-generate a reproducible library.
+
+    The same ``seed`` always produces the same rows. Around 95% of the
+    borrowings are returned, a few of the active ones are overdue, and
+    every returned borrowing gets a payment in a random state.
+    Returns the number of created rows per model.
+    """
+    rng = random.Random(seed)
+    today = today or date.today()
+    user_model = get_user_model()
+
+    book_rows = Book.objects.bulk_create(
+        (
+            Book(
+                title=" ".join(rng.sample(TITLE_WORDS, 3)) + f" {index}",
+                author=(
+                    f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+                ),
+                cover=rng.choice(Book.COVER_CHOICES)[0],
+                inventory=rng.randint(0, 20),
+                daily_fee=Decimal(rng.randint(50, 500)) / 100,
+            )
+            for index in range(books)
+        ),
+        batch_size=SEED_BATCH_SIZE,
+    )
+    user_rows = user_model.objects.bulk_create(
+        (
+            user_model(
+                email=f"user{seed}-{index}@{SEED_EMAIL_DOMAIN}",
+                first_name=rng.choice(FIRST_NAMES),
+                last_name=rng.choice(LAST_NAMES),
+            )
+            for index in range(users)
+        ),
+        batch_size=SEED_BATCH_SIZE,
+    )
+    payments = 0
+
+    for offset in range(0, borrowings, SEED_BATCH_SIZE):
+        size = min(SEED_BATCH_SIZE, borrowings - offset)
+        batch = []
+
+        for _ in range(size):
+            borrow_date = today - timedelta(days=rng.randint(0, 730))
+            expected = borrow_date + timedelta(days=rng.randint(1, 30))
+            returned = rng.random() < 0.95
+            batch.append(
+                Borrowing(
+                    borrow_date=borrow_date,
+                    expected_return_date=expected,
+                    actual_return_date=(
+                        min(
+                            borrow_date + timedelta(days=rng.randint(1, 40)),
+                            today,
+                        )
+                        if returned else None
+                    ),
+                    book=rng.choice(book_rows),
+                    borrower=rng.choice(user_rows),
+                )
+            )
+
+        batch = Borrowing.objects.bulk_create(batch)
+        payments += len(
+            Payment.objects.bulk_create(
+                Payment(
+                    borrowing=borrowing,
+                    session_id=f"cs_seed_{borrowing.id}",
+                    status_payment=rng.choice(Payment.STATUS_CHOICES)[0],
+                    money_to_pay=Decimal(rng.randint(100, 5000)) / 100,
+                )
+                for borrowing in batch
+                if borrowing.actual_return_date
+            )
+        )
+
+        if log:
+            log(f"Seeded {offset + size} borrowings")
+
+    rebuild_book_stats()
+
+    return {
+        "books": len(book_rows),
+        "users": len(user_rows),
+        "borrowings": borrowings,
+        "payments": payments,
+    }
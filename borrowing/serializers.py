@@ -1,13 +1,27 @@
+from collections import Counter
 from typing import Any
 
-from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
 
-from book.notifications import send_new_borrowing_notification
+from book.inventory import release_books, reserve_books, reserve_copies
+from book.stats import record_loans, record_returns
+from book.models import Book
+from book.notifications import (
+    send_new_borrowing_notification,
+    send_new_borrowings_notification,
+)
 from book.serializers import BookSerializer
 from borrowing.models import Borrowing, Payment
+from borrowing.summary import invalidate_user_summaries
 from user.serializers import UserSerializer
 
+NO_BOOKS_LEFT_MESSAGE = "I’m sorry, but there are no more books"
+NOT_ACTIVE_MESSAGE = "These borrowings don't exist or were already returned"
+BULK_MAX_ITEMS = 50
+
 
 class BorrowingSerializer(serializers.ModelSerializer):
 
@@ -62,22 +76,121 @@ class BorrowingCreateSerializer(BorrowingSerializer):
 
         if attrs["book"].inventory == 0:
             raise serializers.ValidationError(
-                {"message": "I’m sorry, but there are no more books"}
+                {"message": NO_BOOKS_LEFT_MESSAGE}
             )
 
         return data
 
     def create(self, validated_data) -> Borrowing:
-        borrowing = Borrowing.objects.create(**validated_data)
-
-        if borrowing.borrow_date:
-            borrowing.book.inventory -= 1
-            borrowing.book.save()
-            borrowing.save()
+        with transaction.atomic():
+            if not reserve_copies(validated_data["book"].id):
+                raise serializers.ValidationError(
+                    {"message": NO_BOOKS_LEFT_MESSAGE}
+                )
 
+            borrowing = Borrowing.objects.create(**validated_data)
+            record_loans({borrowing.book_id: 1})
             send_new_borrowing_notification(borrowing_id=borrowing.id)
 
-            return borrowing
+        return borrowing
+
+
+class BorrowingBulkCreateSerializer(serializers.Serializer):
+    borrow_date = serializers.DateField()
+    expected_return_date = serializers.DateField()
+    borrower = serializers.PrimaryKeyRelatedField(
+        queryset=get_user_model().objects.all()
+    )
+    books = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=BULK_MAX_ITEMS,
+    )
+
+    def validate_books(self, value: list) -> list:
+        found = Book.objects.filter(pk__in=value).values_list(
+            "id", flat=True
+        )
+        missing = sorted(set(value) - set(found))
+
+        if missing:
+            raise serializers.ValidationError(
+                f"Invalid pk {missing} - object does not exist."
+            )
+
+        return value
+
+    def create(self, validated_data) -> list:
+        """Reserve every book and create the borrowings in one
+        transaction, with one notification for the whole batch."""
+        book_ids = validated_data.pop("books")
+        counts = Counter(book_ids)
+
+        with transaction.atomic():
+            out_of_stock = reserve_books(counts)
+
+            if out_of_stock:
+                raise serializers.ValidationError(
+                    {"message": NO_BOOKS_LEFT_MESSAGE, "books": out_of_stock}
+                )
+
+            borrowings = Borrowing.objects.bulk_create(
+                Borrowing(book_id=book_id, **validated_data)
+                for book_id in book_ids
+            )
+            record_loans(counts)
+            invalidate_user_summaries([validated_data["borrower"].id])
+            send_new_borrowings_notification(
+                borrowing.id for borrowing in borrowings
+            )
+
+        return borrowings
+
+
+class BorrowingBulkReturnSerializer(serializers.Serializer):
+    borrowings = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=BULK_MAX_ITEMS,
+    )
+
+    def create(self, validated_data) -> list:
+        """Return every borrowing and put the books back on the shelf in
+        one transaction."""
+        ids = set(validated_data["borrowings"])
+        today = timezone.localdate()
+
+        with transaction.atomic():
+            rows = Borrowing.objects.select_for_update().filter(
+                pk__in=ids, actual_return_date__isnull=True
+            ).order_by("id").values_list(
+                "id",
+                "borrower_id",
+                "book_id",
+                "borrow_date",
+                "expected_return_date",
+            )
+            active = {row[0]: row[2:] for row in rows}
+
+            if len(active) != len(ids):
+                raise serializers.ValidationError(
+                    {
+                        "message": NOT_ACTIVE_MESSAGE,
+                        "borrowings": sorted(ids - set(active)),
+                    }
+                )
+
+            Borrowing.objects.filter(pk__in=active).update(
+                actual_return_date=today, updated_at=timezone.now()
+            )
+            release_books(Counter(loan[0] for loan in active.values()))
+            record_returns(active.values(), today)
+            invalidate_user_summaries(row[1] for row in rows)
+
+        return sorted(active)
+
+    def to_representation(self, instance) -> Any:
+        return {"status": f"{len(instance)} books were successfully returned"}
 
 
 class BorrowingReturnBookSerializer(serializers.ModelSerializer):
@@ -102,10 +215,13 @@ class BorrowingReturnBookSerializer(serializers.ModelSerializer):
         )
 
 
+class BorrowingAmountDueField(serializers.PrimaryKeyRelatedField):
+    def get_queryset(self) -> Any:
+        return Borrowing.objects.with_amount_due()
+
+
 class PaymentSerializer(serializers.ModelSerializer):
-    borrowing = serializers.PrimaryKeyRelatedField(
-        queryset=Borrowing.objects.select_related("book", "borrower")
-    )
+    borrowing = BorrowingAmountDueField()
     money_to_pay = serializers.DecimalField(
         max_digits=10, decimal_places=2, read_only=True
     )
@@ -133,25 +249,7 @@ class PaymentSerializer(serializers.ModelSerializer):
         )
 
     def create(self, validated_data) -> Any:
-        borrowing = validated_data["borrowing"]
-        book = borrowing.book
-        days_borrowed = (
-            borrowing.expected_return_date - borrowing.borrow_date
-        ).days
-        days_actual = (
-            borrowing.actual_return_date - borrowing.borrow_date
-        ).days
-        overdue_days = days_actual - days_borrowed
-
-        if days_borrowed:
-            if borrowing.actual_return_date > borrowing.expected_return_date:
-                money_to_pay = days_borrowed * book.daily_fee + (
-                    overdue_days * book.daily_fee * settings.FINE_MULTIPLIER
-                )
-            else:
-                money_to_pay = days_actual * book.daily_fee
-
-            validated_data["money_to_pay"] = money_to_pay
+        validated_data["money_to_pay"] = validated_data["borrowing"].amount_due
 
         return super(PaymentSerializer, self).create(validated_data)
 
@@ -0,0 +1,27 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from borrowing.models import Borrowing, Payment
+from borrowing.summary import invalidate_user_summaries
+
+
+@receiver(post_save, sender=Borrowing)
+@receiver(post_delete, sender=Borrowing)
+def invalidate_borrower_summary(sender, instance: Borrowing, **kwargs) -> None:
+    invalidate_user_summaries([instance.borrower_id])
+
+
+@receiver(post_save, sender=Payment)
+@receiver(post_delete, sender=Payment)
+def invalidate_payer_summary(sender, instance: Payment, **kwargs) -> None:
+    if Payment.borrowing.is_cached(instance):
+        invalidate_user_summaries([instance.borrowing.borrower_id])
+        return
+
+    # Gone already when the payment is deleted along with its borrowing,
+    # whose own signal covers the borrower.
+    invalidate_user_summaries(
+        Borrowing.objects.filter(pk=instance.borrowing_id).values_list(
+            "borrower_id", flat=True
+        )
+    )
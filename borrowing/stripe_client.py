@@ -0,0 +1,137 @@
+import asyncio
+import weakref
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import httpx
+from django.conf import settings
+
+from borrowing.models import Payment
+
+CHECKOUT_SESSIONS_PATH = "/v1/checkout/sessions"
+RETRY_STATUS_CODES = (409, 429, 500, 502, 503, 504)
+
+_clients = weakref.WeakKeyDictionary()
+
+
+class StripeCheckoutError(Exception):
+    pass
+
+
+def _new_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        base_url=settings.STRIPE_API_BASE,
+        headers={"Authorization": f"Bearer {settings.STRIPE_SECRET_KEY}"},
+        timeout=httpx.Timeout(settings.STRIPE_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=settings.STRIPE_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.STRIPE_MAX_CONNECTIONS,
+        ),
+    )
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the pooled Stripe client of the running event loop.
+
+    Connections are kept alive between requests handled by the same
+    loop. Each loop gets its own client because the pool can't be
+    shared across loops.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+
+    if client is None:
+        client = _new_client()
+        _clients[loop] = client
+
+    return client
+
+
+@asynccontextmanager
+async def checkout_client(pooled: bool) -> AsyncIterator[httpx.AsyncClient]:
+    """The pooled client with ``pooled``, otherwise a client closed on
+    exit.
+
+    Only ASGI servers run every request on the same long-lived loop.
+    Under WSGI each request gets a new loop, so a pooled client would
+    never be reused and its connections would never be closed.
+    """
+    if pooled:
+        yield get_client()
+        return
+
+    async with _new_client() as client:
+        yield client
+
+
+def checkout_session_params(
+    payment: Payment, success_url: str, cancel_url: str
+) -> dict:
+    return {
+        "payment_method_types[0]": "card",
+        "line_items[0][price_data][currency]": "usd",
+        "line_items[0][price_data][unit_amount]": int(
+            payment.money_to_pay * 100
+        ),
+        "line_items[0][price_data][product_data][name]": (
+            payment.borrowing.book.title
+        ),
+        "line_items[0][price_data][product_data][description]": (
+            "Borrowing book fee"
+        ),
+        "line_items[0][quantity]": 1,
+        "mode": "payment",
+        "success_url": success_url,
+        "cancel_url": cancel_url,
+    }
+
+
+async def create_checkout_session(
+    payment: Payment, success_url: str, cancel_url: str, pooled: bool = True
+) -> dict:
+    """Create a Stripe Checkout session for ``payment``.
+
+    Requests carry an idempotency key derived from the payment id, so
+    timeouts, connection errors and retryable responses are retried
+    with exponential backoff without risking a second session.
+    ``pooled`` is passed on to ``checkout_client()``.
+    """
+    async with checkout_client(pooled) as client:
+        return await _post_checkout_session(
+            client, payment, success_url, cancel_url
+        )
+
+
+async def _post_checkout_session(
+    client: httpx.AsyncClient,
+    payment: Payment,
+    success_url: str,
+    cancel_url: str,
+) -> dict:
+    params = checkout_session_params(payment, success_url, cancel_url)
+    headers = {"Idempotency-Key": f"checkout-session-payment-{payment.id}"}
+    retries = settings.STRIPE_MAX_RETRIES
+
+    for attempt in range(retries + 1):
+        if attempt:
+            await asyncio.sleep(0.5 * 2 ** (attempt - 1))
+
+        try:
+            response = await client.post(
+                CHECKOUT_SESSIONS_PATH, data=params, headers=headers
+            )
+        except httpx.TransportError as exc:
+            if attempt == retries:
+                raise StripeCheckoutError(str(exc)) from exc
+            continue
+
+        if response.status_code in RETRY_STATUS_CODES and attempt < retries:
+            continue
+
+        if response.is_error:
+            raise StripeCheckoutError(
+                f"Stripe responded with {response.status_code}: "
+                f"{response.text}"
+            )
+
+        return response.json()
@@ -0,0 +1,118 @@
+from datetime import date
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import (
+    Count,
+    DecimalField,
+    F,
+    Min,
+    OuterRef,
+    QuerySet,
+    Subquery,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from borrowing.models import Borrowing, Payment
+
+SUMMARY_KEY = "borrowing:summary:{}:{}"
+
+
+def summary_cache_key(user_id: int, on_date: date = None) -> str:
+    # Loans turn overdue and accrue fees by the day, so every day gets
+    # its own entry.
+    return SUMMARY_KEY.format(user_id, on_date or timezone.localdate())
+
+
+def _per_borrower(
+    queryset: QuerySet, borrower: str, aggregate, default=None
+) -> Subquery:
+    """``aggregate`` over the rows of ``queryset`` that belong to the
+    outer user."""
+    subquery = Subquery(
+        queryset.filter(**{borrower: OuterRef("pk")})
+        .order_by()
+        .values(borrower)
+        .annotate(value=aggregate)
+        .values("value")
+    )
+
+    if default is None:
+        return subquery
+
+    return Coalesce(subquery, default)
+
+
+def compute_user_summary(user_id: int) -> Optional[dict]:
+    """The loan and payment totals of a user, in one query.
+
+    ``outstanding_balance`` adds up the pending payments and what the
+    active loans cost so far. Returns ``None`` for unknown users.
+    """
+    today = timezone.localdate()
+    money = DecimalField(max_digits=10, decimal_places=2)
+    active = Borrowing.objects.filter(actual_return_date__isnull=True)
+
+    return get_user_model().objects.filter(pk=user_id).annotate(
+        active_loans=_per_borrower(
+            active, "borrower", Count("id"), Value(0)
+        ),
+        overdue_loans=_per_borrower(
+            active.filter(expected_return_date__lt=today),
+            "borrower",
+            Count("id"),
+            Value(0),
+        ),
+        next_due_date=_per_borrower(
+            active, "borrower", Min("expected_return_date")
+        ),
+        accrued_fees=_per_borrower(
+            active.with_amount_due(today),
+            "borrower",
+            Sum("amount_due", output_field=money),
+            Value(Decimal(0)),
+        ),
+        pending_payments=_per_borrower(
+            Payment.objects.filter(status_payment=Payment.PENDING),
+            "borrowing__borrower",
+            Sum("money_to_pay"),
+            Value(Decimal(0)),
+        ),
+    ).annotate(
+        outstanding_balance=F("accrued_fees") + F("pending_payments"),
+    ).values(
+        "active_loans",
+        "overdue_loans",
+        "outstanding_balance",
+        "next_due_date",
+    ).first()
+
+
+def get_user_summary(user_id: int) -> Optional[dict]:
+    """``compute_user_summary()``, cached per user until one of their
+    borrowings or payments changes."""
+    key = summary_cache_key(user_id)
+    summary = cache.get(key)
+
+    if summary is None:
+        summary = compute_user_summary(user_id)
+        if summary is not None:
+            cache.set(key, summary, settings.USER_SUMMARY_CACHE_TIMEOUT)
+
+    return summary
+
+
+def invalidate_user_summaries(user_ids: Iterable[int]) -> None:
+    """Drop the cached summaries of ``user_ids`` once the current
+    transaction commits."""
+    keys = [summary_cache_key(user_id) for user_id in set(user_ids)]
+
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
@@ -0,0 +1,25 @@
+from celery import shared_task
+from django.utils.dateparse import parse_date
+
+from borrowing.billing import bill_returned_borrowings
+from borrowing.models import StripeEvent
+from borrowing.webhooks import process_stripe_events
+
+
+@shared_task
+def run_bill_returned_borrowings(returned_on: str = None) -> int:
+    return bill_returned_borrowings(
+        returned_on=parse_date(returned_on) if returned_on else None
+    )
+
+
+@shared_task
+def run_process_stripe_events() -> int:
+    processed = process_stripe_events()
+
+    if processed and StripeEvent.objects.filter(
+        processed_at__isnull=True
+    ).exists():
+        run_process_stripe_events.delay()
+
+    return processed
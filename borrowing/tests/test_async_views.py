@@ -0,0 +1,71 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import AsyncRequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken
+
+from book.models import Book
+from borrowing.async_views import borrowing_list
+from borrowing.models import Borrowing
+from user.tokens import ClaimsTokenObtainPairSerializer
+
+BORROWING_URL = reverse("borrowing:borrowing-list")
+
+
+class AsyncBorrowingListTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.factory = AsyncRequestFactory()
+        self.user = get_user_model().objects.create_user(
+            email="reader@library.com", password="testpass123"
+        )
+        other = get_user_model().objects.create_user(
+            email="other@library.com", password="testpass123"
+        )
+        book = Book.objects.create(title="Book", inventory=10, daily_fee=1)
+        today = datetime.date.today()
+        for borrower in (self.user, other, self.user):
+            Borrowing.objects.create(
+                borrow_date=today,
+                expected_return_date=today + datetime.timedelta(days=3),
+                book=book,
+                borrower=borrower,
+            )
+        self.auth = f"Bearer {AccessToken.for_user(self.user)}"
+
+    async def test_list_matches_sync_view(self) -> None:
+        for query in ("", "?is_active=true&page_size=1&page=2"):
+            expected = await self.async_client.get(
+                BORROWING_URL + query, authorization=self.auth
+            )
+
+            response = await borrowing_list(
+                self.factory.get(
+                    BORROWING_URL + query, authorization=self.auth
+                )
+            )
+
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.content, expected.content)
+
+    async def test_anonymous_user_falls_back_to_sync_view(self) -> None:
+        response = await borrowing_list(self.factory.get(BORROWING_URL))
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(JWT_STATELESS_AUTH=True)
+    async def test_claims_token_lists_own_borrowings(self) -> None:
+        token = ClaimsTokenObtainPairSerializer.get_token(
+            self.user
+        ).access_token
+
+        response = await borrowing_list(
+            self.factory.get(BORROWING_URL, authorization=f"Bearer {token}")
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(b'"count":2', response.content)
@@ -0,0 +1,96 @@
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from book.models import Book
+from borrowing import billing
+from borrowing.billing import bill_returned_borrowings
+from borrowing.models import Borrowing, Payment
+
+
+class BillReturnedBorrowingsTests(TestCase):
+    def setUp(self) -> None:
+        book = Book.objects.create(title="test", inventory=10, daily_fee=5.00)
+        borrower = get_user_model().objects.create_user(
+            email="test@test.com", password="test12345"
+        )
+        defaults = {
+            "borrow_date": date(2023, 1, 1),
+            "expected_return_date": date(2023, 1, 4),
+            "book": book,
+            "borrower": borrower,
+        }
+
+        self.returned = [
+            Borrowing.objects.create(
+                actual_return_date=date(2023, 1, 3), **defaults
+            )
+            for _ in range(5)
+        ]
+        self.late = Borrowing.objects.create(
+            actual_return_date=date(2023, 1, 5), **defaults
+        )
+        self.active = Borrowing.objects.create(**defaults)
+        self.billed = Borrowing.objects.create(
+            actual_return_date=date(2023, 1, 3), **defaults
+        )
+        Payment.objects.create(borrowing=self.billed, money_to_pay=10)
+
+    def test_bill_returned_borrowings_in_batches(self) -> None:
+        created = bill_returned_borrowings(batch_size=2)
+
+        self.assertEqual(created, 6)
+        self.assertFalse(Payment.objects.filter(borrowing=self.active))
+        self.assertEqual(Payment.objects.filter(borrowing=self.billed).count(), 1)
+        self.assertEqual(
+            Payment.objects.get(borrowing=self.returned[0]).money_to_pay,
+            Decimal("10.00")
+        )
+        self.assertEqual(
+            Payment.objects.get(borrowing=self.late).money_to_pay,
+            Decimal("25.00")
+        )
+
+    def test_bill_only_borrowings_returned_on_date(self) -> None:
+        created = bill_returned_borrowings(returned_on=date(2023, 1, 5))
+
+        self.assertEqual(created, 1)
+        self.assertTrue(Payment.objects.filter(borrowing=self.late))
+
+    def test_command_is_idempotent(self) -> None:
+        out = StringIO()
+
+        call_command("bill_returned_borrowings", stdout=out)
+        call_command("bill_returned_borrowings", stdout=out)
+
+        self.assertIn("Created 6 payments", out.getvalue())
+        self.assertIn("Created 0 payments", out.getvalue())
+        self.assertEqual(Payment.objects.count(), 7)
+
+    def test_rows_billed_by_another_run_are_skipped(self) -> None:
+        # The first selection reads the rows as they were before another
+        # run committed the payment of self.billed.
+        stale = Borrowing.objects.filter(actual_return_date__isnull=False)
+        unbilled_borrowings = billing.unbilled_borrowings
+        calls = []
+
+        def select(returned_on: date = None):
+            calls.append(returned_on)
+            if len(calls) == 1:
+                return stale
+            return unbilled_borrowings(returned_on)
+
+        with mock.patch.object(
+            billing, "unbilled_borrowings", side_effect=select
+        ):
+            created = bill_returned_borrowings()
+
+        self.assertEqual(created, 6)
+        self.assertEqual(
+            Payment.objects.filter(borrowing=self.billed).count(), 1
+        )
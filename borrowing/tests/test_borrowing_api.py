@@ -154,3 +154,20 @@ class AdminBorrowingApiTests(TestCase):
         if serializer.is_valid():
             self.assertEqual(response.status_code, status.HTTP_200_OK)
             self.assertEqual(response.data, serializer.data)
+
+    def test_return_book(self) -> None:
+        borrowing = sample_borrowing()
+        url = reverse("borrowing:borrowing-return-book", args=[borrowing.id])
+
+        response = self.client.post(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        borrowing.refresh_from_db()
+        self.assertIsNotNone(borrowing.actual_return_date)
+        self.assertEqual(borrowing.book.inventory, 11)
+
+        response = self.client.post(url)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        borrowing.book.refresh_from_db()
+        self.assertEqual(borrowing.book.inventory, 11)
@@ -0,0 +1,140 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from book.inventory import release_books, reserve_books
+from book.models import Book, Notification
+from borrowing.models import Borrowing
+
+BULK_URL = reverse("borrowing:borrowing-bulk")
+BULK_RETURN_URL = reverse("borrowing:borrowing-bulk-return")
+
+
+class InventoryBatchTests(TestCase):
+    def setUp(self) -> None:
+        self.first = Book.objects.create(title="a", inventory=2, daily_fee=1)
+        self.second = Book.objects.create(title="b", inventory=1, daily_fee=1)
+
+    def test_reserve_books_all_or_nothing(self) -> None:
+        short = reserve_books({self.first.id: 1, self.second.id: 2})
+
+        self.assertEqual(short, [self.second.id])
+        self.first.refresh_from_db()
+        self.assertEqual(self.first.inventory, 2)
+
+    def test_reserve_and_release_books(self) -> None:
+        self.assertEqual(
+            reserve_books({self.first.id: 2, self.second.id: 1}), []
+        )
+        release_books({self.first.id: 1, self.second.id: 1})
+
+        self.assertEqual(
+            dict(Book.objects.values_list("title", "inventory")),
+            {"a": 1, "b": 1},
+        )
+
+
+@override_settings(TELEGRAM_CHAT_ID="42")
+class BulkBorrowingApiTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_user(
+            "admin@test.com", "adminpass", is_staff=True
+        )
+        self.borrower = get_user_model().objects.create_user(
+            "user@test.com", "userpass", first_name="Ada", last_name="L"
+        )
+        self.client.force_authenticate(self.admin)
+        self.books = [
+            Book.objects.create(title=f"Book {index}", inventory=2, daily_fee=5)
+            for index in range(3)
+        ]
+
+    def bulk_borrow(self, book_ids: list):
+        return self.client.post(
+            BULK_URL,
+            {
+                "borrow_date": "2023-01-01",
+                "expected_return_date": "2023-01-04",
+                "borrower": self.borrower.id,
+                "books": book_ids,
+            },
+            format="json",
+        )
+
+    def test_bulk_borrow(self) -> None:
+        book_ids = [book.id for book in self.books] + [self.books[0].id]
+
+        response = self.bulk_borrow(book_ids)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            sorted(row["book"] for row in response.data), sorted(book_ids)
+        )
+        self.assertEqual(
+            list(
+                Book.objects.order_by("id").values_list("inventory", flat=True)
+            ),
+            [0, 1, 1],
+        )
+        notification = Notification.objects.get()
+        self.assertIn("4 new borrowings have been created!", notification.text)
+        self.assertIn("Borrower Name: Ada L", notification.text)
+        self.assertIn("Amount: $60.00", notification.text)
+
+    def test_bulk_borrow_out_of_stock_changes_nothing(self) -> None:
+        response = self.bulk_borrow([self.books[0].id] * 3)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["books"], [str(self.books[0].id)])
+        self.assertFalse(Borrowing.objects.exists())
+        self.assertFalse(Notification.objects.exists())
+        self.books[0].refresh_from_db()
+        self.assertEqual(self.books[0].inventory, 2)
+
+    def test_bulk_borrow_unknown_book(self) -> None:
+        response = self.bulk_borrow([self.books[0].id, 999])
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("books", response.data)
+
+    def test_bulk_borrow_forbidden_for_regular_user(self) -> None:
+        self.client.force_authenticate(self.borrower)
+
+        response = self.bulk_borrow([self.books[0].id])
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_bulk_return(self) -> None:
+        self.bulk_borrow([book.id for book in self.books])
+        ids = list(Borrowing.objects.values_list("id", flat=True))
+
+        with self.assertNumQueries(6):
+            response = self.client.post(
+                BULK_RETURN_URL, {"borrowings": ids}, format="json"
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(
+            Borrowing.objects.filter(actual_return_date__isnull=True).exists()
+        )
+        self.assertEqual(
+            set(Book.objects.values_list("inventory", flat=True)), {2}
+        )
+
+    def test_bulk_return_rejects_returned_borrowings(self) -> None:
+        self.bulk_borrow([self.books[0].id, self.books[1].id])
+        first, second = Borrowing.objects.order_by("id")
+        self.client.post(BULK_RETURN_URL, {"borrowings": [first.id]})
+
+        response = self.client.post(
+            BULK_RETURN_URL, {"borrowings": [first.id, second.id]}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["borrowings"], [str(first.id)])
+        second.refresh_from_db()
+        self.assertIsNone(second.actual_return_date)
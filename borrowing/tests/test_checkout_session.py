@@ -0,0 +1,158 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+from urllib.parse import parse_qs
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+
+from book.models import Book
+from borrowing import stripe_client
+from borrowing.models import Borrowing, Payment
+
+
+class FakeStripeHandler(BaseHTTPRequestHandler):
+    def do_POST(self) -> None:
+        length = int(self.headers["Content-Length"])
+        self.server.requests.append(
+            {
+                "path": self.path,
+                "headers": dict(self.headers),
+                "data": parse_qs(self.rfile.read(length).decode()),
+            }
+        )
+
+        if self.server.failures:
+            self.server.failures -= 1
+            self.send_response(status.HTTP_503_SERVICE_UNAVAILABLE)
+            self.end_headers()
+            return
+
+        body = json.dumps(
+            {"id": "cs_test_123", "url": "https://checkout.test/cs_test_123"}
+        ).encode()
+        self.send_response(status.HTTP_200_OK)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class CheckoutSessionTests(TestCase):
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeStripeHandler)
+        self.server.requests = []
+        self.server.failures = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        settings_override = override_settings(
+            STRIPE_API_BASE=f"http://127.0.0.1:{self.server.server_port}",
+            STRIPE_SECRET_KEY="sk_test",
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        book = Book.objects.create(title="test", inventory=10, daily_fee=5)
+        borrower = get_user_model().objects.create_user(
+            email="test@test.com", password="test12345"
+        )
+        borrowing = Borrowing.objects.create(
+            borrow_date="2023-01-01",
+            actual_return_date="2023-01-07",
+            book=book,
+            borrower=borrower,
+        )
+        self.payment = Payment.objects.create(
+            borrowing=borrowing, money_to_pay=30
+        )
+        self.url = reverse("borrowing:create-session", args=[self.payment.id])
+
+    def test_create_checkout_session(self) -> None:
+        response = self.client.get(self.url)
+
+        self.assertRedirects(
+            response,
+            "https://checkout.test/cs_test_123",
+            fetch_redirect_response=False,
+        )
+        self.payment.refresh_from_db()
+        self.assertEqual(self.payment.session_id, "cs_test_123")
+
+        request = self.server.requests[0]
+        self.assertEqual(request["path"], "/v1/checkout/sessions")
+        self.assertEqual(request["headers"]["Authorization"], "Bearer sk_test")
+        self.assertEqual(
+            request["headers"]["Idempotency-Key"],
+            f"checkout-session-payment-{self.payment.id}"
+        )
+        self.assertEqual(
+            request["data"]["line_items[0][price_data][unit_amount]"],
+            ["3000"]
+        )
+
+    @override_settings(STRIPE_MAX_RETRIES=1)
+    def test_retry_with_same_idempotency_key(self) -> None:
+        self.server.failures = 1
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_302_FOUND)
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(
+            self.server.requests[0]["headers"]["Idempotency-Key"],
+            self.server.requests[1]["headers"]["Idempotency-Key"],
+        )
+
+    @override_settings(STRIPE_MAX_RETRIES=0)
+    def test_stripe_unavailable(self) -> None:
+        self.server.failures = 1
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_502_BAD_GATEWAY)
+        self.payment.refresh_from_db()
+        self.assertEqual(self.payment.session_id, "")
+
+    def test_already_paid(self) -> None:
+        self.payment.status_payment = Payment.PAID
+        self.payment.save()
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.server.requests, [])
+
+    def test_client_is_closed_after_a_wsgi_request(self) -> None:
+        clients = []
+        new_client = stripe_client._new_client
+
+        def track_client():
+            clients.append(new_client())
+            return clients[-1]
+
+        with mock.patch.object(
+            stripe_client, "_new_client", side_effect=track_client
+        ):
+            self.client.get(self.url)
+
+        (client,) = clients
+        self.assertTrue(client.is_closed)
+
+    async def test_pooled_client_is_reused_on_the_same_loop(self) -> None:
+        async with stripe_client.checkout_client(pooled=True) as first:
+            pass
+        async with stripe_client.checkout_client(pooled=True) as second:
+            pass
+
+        self.assertIs(first, second)
+        self.assertFalse(first.is_closed)
+        await first.aclose()
@@ -0,0 +1,77 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from book.models import Book
+from borrowing.loadtest import LoadTest, percentile
+from borrowing.models import Borrowing, Payment
+from borrowing.seeding import SEED_EMAIL_DOMAIN, seed_library
+
+
+class SeedLibraryTests(TestCase):
+    def test_seed_library_creates_requested_volumes(self) -> None:
+        users = get_user_model().objects.count()
+
+        created = seed_library(books=20, users=10, borrowings=200, seed=1)
+
+        self.assertEqual(Book.objects.count(), 20)
+        self.assertEqual(get_user_model().objects.count(), users + 10)
+        self.assertEqual(Borrowing.objects.count(), 200)
+        self.assertEqual(Payment.objects.count(), created["payments"])
+        self.assertEqual(
+            created["payments"],
+            Borrowing.objects.filter(actual_return_date__isnull=False).count()
+        )
+
+    def test_seed_library_is_reproducible(self) -> None:
+        def snapshot() -> list:
+            return list(
+                Borrowing.objects.order_by("id").values_list(
+                    "borrow_date",
+                    "expected_return_date",
+                    "actual_return_date",
+                    "book__title",
+                )
+            )
+
+        seed_library(books=5, users=5, borrowings=50, seed=7)
+        first = snapshot()
+        Book.objects.all().delete()
+        get_user_model().objects.filter(
+            email__endswith=SEED_EMAIL_DOMAIN
+        ).delete()
+
+        seed_library(books=5, users=5, borrowings=50, seed=7)
+
+        self.assertEqual(snapshot(), first)
+
+
+class LoadTestTests(TestCase):
+    def test_percentile(self) -> None:
+        values = list(range(1, 101))
+
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([], 90), 0.0)
+
+    def test_load_test_reports_every_flow(self) -> None:
+        seed_library(books=20, users=10, borrowings=50, seed=3)
+
+        report = LoadTest(seed=3, browse_ratio=0.5).run(20)
+
+        self.assertEqual(
+            set(report),
+            {
+                "book list",
+                "book search",
+                "book detail",
+                "borrow",
+                "borrowing list",
+                "return",
+                "pay",
+                "payment detail",
+            },
+        )
+        for name, row in report.items():
+            self.assertEqual(row["errors"], 0, name)
+            self.assertGreater(row["queries_avg"], 0, name)
+            self.assertLessEqual(row["p50_ms"], row["p99_ms"])
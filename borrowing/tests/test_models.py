@@ -1,3 +1,6 @@
+from datetime import date
+from decimal import Decimal
+
 from django.contrib.auth import get_user_model
 from django.test import TestCase
 
@@ -51,3 +54,47 @@ class ModelsTests(TestCase):
             str(payment),
             f"Payment {payment.id} ({borrowing.book.title})"
         )
+
+
+class BorrowingAmountDueTests(TestCase):
+    def setUp(self) -> None:
+        self.book = Book.objects.create(
+            title="test", inventory=10, daily_fee=5.00
+        )
+        self.borrower = get_user_model().objects.create_user(
+            email="test@user.com", password="test12345"
+        )
+
+    def amount_due(self, **params) -> Borrowing:
+        borrowing = Borrowing.objects.create(
+            borrow_date=date(2023, 1, 1),
+            expected_return_date=date(2023, 1, 4),
+            book=self.book,
+            borrower=self.borrower,
+            **params
+        )
+
+        return Borrowing.objects.with_amount_due(
+            on_date=date(2023, 1, 10)
+        ).get(pk=borrowing.pk)
+
+    def test_returned_on_time(self) -> None:
+        borrowing = self.amount_due(actual_return_date=date(2023, 1, 3))
+
+        self.assertEqual(borrowing.days_borrowed, 3)
+        self.assertEqual(borrowing.overdue_days, 0)
+        self.assertEqual(borrowing.rental_fee, Decimal("15.00"))
+        self.assertEqual(borrowing.amount_due, Decimal("10.00"))
+
+    def test_returned_late_is_fined(self) -> None:
+        borrowing = self.amount_due(actual_return_date=date(2023, 1, 6))
+
+        self.assertEqual(borrowing.overdue_days, 2)
+        self.assertEqual(borrowing.amount_due, Decimal("35.00"))
+
+    def test_not_returned_is_priced_on_date(self) -> None:
+        borrowing = self.amount_due()
+
+        self.assertEqual(borrowing.days_actual, 9)
+        self.assertEqual(borrowing.overdue_days, 6)
+        self.assertEqual(borrowing.amount_due, Decimal("75.00"))
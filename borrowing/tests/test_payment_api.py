@@ -1,5 +1,9 @@
+from decimal import Decimal
+
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from rest_framework import status
@@ -117,3 +121,78 @@ class AdminPaymentApiTests(TestCase):
         response = self.client.post(PAYMENT_URL, payload)
 
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_create_payment_for_unreturned_borrowing(self) -> None:
+        payment = sample_payment()
+        borrowing = payment.borrowing
+        borrowing.actual_return_date = None
+        borrowing.save()
+
+        response = self.client.post(PAYMENT_URL, {"borrowing": borrowing.id})
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertGreater(
+            Payment.objects.get(id=response.data["id"]).money_to_pay, 0
+        )
+
+    def test_create_payment_computes_fine(self) -> None:
+        payment = sample_payment()
+        borrowing = payment.borrowing
+        borrowing.expected_return_date = "2023-01-04"
+        borrowing.save()
+
+        response = self.client.post(
+            PAYMENT_URL, {"borrowing": payment.borrowing.id}
+        )
+
+        self.assertEqual(
+            Payment.objects.get(id=response.data["id"]).money_to_pay,
+            Decimal("45.00")
+        )
+
+
+class PaymentListQueryCountTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@user.com", "testpassword"
+        )
+        self.admin = get_user_model().objects.create_user(
+            "admin@test.com", "adminpass", is_staff=True
+        )
+        book = Book.objects.create(title="test", inventory=10, daily_fee=5)
+        borrowings = Borrowing.objects.bulk_create(
+            Borrowing(
+                borrow_date="2023-01-01",
+                actual_return_date="2023-01-07",
+                book=book,
+                borrower=self.user,
+            )
+            for _ in range(50)
+        )
+        Payment.objects.bulk_create(
+            Payment(borrowing=borrowing, money_to_pay=30)
+            for borrowing in borrowings
+        )
+
+    def count_list_queries(self, user, page_size: int) -> int:
+        self.client.force_authenticate(user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(PAYMENT_URL, {"page_size": page_size})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), page_size)
+        self.assertEqual(
+            response.data["results"][0]["borrower_full_name"],
+            self.user.full_name,
+        )
+
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_page_size(self) -> None:
+        for user in (self.user, self.admin):
+            self.assertEqual(
+                self.count_list_queries(user, 5),
+                self.count_list_queries(user, 50),
+            )
@@ -0,0 +1,99 @@
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from book.models import Book
+from book.stats import rebuild_book_stats
+from borrowing.models import Borrowing, Payment
+from library_service.testing import QueryBudgetTestMixin
+
+
+class BorrowingQueryBudgetTests(QueryBudgetTestMixin, TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "testpassword"
+        )
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+        books = Book.objects.bulk_create(
+            Book(title=f"Book {index}", inventory=5, daily_fee=1)
+            for index in range(10)
+        )
+        borrow_date = date.today() - timedelta(days=5)
+        self.borrowings = Borrowing.objects.bulk_create(
+            Borrowing(
+                borrow_date=borrow_date,
+                expected_return_date=borrow_date + timedelta(days=3),
+                actual_return_date=borrow_date + timedelta(days=2),
+                book=book,
+                borrower=self.user,
+            )
+            for book in books
+        )
+        rebuild_book_stats()
+        self.payments = Payment.objects.bulk_create(
+            Payment(borrowing=borrowing, money_to_pay=2)
+            for borrowing in self.borrowings
+        )
+
+    def test_borrowing_list(self) -> None:
+        with self.assert_query_budget("borrowing:borrowing-list"):
+            response = self.client.get(reverse("borrowing:borrowing-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_borrowing_detail(self) -> None:
+        url = reverse(
+            "borrowing:borrowing-detail", args=[self.borrowings[0].id]
+        )
+
+        with self.assert_query_budget("borrowing:borrowing-detail"):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_return_book(self) -> None:
+        self.user.is_staff = True
+        self.user.save()
+        borrowing = self.borrowings[0]
+        Borrowing.objects.filter(pk=borrowing.pk).update(
+            actual_return_date=None
+        )
+        url = reverse("borrowing:borrowing-return-book", args=[borrowing.id])
+
+        with self.assert_query_budget(
+            "borrowing:borrowing-return-book", "POST"
+        ):
+            response = self.client.post(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_payment_list(self) -> None:
+        with self.assert_query_budget("borrowing:payment-list"):
+            response = self.client.get(reverse("borrowing:payment-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_payment_detail(self) -> None:
+        url = reverse("borrowing:payment-detail", args=[self.payments[0].id])
+
+        with self.assert_query_budget("borrowing:payment-detail"):
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_user_summary(self) -> None:
+        with self.assert_query_budget("user:summary"):
+            response = self.client.get(reverse("user:summary"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
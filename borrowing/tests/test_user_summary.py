@@ -0,0 +1,180 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from book.models import Book
+from borrowing.models import Borrowing, Payment
+from borrowing.summary import compute_user_summary
+
+SUMMARY_URL = reverse("user:summary")
+
+
+def user_summary_url(user_id: int) -> str:
+    return reverse("user:user-summary", args=[user_id])
+
+
+class UserSummaryTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com", "testpassword"
+        )
+        self.client.force_authenticate(self.user)
+        self.book = Book.objects.create(
+            title="test", inventory=10, daily_fee=Decimal("2.00")
+        )
+        self.today = date.today()
+
+    def borrow(self, days_ago: int, days: int, **kwargs) -> Borrowing:
+        borrow_date = self.today - timedelta(days=days_ago)
+        return Borrowing.objects.create(
+            borrow_date=borrow_date,
+            expected_return_date=borrow_date + timedelta(days=days),
+            book=self.book,
+            borrower=kwargs.pop("borrower", self.user),
+            **kwargs,
+        )
+
+    def test_summary_of_user_without_loans(self) -> None:
+        response = self.client.get(SUMMARY_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            {
+                "active_loans": 0,
+                "overdue_loans": 0,
+                "outstanding_balance": "0.00",
+                "next_due_date": None,
+            },
+        )
+
+    def test_summary_totals(self) -> None:
+        # Due in 2 days, 1 day borrowed so far: $2.
+        self.borrow(days_ago=1, days=3)
+        # Due 2 days ago: 3 days at $2 plus 2 days fined at $4.
+        self.borrow(days_ago=5, days=3)
+        returned = self.borrow(
+            days_ago=10, days=3,
+            actual_return_date=self.today - timedelta(days=7),
+        )
+        Payment.objects.create(borrowing=returned, money_to_pay=6)
+        Payment.objects.create(
+            borrowing=returned, money_to_pay=100, status_payment=Payment.PAID
+        )
+        other_user = get_user_model().objects.create_user(
+            "other@test.com", "testpassword"
+        )
+        self.borrow(days_ago=9, days=1, borrower=other_user)
+
+        response = self.client.get(SUMMARY_URL)
+
+        self.assertEqual(response.data["active_loans"], 2)
+        self.assertEqual(response.data["overdue_loans"], 1)
+        self.assertEqual(response.data["outstanding_balance"], "22.00")
+        self.assertEqual(
+            response.data["next_due_date"],
+            str(self.today - timedelta(days=2)),
+        )
+
+    def test_summary_is_a_single_query(self) -> None:
+        self.borrow(days_ago=1, days=3)
+
+        with CaptureQueriesContext(connection) as queries:
+            compute_user_summary(self.user.id)
+
+        self.assertEqual(len(queries), 1)
+
+    def test_summary_is_cached_until_the_user_borrows(self) -> None:
+        self.client.get(SUMMARY_URL)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(SUMMARY_URL)
+        self.assertEqual(len(queries), 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.borrow(days_ago=0, days=3)
+
+        response = self.client.get(SUMMARY_URL)
+        self.assertEqual(response.data["active_loans"], 1)
+
+    def test_summary_is_dropped_on_return(self) -> None:
+        self.user.is_staff = True
+        self.user.save()
+        borrowing = self.borrow(days_ago=1, days=3)
+        self.assertEqual(
+            self.client.get(SUMMARY_URL).data["active_loans"], 1
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("borrowing:borrowing-return-book", args=[borrowing.id])
+            )
+
+        self.assertEqual(
+            self.client.get(SUMMARY_URL).data["active_loans"], 0
+        )
+
+    def test_summary_is_dropped_on_payment_cancel(self) -> None:
+        borrowing = self.borrow(
+            days_ago=5, days=3, actual_return_date=self.today
+        )
+        Payment.objects.create(
+            borrowing=borrowing, money_to_pay=6, session_id="cs_test"
+        )
+        self.assertEqual(
+            self.client.get(SUMMARY_URL).data["outstanding_balance"], "6.00"
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.get(
+                reverse("borrowing:cancelled"), {"session_id": "cs_test"}
+            )
+
+        self.assertEqual(
+            self.client.get(SUMMARY_URL).data["outstanding_balance"], "0.00"
+        )
+
+    def test_admin_summary_of_another_user(self) -> None:
+        self.borrow(days_ago=1, days=3)
+        admin = get_user_model().objects.create_superuser(
+            "admin@test.com", "testpassword"
+        )
+        self.client.force_authenticate(admin)
+
+        response = self.client.get(user_summary_url(self.user.id))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["active_loans"], 1)
+
+    def test_admin_summary_of_unknown_user(self) -> None:
+        admin = get_user_model().objects.create_superuser(
+            "admin@test.com", "testpassword"
+        )
+        self.client.force_authenticate(admin)
+
+        response = self.client.get(user_summary_url(admin.id + 1))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_admin_summary_forbidden_for_users(self) -> None:
+        response = self.client.get(user_summary_url(self.user.id))
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_summary_requires_authentication(self) -> None:
+        self.client.force_authenticate(None)
+
+        response = self.client.get(SUMMARY_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,101 @@
+import json
+import time
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework import status
+from stripe.webhook import WebhookSignature
+
+from book.models import Book, Notification
+from borrowing.models import Borrowing, Payment, StripeEvent
+from borrowing.webhooks import process_stripe_events
+
+
+WEBHOOK_URL = reverse("borrowing:stripe-webhook")
+WEBHOOK_SECRET = "whsec_test"
+
+
+def stripe_event(event_type: str, session_id: str, event_id: str) -> dict:
+    return {
+        "id": event_id,
+        "type": event_type,
+        "data": {"object": {"id": session_id}},
+    }
+
+
+@override_settings(STRIPE_WEBHOOK_SECRET=WEBHOOK_SECRET, TELEGRAM_CHAT_ID="42")
+class StripeWebhookTests(TestCase):
+    def setUp(self) -> None:
+        book = Book.objects.create(title="test", inventory=10, daily_fee=5)
+        borrower = get_user_model().objects.create_user(
+            email="test@test.com", password="test12345"
+        )
+        self.late_borrowing = Borrowing.objects.create(
+            borrow_date="2023-01-01",
+            expected_return_date="2023-01-04",
+            actual_return_date="2023-01-07",
+            book=book,
+            borrower=borrower,
+        )
+        self.paid = Payment.objects.create(
+            borrowing=self.late_borrowing, session_id="cs_paid"
+        )
+        self.expired = Payment.objects.create(
+            borrowing=self.late_borrowing, session_id="cs_expired"
+        )
+
+    def post_event(self, event: dict, secret: str = WEBHOOK_SECRET) -> dict:
+        payload = json.dumps(event)
+        timestamp = int(time.time())
+        signature = WebhookSignature._compute_signature(
+            f"{timestamp}.{payload}", secret
+        )
+
+        return self.client.post(
+            WEBHOOK_URL,
+            payload,
+            content_type="application/json",
+            HTTP_STRIPE_SIGNATURE=f"t={timestamp},v1={signature}",
+        )
+
+    def test_webhook_records_event(self) -> None:
+        event = stripe_event("checkout.session.completed", "cs_paid", "evt_1")
+
+        response = self.post_event(event)
+        self.post_event(event)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(StripeEvent.objects.count(), 1)
+        self.paid.refresh_from_db()
+        self.assertEqual(self.paid.status_payment, Payment.PENDING)
+
+    def test_webhook_rejects_invalid_signature(self) -> None:
+        response = self.post_event(
+            stripe_event("checkout.session.completed", "cs_paid", "evt_1"),
+            secret="whsec_other",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(StripeEvent.objects.exists())
+
+    def test_process_stripe_events(self) -> None:
+        self.post_event(
+            stripe_event("checkout.session.completed", "cs_paid", "evt_1")
+        )
+        self.post_event(
+            stripe_event("checkout.session.expired", "cs_expired", "evt_2")
+        )
+
+        with self.assertNumQueries(10):
+            processed = process_stripe_events()
+
+        self.assertEqual(processed, 2)
+        self.paid.refresh_from_db()
+        self.expired.refresh_from_db()
+        self.assertEqual(self.paid.status_payment, Payment.PAID)
+        self.assertEqual(self.paid.type_payment, Payment.FINE)
+        self.assertEqual(self.expired.status_payment, Payment.EXPIRED)
+        self.assertTrue(Notification.objects.exists())
+        self.assertEqual(process_stripe_events(), 0)
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework import routers
 
@@ -7,7 +8,7 @@ from borrowing.views import (
     create_checkout_session,
     payment_success,
     payment_cancel,
-    payment_expired,
+    stripe_webhook,
 )
 
 router = routers.DefaultRouter()
@@ -24,8 +25,15 @@ urlpatterns = [
     ),
     path("success/", payment_success, name="success"),
     path("cancelled/", payment_cancel, name="cancelled"),
-    path("expired/", payment_expired, name="expired"),
+    path("webhook/stripe/", stripe_webhook, name="stripe-webhook"),
 ]
 
+if settings.ASYNC_READ_VIEWS:
+    from borrowing.async_views import borrowing_list
+
+    urlpatterns.insert(
+        0, path("borrowing/", borrowing_list, name="borrowing-list")
+    )
+
 
 app_name = "borrowing"
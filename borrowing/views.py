@@ -1,11 +1,14 @@
-from datetime import datetime
-from typing import Any
+from typing import Any, Optional
 
 import stripe
 from django.conf import settings
-from django.http import JsonResponse
+from django.core.handlers.asgi import ASGIRequest
+from django.db import transaction
+from django.http import Http404, JsonResponse
 from django.shortcuts import redirect
 from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 
 from rest_framework import viewsets, status
@@ -14,36 +17,64 @@ from rest_framework.exceptions import ValidationError
 from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 
-from book.notifications import send_successful_payment_notification
+from book.async_api import AsyncThrottleMixin
+from book.conditional import ConditionalGetMixin
+from book.fast_serializers import FastListMixin
+from book.inventory import release_copies
+from book.stats import record_returns
 from book.permissions import IsAdminOrIfAuthenticatedReadOnly
-from book.views import LibraryPagination
+from book.pagination import LibraryPagination
 
+from borrowing import stripe_client
+from borrowing.fast_serializers import BorrowingListValuesSerializer
 from borrowing.models import Borrowing, Payment
 from borrowing.serializers import (
     BorrowingSerializer,
     BorrowingListSerializer,
     BorrowingDetailSerializer,
     BorrowingCreateSerializer,
+    BorrowingBulkCreateSerializer,
+    BorrowingBulkReturnSerializer,
     BorrowingReturnBookSerializer,
     PaymentSerializer,
     PaymentUpdateSerializer,
 )
+from borrowing.summary import invalidate_user_summaries
+from borrowing.webhooks import record_stripe_event
+from library_service.replicas import ReplicaReadMixin
 
-stripe.api_key = settings.STRIPE_SECRET_KEY
 BASE_URL = "http://127.0.0.1:8000"
 
 
-class BorrowingViewSet(viewsets.ModelViewSet):
+class BorrowingViewSet(
+    AsyncThrottleMixin,
+    ReplicaReadMixin,
+    ConditionalGetMixin,
+    FastListMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Borrowing.objects.select_related("book", "borrower")
     serializer_class = {
         "list": BorrowingListSerializer,
         "retrieve": BorrowingDetailSerializer,
         "create": BorrowingCreateSerializer,
         "return_book": BorrowingReturnBookSerializer,
+        "bulk": BorrowingBulkCreateSerializer,
+        "bulk_return": BorrowingBulkReturnSerializer,
         "update": BorrowingSerializer,
         "partial_update": BorrowingSerializer
     }
+    fast_list_serializer_class = BorrowingListValuesSerializer
+    version_fields = (
+        "updated_at",
+        "book__updated_at",
+        "borrower__email",
+        "borrower__first_name",
+        "borrower__last_name",
+        "borrower__is_staff",
+    )
     pagination_class = LibraryPagination
+    keyset_ordering = ("borrow_date", "id")
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
 
     def get_queryset(self) -> queryset:
@@ -60,10 +91,15 @@ class BorrowingViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(actual_return_date__isnull=True)
 
         if is_status is False:
-            queryset = queryset.filter(borrower=self.request.user)
+            queryset = queryset.filter(borrower_id=self.request.user.id)
 
         return queryset
 
+    @property
+    def throttle_scope(self) -> Optional[str]:
+        # Checking books out has its own rate on top of the user's.
+        return "borrow" if self.action in ("create", "bulk") else None
+
     def get_serializer_class(self):
         return self.serializer_class[self.action]
 
@@ -74,21 +110,59 @@ class BorrowingViewSet(viewsets.ModelViewSet):
         if request.method == "POST":
             serializer = self.get_serializer(borrowing, data=request.data)
             if serializer.is_valid(raise_exception=True):
-                if borrowing.actual_return_date is not None:
-                    raise ValidationError(
-                        "This book has already been returned"
+                today = timezone.localdate()
+
+                with transaction.atomic():
+                    returned = Borrowing.objects.filter(
+                        pk=borrowing.pk, actual_return_date__isnull=True
+                    ).update(
+                        actual_return_date=today, updated_at=timezone.now()
                     )
 
-                borrowing.actual_return_date = timezone.now()
-                borrowing.book.inventory += 1
-                borrowing.book.save()
-                borrowing.save()
+                    if not returned:
+                        raise ValidationError(
+                            "This book has already been returned"
+                        )
+
+                    release_copies(borrowing.book_id)
+                    record_returns(
+                        [
+                            (
+                                borrowing.book_id,
+                                borrowing.borrow_date,
+                                borrowing.expected_return_date,
+                            )
+                        ],
+                        today,
+                    )
+                    invalidate_user_summaries([borrowing.borrower_id])
 
                 return Response(
                     {"status": "Your book was successfully returned"},
                     status=status.HTTP_200_OK
                 )
 
+    @action(methods=["POST"], detail=False, url_path="bulk")
+    def bulk(self, request) -> Any:
+        """Borrow several books for one borrower at once"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        borrowings = serializer.save()
+
+        return Response(
+            BorrowingSerializer(borrowings, many=True).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+    @action(methods=["POST"], detail=False, url_path="bulk-return")
+    def bulk_return(self, request) -> Any:
+        """Return several borrowings at once"""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
     @extend_schema(
         parameters=[
             OpenApiParameter(
@@ -104,18 +178,37 @@ class BorrowingViewSet(viewsets.ModelViewSet):
     def list(self, request, *args, **kwargs) -> Any:
         return super().list(request, *args, **kwargs)
 
+    def retrieve(self, request, *args, **kwargs) -> Any:
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
 
-class PaymentViewSet(viewsets.ModelViewSet):
-    queryset = Payment.objects.select_related("borrowing")
+class PaymentViewSet(
+    ReplicaReadMixin, ConditionalGetMixin, viewsets.ModelViewSet
+):
+    # The serializers show the book title and the borrower's name, so
+    # both are joined in to keep a page at a fixed number of queries.
+    queryset = Payment.objects.select_related(
+        "borrowing__book", "borrowing__borrower"
+    )
     serializer_class = PaymentSerializer
     pagination_class = LibraryPagination
+    keyset_ordering = ("id",)
     permission_classes = (IsAdminOrIfAuthenticatedReadOnly,)
+    version_fields = (
+        "updated_at",
+        "borrowing__book__title",
+        "borrowing__borrower__first_name",
+        "borrowing__borrower__last_name",
+    )
 
     def get_queryset(self) -> Payment:
         if self.request.user.is_staff:
-            return Payment.objects.select_related("borrowing")
-        return Payment.objects.filter(
-            borrowing__borrower=self.request.user
+            return self.queryset
+
+        return self.queryset.filter(
+            borrowing__borrower_id=self.request.user.id
         )
 
     def get_serializer_class(self):
@@ -124,9 +217,21 @@ class PaymentViewSet(viewsets.ModelViewSet):
 
         return PaymentSerializer
 
+    def retrieve(self, request, *args, **kwargs) -> Any:
+        return self.conditional_response(
+            super().retrieve, request, *args, **kwargs
+        )
+
 
-def create_checkout_session(request, payment_id: int) -> JsonResponse:
-    payment = Payment.objects.get(pk=payment_id)
+async def create_checkout_session(
+    request, payment_id: int
+) -> JsonResponse:
+    try:
+        payment = await Payment.objects.select_related(
+            "borrowing__book"
+        ).aget(pk=payment_id)
+    except Payment.DoesNotExist:
+        raise Http404("No Payment matches the given query.")
 
     if payment.status_payment == payment.PAID:
         return JsonResponse(
@@ -135,51 +240,31 @@ def create_checkout_session(request, payment_id: int) -> JsonResponse:
             }
         )
 
-    else:
-        session = stripe.checkout.Session.create(
-            payment_method_types=["card"],
-            line_items=[
-                {
-                    "price_data": {
-                        "currency": "usd",
-                        "unit_amount": int(payment.money_to_pay * 100),
-                        "product_data": {
-                            "name": payment.borrowing.book.title,
-                            "description": "Borrowing book fee",
-                        },
-                    },
-                    "quantity": 1,
-                },
-            ],
-            mode="payment",
+    try:
+        session = await stripe_client.create_checkout_session(
+            payment,
             success_url=BASE_URL + "/success?session_id={CHECKOUT_SESSION_ID}",
             cancel_url=BASE_URL + (
                 "/cancelled?session_id={CHECKOUT_SESSION_ID}"
             ),
+            pooled=isinstance(request, ASGIRequest),
+        )
+    except stripe_client.StripeCheckoutError:
+        return JsonResponse(
+            {"message": "Payment service is unavailable, try again later"},
+            status=status.HTTP_502_BAD_GATEWAY,
         )
 
-        payment.session_id = session.id
-        payment.session_url = session.url
-        payment.save()
+    await Payment.objects.filter(pk=payment.pk).aupdate(
+        session_id=session["id"],
+        session_url=session["url"],
+        updated_at=timezone.now(),
+    )
 
-        return redirect(payment.session_url)
+    return redirect(session["url"])
 
 
 def payment_success(request) -> JsonResponse:
-    session_id = request.GET.get("session_id")
-    payment = Payment.objects.get(session_id=session_id)
-    payment.status_payment = Payment.PAID
-
-    if (
-        payment.borrowing.actual_return_date
-        > payment.borrowing.expected_return_date
-    ):
-        payment.type_payment = Payment.FINE
-
-    payment.save()
-
-    send_successful_payment_notification(payment_id=payment.id)
-
     return JsonResponse(
         {"message": "Payment successful!"}
     )
@@ -187,9 +272,15 @@ def payment_success(request) -> JsonResponse:
 
 def payment_cancel(request) -> JsonResponse:
     session_id = request.GET.get("session_id")
-    payment = Payment.objects.get(session_id=session_id)
-    payment.status_payment = Payment.CANCELLED
-    payment.save()
+    cancelled = Payment.objects.filter(
+        session_id=session_id, status_payment=Payment.PENDING
+    )
+    invalidate_user_summaries(
+        cancelled.values_list("borrowing__borrower_id", flat=True)
+    )
+    cancelled.update(
+        status_payment=Payment.CANCELLED, updated_at=timezone.now()
+    )
 
     return JsonResponse(
         {
@@ -200,13 +291,23 @@ def payment_cancel(request) -> JsonResponse:
     )
 
 
-def payment_expired(request) -> JsonResponse:
-    session_id = request.GET.get("session_id")
-    payment = get_object_or_404(Payment, session_id=session_id)
-    session = stripe.checkout.Session.retrieve(session_id)
+@csrf_exempt
+@require_POST
+def stripe_webhook(request) -> JsonResponse:
+    if not settings.STRIPE_WEBHOOK_SECRET:
+        return JsonResponse(
+            {"message": "Stripe webhooks are not configured"},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
 
-    if session.expires_at < datetime.now(timezone.utc):
-        payment.status_payment = Payment.EXPIRED
-        payment.save()
+    try:
+        record_stripe_event(
+            request.body, request.headers.get("Stripe-Signature", "")
+        )
+    except (ValueError, stripe.error.SignatureVerificationError):
+        return JsonResponse(
+            {"message": "Invalid payload"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
 
-        return JsonResponse({"message": "Payment expired."})
+    return JsonResponse({"received": True})
@@ -0,0 +1,123 @@
+import json
+import logging
+
+import stripe
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from book.notifications import send_successful_payment_notifications
+from borrowing.models import Payment, StripeEvent
+from borrowing.summary import invalidate_user_summaries
+
+SESSION_COMPLETED = "checkout.session.completed"
+SESSION_EXPIRED = "checkout.session.expired"
+
+logger = logging.getLogger(__name__)
+
+
+def record_stripe_event(payload: bytes, signature: str) -> None:
+    """Verify a webhook payload and append it to the event log.
+
+    Raises ``ValueError`` or ``stripe.error.SignatureVerificationError``
+    for payloads that weren't signed with ``STRIPE_WEBHOOK_SECRET``.
+    Events delivered twice by Stripe are stored only once.
+    """
+    stripe.Webhook.construct_event(
+        payload, signature, settings.STRIPE_WEBHOOK_SECRET
+    )
+    event = json.loads(payload)
+
+    with transaction.atomic():
+        StripeEvent.objects.bulk_create(
+            [
+                StripeEvent(
+                    event_id=event["id"],
+                    event_type=event["type"],
+                    payload=event,
+                )
+            ],
+            ignore_conflicts=True,
+        )
+        transaction.on_commit(schedule_stripe_events_processing)
+
+
+def schedule_stripe_events_processing() -> None:
+    from borrowing.tasks import run_process_stripe_events
+
+    try:
+        run_process_stripe_events.delay()
+    except Exception:
+        logger.exception(
+            "Could not schedule Stripe events processing, "
+            "pending events stay in the log"
+        )
+
+
+def _session_ids(events: list, event_type: str) -> set:
+    return {
+        event.payload["data"]["object"]["id"]
+        for event in events
+        if event.event_type == event_type
+    }
+
+
+def process_stripe_events(batch_size: int = None) -> int:
+    """Apply one batch of pending events to their payments.
+
+    Completed sessions mark payments as paid, and as fines when the
+    book came back late; expired sessions mark unpaid payments as
+    expired. Each status transition is a single ``UPDATE`` for the
+    whole batch. Returns the number of events processed.
+    """
+    batch_size = batch_size or settings.STRIPE_EVENTS_BATCH_SIZE
+
+    with transaction.atomic():
+        events = list(
+            StripeEvent.objects.select_for_update(skip_locked=True).filter(
+                processed_at__isnull=True
+            ).order_by("id")[:batch_size]
+        )
+
+        if not events:
+            return 0
+
+        now = timezone.now()
+        unpaid = Payment.objects.exclude(status_payment=Payment.PAID)
+        expired_sessions = _session_ids(events, SESSION_EXPIRED)
+        completed_sessions = _session_ids(events, SESSION_COMPLETED)
+
+        payments = list(
+            unpaid.filter(
+                session_id__in=expired_sessions | completed_sessions
+            ).values_list("id", "session_id", "borrowing__borrower_id")
+        )
+        paid_ids = [
+            payment_id
+            for payment_id, session_id, _ in payments
+            if session_id in completed_sessions
+        ]
+        invalidate_user_summaries(payment[2] for payment in payments)
+
+        unpaid.filter(session_id__in=expired_sessions).update(
+            status_payment=Payment.EXPIRED, updated_at=now
+        )
+
+        if paid_ids:
+            Payment.objects.filter(id__in=paid_ids).update(
+                status_payment=Payment.PAID, updated_at=now
+            )
+            Payment.objects.filter(
+                id__in=paid_ids,
+                borrowing__actual_return_date__gt=F(
+                    "borrowing__expected_return_date"
+                ),
+            ).update(type_payment=Payment.FINE, updated_at=now)
+            send_successful_payment_notifications(paid_ids)
+
+        StripeEvent.objects.filter(
+            id__in=[event.id for event in events]
+        ).update(processed_at=now)
+
+    return len(events)
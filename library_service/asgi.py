@@ -12,5 +12,9 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "library_service.settings")
+os.environ.setdefault("ASYNC_READ_VIEWS", "True")
+# Sync code runs in a new thread for every request under ASGI, so
+# persistent per-thread connections would pile up. Use DB_POOL_MAX_SIZE.
+os.environ.setdefault("DB_CONN_MAX_AGE", "0")
 
 application = get_asgi_application()
@@ -0,0 +1,209 @@
+import os
+import threading
+from collections import deque
+from typing import Any, Callable, Optional
+
+from django.db.utils import OperationalError
+
+try:
+    from psycopg2 import Error as DatabaseError
+    from psycopg2.extensions import (
+        TRANSACTION_STATUS_IDLE,
+        TRANSACTION_STATUS_UNKNOWN,
+    )
+except ImportError:  # pragma: no cover
+    DatabaseError = Exception
+    TRANSACTION_STATUS_IDLE = 0
+    TRANSACTION_STATUS_UNKNOWN = 4
+
+DEFAULT_POOL_TIMEOUT = 30.0
+
+
+class ConnectionPool:
+    """Process-wide pool of database connections shared by all threads.
+
+    At most ``max_size`` connections are open at a time; a thread that
+    finds them all checked out waits up to ``timeout`` seconds for one to
+    be released before giving up with ``OperationalError``. Connections
+    come back rolled back to an idle state, and broken ones are thrown
+    away instead of being handed out again.
+    """
+
+    def __init__(
+        self, max_size: int, timeout: float = DEFAULT_POOL_TIMEOUT
+    ) -> None:
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+        self.size = 0
+        self.in_use = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.discarded = 0
+
+    def acquire(
+        self, connect: Callable, check: Optional[Callable] = None
+    ) -> Any:
+        """Check out an idle connection, or open one with ``connect()``.
+
+        Idle connections failing ``check(connection)`` are closed and
+        replaced.
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.waits += 1
+            if not self._slots.acquire(timeout=self.timeout):
+                with self._lock:
+                    self.timeouts += 1
+                raise OperationalError(
+                    f"All {self.max_size} pooled connections stayed in use "
+                    f"for {self.timeout} seconds"
+                )
+
+        try:
+            connection = self._pop_usable(check)
+            if connection is None:
+                connection = connect()
+                with self._lock:
+                    self.size += 1
+        except BaseException:
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self.in_use += 1
+
+        return connection
+
+    def release(self, connection: Any) -> None:
+        """Return ``connection`` to the pool, rolling back any open
+        transaction."""
+        try:
+            status = None if connection.closed else (
+                connection.info.transaction_status
+            )
+            if status is None or status == TRANSACTION_STATUS_UNKNOWN:
+                self._discard(connection)
+            else:
+                if status != TRANSACTION_STATUS_IDLE:
+                    connection.rollback()
+                with self._lock:
+                    self._idle.append(connection)
+        except DatabaseError:
+            self._discard(connection)
+        finally:
+            with self._lock:
+                self.in_use -= 1
+            self._slots.release()
+
+    def discard(self, connection: Any) -> None:
+        """Close a checked-out connection instead of returning it."""
+        try:
+            self._discard(connection)
+        finally:
+            with self._lock:
+                self.in_use -= 1
+            self._slots.release()
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return
+                connection = self._idle.pop()
+            self._discard(connection)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "max_size": self.max_size,
+                "size": self.size,
+                "in_use": self.in_use,
+                "idle": len(self._idle),
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "discarded": self.discarded,
+            }
+
+    def _pop_usable(self, check: Optional[Callable]) -> Any:
+        while True:
+            with self._lock:
+                if not self._idle:
+                    return None
+                # Most recently used first, so surplus connections go
+                # idle long enough for the server to time them out.
+                connection = self._idle.pop()
+
+            if not connection.closed and (check is None or check(connection)):
+                return connection
+
+            self._discard(connection)
+
+    def _discard(self, connection: Any) -> None:
+        with self._lock:
+            self.size -= 1
+            self.discarded += 1
+        try:
+            connection.close()
+        except DatabaseError:
+            pass
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+_inherited_pools = []
+
+
+def _forget_pools_after_fork() -> None:
+    # Connections inherited from the parent process share its sockets.
+    # Keep them referenced, as closing them (or letting the garbage
+    # collector do it) would end the parent's sessions.
+    _inherited_pools.extend(_pools.values())
+    _pools.clear()
+
+
+os.register_at_fork(after_in_child=_forget_pools_after_fork)
+
+
+def get_pool(alias: str, settings_dict: dict) -> ConnectionPool:
+    """The pool of the ``alias`` database, sized by its ``POOL``
+    setting."""
+    pool = _pools.get(alias)
+
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(alias)
+            if pool is None:
+                options = settings_dict.get("POOL", {})
+                pool = _pools[alias] = ConnectionPool(
+                    max_size=options.get("MAX_SIZE", 10),
+                    timeout=options.get("TIMEOUT", DEFAULT_POOL_TIMEOUT),
+                )
+
+    return pool
+
+
+def pool_stats() -> dict:
+    """``ConnectionPool.stats()`` of every pool opened so far, by
+    alias."""
+    with _pools_lock:
+        pools = sorted(_pools.items())
+
+    return {alias: pool.stats() for alias, pool in pools}
+
+
+def ping(connection: Any) -> bool:
+    """Whether a raw connection still answers a trivial query."""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except DatabaseError:
+        return False
+
+    return True
@@ -0,0 +1,370 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+
+from asgiref.sync import markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import Http404, HttpResponse, HttpResponseForbidden
+from django.utils.crypto import constant_time_compare
+
+from library_service.db_pool import pool_stats
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+UNMATCHED_VIEW = "unmatched"
+
+
+def get_query_budget(view_name: str, method: str = "GET") -> int:
+    """Budget of ``"<METHOD> <view name>"``, falling back to the budget
+    of the view name for any method and then to the default budget."""
+    budgets = settings.QUERY_BUDGETS
+
+    return budgets.get(
+        f"{method} {view_name}",
+        budgets.get(view_name, settings.DEFAULT_QUERY_BUDGET),
+    )
+
+
+class QueryTimer:
+    """Database execute wrapper counting queries and the time they take."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - started
+
+
+# The timer of the request being served. Context variables follow the
+# request into the threads the async ORM runs queries in, which a
+# per-request ``execute_wrapper`` on the calling thread's connections
+# wouldn't.
+_current_timer = ContextVar("query_timer", default=None)
+
+
+def _time_query(execute, sql, params, many, context):
+    timer = _current_timer.get()
+
+    if timer is None:
+        return execute(sql, params, many, context)
+
+    return timer(execute, sql, params, many, context)
+
+
+def install_query_timer(connection, **kwargs) -> None:
+    # Innermost, so wrappers pushed by ``execute_wrapper()`` blocks pop
+    # off the list without taking this one with them.
+    if _time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _time_query)
+
+
+connection_created.connect(install_query_timer)
+
+
+class MetricsRegistry:
+    """In-process request metrics, rendered in the Prometheus text format.
+
+    Every worker process keeps its own registry, so Prometheus has to
+    scrape each of them (or the numbers are summed by the scraper).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._responses = defaultdict(int)
+            self._views = {}
+
+    def observe(
+        self,
+        view: str,
+        method: str,
+        status_code: int,
+        duration: float,
+        queries: int,
+        db_duration: float,
+        serialization: float,
+    ) -> None:
+        with self._lock:
+            self._responses[(view, method, status_code)] += 1
+            metrics = self._views.setdefault(
+                (view, method),
+                {
+                    "count": 0,
+                    "duration": 0.0,
+                    "buckets": [0] * len(DURATION_BUCKETS),
+                    "queries": 0,
+                    "max_queries": 0,
+                    "db_duration": 0.0,
+                    "serialization": 0.0,
+                },
+            )
+            metrics["count"] += 1
+            metrics["duration"] += duration
+            metrics["queries"] += queries
+            metrics["max_queries"] = max(metrics["max_queries"], queries)
+            metrics["db_duration"] += db_duration
+            metrics["serialization"] += serialization
+
+            for index, bound in enumerate(DURATION_BUCKETS):
+                if duration <= bound:
+                    metrics["buckets"][index] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                key: {**metrics, "buckets": list(metrics["buckets"])}
+                for key, metrics in self._views.items()
+            }
+
+    def render(self) -> str:
+        with self._lock:
+            responses = dict(self._responses)
+            views = {
+                key: {**metrics, "buckets": list(metrics["buckets"])}
+                for key, metrics in self._views.items()
+            }
+
+        lines = [
+            "# HELP library_http_responses_total Responses by view "
+            "and status.",
+            "# TYPE library_http_responses_total counter",
+        ]
+        for (view, method, status_code), count in sorted(responses.items()):
+            lines.append(
+                f'library_http_responses_total{{view="{view}",'
+                f'method="{method}",status="{status_code}"}} {count}'
+            )
+
+        lines += [
+            "# HELP library_http_request_duration_seconds Total request "
+            "latency.",
+            "# TYPE library_http_request_duration_seconds histogram",
+        ]
+        for (view, method), metrics in sorted(views.items()):
+            labels = f'view="{view}",method="{method}"'
+            for bound, count in zip(DURATION_BUCKETS, metrics["buckets"]):
+                lines.append(
+                    "library_http_request_duration_seconds_bucket"
+                    f'{{{labels},le="{bound}"}} {count}'
+                )
+            lines += [
+                "library_http_request_duration_seconds_bucket"
+                f'{{{labels},le="+Inf"}} {metrics["count"]}',
+                "library_http_request_duration_seconds_sum"
+                f'{{{labels}}} {metrics["duration"]:.6f}',
+                "library_http_request_duration_seconds_count"
+                f'{{{labels}}} {metrics["count"]}',
+            ]
+
+        for name, key, kind, description in (
+            (
+                "library_db_queries_total",
+                "queries",
+                "counter",
+                "Database queries run by the view.",
+            ),
+            (
+                "library_db_queries_max",
+                "max_queries",
+                "gauge",
+                "Most queries run by a single request.",
+            ),
+            (
+                "library_db_duration_seconds_total",
+                "db_duration",
+                "counter",
+                "Time spent waiting for the database.",
+            ),
+            (
+                "library_serialization_duration_seconds_total",
+                "serialization",
+                "counter",
+                "Time spent in the view and renderer outside of the "
+                "database, mostly serializing.",
+            ),
+        ):
+            lines += [f"# HELP {name} {description}", f"# TYPE {name} {kind}"]
+            for (view, method), metrics in sorted(views.items()):
+                value = metrics[key]
+                value = f"{value:.6f}" if isinstance(value, float) else value
+                lines.append(
+                    f'{name}{{view="{view}",method="{method}"}} {value}'
+                )
+
+        pools = pool_stats()
+        for name, key, kind, description in (
+            (
+                "library_db_pool_max_size",
+                "max_size",
+                "gauge",
+                "Most connections the pool may open.",
+            ),
+            (
+                "library_db_pool_connections",
+                "size",
+                "gauge",
+                "Connections open in the pool.",
+            ),
+            (
+                "library_db_pool_in_use",
+                "in_use",
+                "gauge",
+                "Connections checked out of the pool.",
+            ),
+            (
+                "library_db_pool_waits_total",
+                "waits",
+                "counter",
+                "Checkouts that had to wait for a free connection.",
+            ),
+            (
+                "library_db_pool_timeouts_total",
+                "timeouts",
+                "counter",
+                "Checkouts that gave up waiting.",
+            ),
+            (
+                "library_db_pool_discarded_total",
+                "discarded",
+                "counter",
+                "Broken connections closed instead of being reused.",
+            ),
+        ):
+            if not pools:
+                break
+            lines += [f"# HELP {name} {description}", f"# TYPE {name} {kind}"]
+            for alias, stats in pools.items():
+                lines.append(f'{name}{{database="{alias}"}} {stats[key]}')
+
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+class RequestMetricsMiddleware:
+    """Record latency, query count, database time and serialization time
+    of every request, and warn when a view goes over its query budget.
+
+    Serialization time is the time between the view being called and
+    the rendered response coming back, minus the database time in that
+    window. For DRF views it is spent almost entirely in serializers and
+    renderers.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+
+        if asyncio.iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+        for connection in connections.all():
+            install_query_timer(connection)
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        started, token = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_timer.reset(token)
+
+        self.finish(request, response, started)
+        return response
+
+    async def __acall__(self, request):
+        started, token = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_timer.reset(token)
+
+        self.finish(request, response, started)
+        return response
+
+    @staticmethod
+    def start(request) -> tuple:
+        timer = QueryTimer()
+        request._metrics_timer = timer
+
+        return time.perf_counter(), _current_timer.set(timer)
+
+    @staticmethod
+    def finish(request, response, started: float) -> None:
+        finished = time.perf_counter()
+        timer = request._metrics_timer
+        match = request.resolver_match
+        view = match.view_name if match else UNMATCHED_VIEW
+        serialization = 0.0
+
+        view_started = getattr(request, "_metrics_view_started", None)
+        if view_started is not None:
+            serialization = max(
+                finished - view_started
+                - (timer.duration - request._metrics_db_before_view),
+                0.0,
+            )
+
+        registry.observe(
+            view=view,
+            method=request.method,
+            status_code=response.status_code,
+            duration=finished - started,
+            queries=timer.count,
+            db_duration=timer.duration,
+            serialization=serialization,
+        )
+
+        budget = get_query_budget(view, request.method)
+        if match and timer.count > budget:
+            logger.warning(
+                "%s %s ran %d queries, over its budget of %d",
+                request.method,
+                view,
+                timer.count,
+                budget,
+            )
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._metrics_view_started = time.perf_counter()
+        request._metrics_db_before_view = request._metrics_timer.duration
+
+
+def metrics_view(request) -> HttpResponse:
+    """The metrics in the Prometheus text format, only with
+    ``METRICS_ENABLED`` and, if set, the ``METRICS_TOKEN`` bearer
+    token."""
+    if not settings.METRICS_ENABLED:
+        raise Http404
+
+    if settings.METRICS_TOKEN and not constant_time_compare(
+        request.headers.get("Authorization", ""),
+        f"Bearer {settings.METRICS_TOKEN}",
+    ):
+        return HttpResponseForbidden()
+
+    return HttpResponse(
+        registry.render(), content_type="text/plain; version=0.0.4"
+    )
@@ -0,0 +1,42 @@
+from django.db.backends.postgresql import base
+
+from library_service.db_pool import get_pool, ping
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """PostgreSQL backend checking connections out of a process-wide
+    ``ConnectionPool`` instead of opening one per request.
+
+    Closing the connection, which Django does at the end of every request
+    with ``CONN_MAX_AGE = 0``, puts it back in the pool. With
+    ``CONN_HEALTH_CHECKS`` on, idle connections are pinged before being
+    handed out again.
+    """
+
+    def get_new_connection(self, conn_params):
+        self.pool = get_pool(self.alias, self.settings_dict)
+        connection = self.pool.acquire(
+            connect=lambda: super(
+                DatabaseWrapper, self
+            ).get_new_connection(conn_params),
+            check=ping if self.settings_dict["CONN_HEALTH_CHECKS"] else None,
+        )
+
+        options = self.settings_dict["OPTIONS"]
+        self.isolation_level = options.get(
+            "isolation_level", connection.isolation_level
+        )
+
+        return connection
+
+    def _close(self):
+        if self.connection is None:
+            return
+
+        with self.wrap_database_errors:
+            if self.in_atomic_block:
+                # Django keeps the connection around until the atomic
+                # block exits, so it can't go back to the pool yet.
+                self.pool.discard(self.connection)
+            else:
+                self.pool.release(self.connection)
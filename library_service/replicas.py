@@ -0,0 +1,135 @@
+import random
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar
+from typing import Iterable, Iterator, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+
+PIN_KEY = "replicas:pin:{}"
+CATALOG_PIN = "catalog"
+
+# The replica reads of the current request or task go to, if any.
+_replica = ContextVar("replica", default=None)
+
+
+@contextmanager
+def read_from_replicas() -> Iterator[None]:
+    """Send the reads in the block to one replica picked at random.
+
+    Reads stay on the primary without replicas, and inside transactions
+    on the primary, which must see their own writes.
+    """
+    token = _replica.set(choose_replica())
+    try:
+        yield
+    finally:
+        _replica.reset(token)
+
+
+def choose_replica() -> Optional[str]:
+    if not settings.DATABASE_REPLICAS:
+        return None
+
+    # The same replica for the whole block, so its reads agree with each
+    # other even when the replicas lag by different amounts.
+    return random.choice(settings.DATABASE_REPLICAS)
+
+
+def user_pin(user) -> Optional[str]:
+    return str(user.pk) if user.is_authenticated else None
+
+
+def pin_to_primary(*pins: Optional[str]) -> None:
+    """Keep the readers behind ``pins`` on the primary for
+    ``REPLICA_PIN_SECONDS``, so they see the writes they just made."""
+    pins = [pin for pin in pins if pin]
+
+    if settings.DATABASE_REPLICAS and pins:
+        cache.set_many(
+            {PIN_KEY.format(pin): True for pin in pins},
+            settings.REPLICA_PIN_SECONDS,
+        )
+
+
+def is_pinned(pins: Iterable[Optional[str]]) -> bool:
+    keys = [PIN_KEY.format(pin) for pin in pins if pin]
+    return bool(keys) and bool(cache.get_many(keys))
+
+
+async def replica_reads(
+    pins: Iterable[Optional[str]],
+) -> AbstractContextManager:
+    """``read_from_replicas()``, or a no-op when replicas are off or
+    ``pins`` are pinned to the primary. For async views."""
+    keys = [PIN_KEY.format(pin) for pin in pins if pin]
+
+    if not settings.DATABASE_REPLICAS or (
+        keys and await cache.aget_many(keys)
+    ):
+        return nullcontext()
+
+    return read_from_replicas()
+
+
+class ReplicaRouter:
+    """Route reads to the replica chosen by ``read_from_replicas()`` and
+    everything else to the primary."""
+
+    def db_for_read(self, model, **hints) -> Optional[str]:
+        replica = _replica.get()
+
+        if replica is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+
+        return replica
+
+    def db_for_write(self, model, **hints) -> str:
+        # Without an answer Django would write objects back to the
+        # database they were read from.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool:
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints) -> bool:
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaReadMixin:
+    """Serve safe-method requests from a replica.
+
+    Users who wrote through the API in the last ``REPLICA_PIN_SECONDS``
+    keep reading from the primary. Authentication, permissions and
+    throttling run on the primary before the switch.
+    """
+
+    _replica_token = None
+
+    def get_replica_pins(self, request) -> list:
+        return [user_pin(request.user)]
+
+    def initial(self, request, *args, **kwargs) -> None:
+        super().initial(request, *args, **kwargs)
+
+        if (
+            settings.DATABASE_REPLICAS
+            and request.method in SAFE_METHODS
+            and not is_pinned(self.get_replica_pins(request))
+        ):
+            self._replica_token = _replica.set(choose_replica())
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if self._replica_token is not None:
+            _replica.reset(self._replica_token)
+            self._replica_token = None
+
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+        ):
+            pin_to_primary(user_pin(request.user))
+
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -30,7 +30,9 @@ SECRET_KEY = os.getenv("SECRET_KEY")
 
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.getenv("DEBUG", "True") == "True"
+
+DEBUG_TOOLBAR = DEBUG and os.getenv("DEBUG_TOOLBAR", "True") == "True"
 
 ALLOWED_HOSTS = []
 
@@ -48,9 +50,9 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "drf_spectacular",
-    "debug_toolbar",
     "book",
     "user",
     "borrowing",
@@ -58,8 +60,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "library_service.metrics.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -68,6 +70,10 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+if DEBUG_TOOLBAR:
+    INSTALLED_APPS.append("debug_toolbar")
+    MIDDLEWARE.insert(2, "debug_toolbar.middleware.DebugToolbarMiddleware")
+
 ROOT_URLCONF = "library_service.urls"
 
 TEMPLATES = [
@@ -107,9 +113,96 @@ DATABASES = {
         "PASSWORD": os.getenv("POSTGRES_PASSWORD"),
         "HOST": os.getenv("POSTGRES_HOST"),
         "PORT": os.getenv("POSTGRES_PORT"),
+        # Keep connections open between requests instead of reconnecting
+        # every time, pinging them before reuse.
+        "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": (
+            os.getenv("DB_CONN_HEALTH_CHECKS", "True") == "True"
+        ),
+        # PgBouncer in transaction mode can't keep server-side cursors
+        # open across transactions.
+        "DISABLE_SERVER_SIDE_CURSORS": (
+            os.getenv("DB_PGBOUNCER", "False") == "True"
+        ),
     }
 }
 
+# Share up to DB_POOL_MAX_SIZE connections between the threads of each
+# process. Connections go back to the pool at the end of every request.
+DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", 0))
+
+if DB_POOL_MAX_SIZE:
+    DATABASES["default"].update(
+        ENGINE="library_service.postgresql_pool",
+        CONN_MAX_AGE=0,
+        POOL={
+            "MAX_SIZE": DB_POOL_MAX_SIZE,
+            "TIMEOUT": float(os.getenv("DB_POOL_TIMEOUT", 30)),
+        },
+    )
+
+
+# Read replicas, as comma-separated "host[:port]" of servers holding
+# the same database as the primary. Safe-method API requests read from
+# them; a user's reads stay on the primary for REPLICA_PIN_SECONDS after
+# each of their writes.
+DATABASE_REPLICAS = []
+
+for index, address in enumerate(
+    filter(None, os.getenv("POSTGRES_REPLICA_HOSTS", "").split(","))
+):
+    replica_host, _, replica_port = address.strip().partition(":")
+    DATABASES[f"replica_{index + 1}"] = {
+        **DATABASES["default"],
+        "HOST": replica_host,
+        "PORT": replica_port or DATABASES["default"]["PORT"],
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(f"replica_{index + 1}")
+
+if DATABASE_REPLICAS:
+    DATABASE_ROUTERS = ["library_service.replicas.ReplicaRouter"]
+
+REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", 5))
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+
+# Rate limits are token buckets in this Redis, shared by every process.
+# Without it, or for THROTTLE_REDIS_RETRY seconds after it fails to
+# answer within THROTTLE_REDIS_TIMEOUT, each process counts on its own
+# in the default cache.
+THROTTLE_REDIS_URL = os.getenv(
+    "THROTTLE_REDIS_URL", os.getenv("REDIS_CACHE_URL")
+)
+THROTTLE_REDIS_TIMEOUT = float(os.getenv("THROTTLE_REDIS_TIMEOUT", 0.25))
+THROTTLE_REDIS_RETRY = float(os.getenv("THROTTLE_REDIS_RETRY", 30))
+
+if os.getenv("REDIS_CACHE_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_CACHE_URL"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+BOOK_CATALOG_CACHE_TIMEOUT = int(
+    os.getenv("BOOK_CATALOG_CACHE_TIMEOUT", 5 * 60)
+)
+# Cached user summaries are dropped on every borrow, return and payment
+# of the user; the timeout only bounds changes made behind the API's
+# back, such as a new daily fee.
+USER_SUMMARY_CACHE_TIMEOUT = int(
+    os.getenv("USER_SUMMARY_CACHE_TIMEOUT", 5 * 60)
+)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
@@ -161,15 +254,38 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "library_service.throttling.AnonTokenBucketThrottle",
+        "library_service.throttling.UserTokenBucketThrottle",
+        "library_service.throttling.ScopedTokenBucketThrottle",
     ],
-    "DEFAULT_THROTTLE_RATES": {"anon": "100/day", "user": "1000/day"},
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": os.getenv("ANON_THROTTLE_RATE", "100/day"),
+        "user": os.getenv("USER_THROTTLE_RATE", "1000/day"),
+        "catalog": os.getenv("CATALOG_THROTTLE_RATE", "300/min"),
+        "borrow": os.getenv("BORROW_THROTTLE_RATE", "30/min"),
+    },
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     )
 }
 
+# Build list pages from .values() rows and render them with orjson
+# instead of going through the DRF serializer fields for every row.
+FAST_LIST_SERIALIZATION = (
+    os.getenv("FAST_LIST_SERIALIZATION", "False") == "True"
+)
+
+if FAST_LIST_SERIALIZATION:
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = (
+        "book.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    )
+
+# Serve plain JSON reads of the book list and detail and the borrowing
+# list from async views. Only worth it under ASGI, where asgi.py turns
+# it on; under WSGI every async view costs an event loop per request.
+ASYNC_READ_VIEWS = os.getenv("ASYNC_READ_VIEWS", "False") == "True"
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Library Service API",
     "DESCRIPTION": "System management of borrowing and "
@@ -188,18 +304,88 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=5),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     "ROTATE_REFRESH_TOKENS": False,
+    "TOKEN_OBTAIN_SERIALIZER": "user.tokens.ClaimsTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "user.tokens.ClaimsTokenRefreshSerializer",
+}
+
+# Authenticate API requests from the is_staff and full_name claims of
+# the access token instead of loading the user on every request. Views
+# needing the whole user read it through a per-process cache holding
+# users for USER_CACHE_TTL seconds.
+JWT_STATELESS_AUTH = os.getenv("JWT_STATELESS_AUTH", "False") == "True"
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", 30))
+
+if JWT_STATELESS_AUTH:
+    REST_FRAMEWORK["DEFAULT_AUTHENTICATION_CLASSES"] = (
+        "user.authentication.StatelessJWTAuthentication",
+    )
+
+# /metrics answers 404 unless enabled, and with METRICS_TOKEN set only to
+# requests sending it as "Authorization: Bearer <token>".
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "False") == "True"
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# Most queries a single request may run before a warning is logged, by
+# "<METHOD> <URL name>" or by URL name for any method. The same budgets
+# are asserted in the API tests.
+DEFAULT_QUERY_BUDGET = int(os.getenv("DEFAULT_QUERY_BUDGET", 20))
+QUERY_BUDGETS = {
+    "library:book-list": 4,
+    "library:book-detail": 3,
+    "borrowing:borrowing-list": 3,
+    "POST borrowing:borrowing-list": 9,
+    "borrowing:borrowing-detail": 3,
+    "POST borrowing:borrowing-return-book": 7,
+    "borrowing:payment-list": 3,
+    "POST borrowing:payment-list": 4,
+    "borrowing:payment-detail": 3,
+    "user:summary": 2,
+    "user:user-summary": 2,
 }
 
 FINE_MULTIPLIER = 2
+BILLING_BATCH_SIZE = int(os.getenv("BILLING_BATCH_SIZE", 500))
 
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
+TELEGRAM_SEND_INTERVAL = float(os.getenv("TELEGRAM_SEND_INTERVAL", 1))
+NOTIFICATIONS_BATCH_SIZE = int(os.getenv("NOTIFICATIONS_BATCH_SIZE", 100))
+# A worker holds the batch it delivers for NOTIFICATIONS_CLAIM_SECONDS,
+# which has to cover a batch of sends and intervals. Messages Telegram
+# rejects NOTIFICATIONS_MAX_ATTEMPTS times are given up on.
+NOTIFICATIONS_CLAIM_SECONDS = int(
+    os.getenv("NOTIFICATIONS_CLAIM_SECONDS", 600)
+)
+NOTIFICATIONS_MAX_ATTEMPTS = int(os.getenv("NOTIFICATIONS_MAX_ATTEMPTS", 5))
+# Beat drains the outbox every NOTIFICATIONS_DELIVERY_INTERVAL seconds, so
+# rows are delivered even when the enqueue on commit or its retries failed.
+NOTIFICATIONS_DELIVERY_INTERVAL = float(
+    os.getenv("NOTIFICATIONS_DELIVERY_INTERVAL", 60)
+)
+OVERDUE_REPORT_CHUNK_SIZE = 2000
+# Each run of the overdue report handles at most OVERDUE_BATCH_SIZE newly
+# overdue borrowings, and also picks up loans created up to
+# OVERDUE_LOOKBACK_DAYS behind the due dates already reported.
+OVERDUE_BATCH_SIZE = int(os.getenv("OVERDUE_BATCH_SIZE", 500))
+OVERDUE_LOOKBACK_DAYS = int(os.getenv("OVERDUE_LOOKBACK_DAYS", 7))
 
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND")
 CELERY_TIMEZONE = "Europe/Kyiv"
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT = 30 * 60
+CELERY_BEAT_SCHEDULE = {
+    "deliver-notifications": {
+        "task": "book.tasks.run_deliver_notifications",
+        "schedule": NOTIFICATIONS_DELIVERY_INTERVAL,
+    },
+}
 
 STRIPE_PUBLIC_KEY = os.getenv("STRIPE_PUBLIC_KEY")
 STRIPE_SECRET_KEY = os.getenv("STRIPE_SECRET_KEY")
+STRIPE_API_BASE = os.getenv("STRIPE_API_BASE", "https://api.stripe.com")
+STRIPE_TIMEOUT = float(os.getenv("STRIPE_TIMEOUT", 10))
+STRIPE_MAX_RETRIES = int(os.getenv("STRIPE_MAX_RETRIES", 2))
+STRIPE_MAX_CONNECTIONS = int(os.getenv("STRIPE_MAX_CONNECTIONS", 20))
+STRIPE_WEBHOOK_SECRET = os.getenv("STRIPE_WEBHOOK_SECRET")
+STRIPE_EVENTS_BATCH_SIZE = int(os.getenv("STRIPE_EVENTS_BATCH_SIZE", 100))
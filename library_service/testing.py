@@ -0,0 +1,28 @@
+from contextlib import contextmanager
+from typing import Iterator
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from library_service.metrics import get_query_budget
+
+
+class QueryBudgetTestMixin:
+    """TestCase helpers asserting the query budgets from settings."""
+
+    @contextmanager
+    def assert_query_budget(
+        self, view_name: str, method: str = "GET"
+    ) -> Iterator[None]:
+        budget = get_query_budget(view_name, method)
+
+        with CaptureQueriesContext(connection) as queries:
+            yield
+
+        self.assertLessEqual(
+            len(queries),
+            budget,
+            f"{method} {view_name} ran {len(queries)} queries, "
+            f"over its budget of {budget}:\n"
+            + "\n".join(query["sql"] for query in queries.captured_queries),
+        )
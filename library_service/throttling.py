@@ -0,0 +1,129 @@
+import logging
+import time
+from typing import Any, Optional
+
+import redis
+from django.conf import settings
+from rest_framework.throttling import (
+    AnonRateThrottle,
+    ScopedRateThrottle,
+    UserRateThrottle,
+)
+
+logger = logging.getLogger(__name__)
+
+# Refill the bucket for the time since the last request, then take a
+# token if there is one. The bucket is a two-field hash that expires
+# once it would be full again, so an idle client costs nothing. Time
+# comes from the Redis server, so web servers with skewed clocks agree.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local per_ms = tonumber(ARGV[2])
+local clock = redis.call("TIME")
+local now = clock[1] * 1000 + math.floor(clock[2] / 1000)
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "ts")
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(now - ts, 0) * per_ms)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = math.ceil((1 - tokens) / per_ms)
+end
+redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "ts", now)
+redis.call("PEXPIRE", KEYS[1], math.ceil((capacity - tokens) / per_ms) + 1)
+return wait
+"""
+
+_client = None
+_script = None
+_down_until = 0.0
+
+
+def get_token_bucket_script() -> Optional[Any]:
+    """The registered token bucket script, or ``None`` without
+    ``THROTTLE_REDIS_URL``."""
+    global _client, _script
+
+    if not settings.THROTTLE_REDIS_URL:
+        return None
+
+    if _script is None:
+        _client = redis.Redis.from_url(
+            settings.THROTTLE_REDIS_URL,
+            socket_timeout=settings.THROTTLE_REDIS_TIMEOUT,
+            socket_connect_timeout=settings.THROTTLE_REDIS_TIMEOUT,
+        )
+        _script = _client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    return _script
+
+
+class TokenBucketMixin:
+    """Throttle with a token bucket in Redis shared by every process.
+
+    A rate of ``N/period`` allows bursts of ``N`` requests and refills
+    at ``N`` per period, in one atomic script call per request. Without
+    Redis, or for ``THROTTLE_REDIS_RETRY`` seconds after it failed, the
+    DRF throttle's own per-process cache history is used instead.
+    """
+
+    def allow_request(self, request, view) -> bool:
+        global _down_until
+
+        if self.rate is None:
+            return True
+
+        script = get_token_bucket_script()
+        if script is None or time.monotonic() < _down_until:
+            return super().allow_request(request, view)
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        per_ms = self.num_requests / (self.duration * 1000)
+
+        try:
+            wait_ms = script(keys=[self.key], args=[self.num_requests, per_ms])
+        except redis.RedisError:
+            logger.warning(
+                "Throttling from the local cache, Redis is unavailable",
+                exc_info=True,
+            )
+            _down_until = time.monotonic() + settings.THROTTLE_REDIS_RETRY
+            return super().allow_request(request, view)
+
+        self.wait_seconds = int(wait_ms) / 1000
+        return not wait_ms
+
+    def wait(self) -> Optional[float]:
+        if hasattr(self, "wait_seconds"):
+            return self.wait_seconds
+        return super().wait()
+
+
+class AnonTokenBucketThrottle(TokenBucketMixin, AnonRateThrottle):
+    pass
+
+
+class UserTokenBucketThrottle(TokenBucketMixin, UserRateThrottle):
+    pass
+
+
+class ScopedTokenBucketThrottle(TokenBucketMixin, ScopedRateThrottle):
+    """Applies to views setting ``throttle_scope``, at the rate of that
+    scope, on top of the anonymous and user rates."""
+
+    def allow_request(self, request, view) -> bool:
+        # ScopedRateThrottle only learns its rate from the view.
+        self.scope = getattr(view, self.scope_attr, None)
+
+        if not self.scope:
+            return True
+
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+
+        return super().allow_request(request, view)
@@ -0,0 +1,83 @@
+import threading
+import time
+from typing import Any, Optional
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.authentication import (
+    JWTStatelessUserAuthentication,
+)
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+from user.tokens import STAFF_CLAIM
+
+USER_CACHE_MAX_SIZE = 10000
+
+_users = {}
+_users_lock = threading.Lock()
+
+
+def get_cached_user(user_id: Any) -> Optional[Any]:
+    """The user with ``user_id``, read at most ``USER_CACHE_TTL`` seconds
+    ago by this process, or ``None`` if there is none.
+
+    The instance is shared between threads: read it, don't change it.
+    """
+    now = time.monotonic()
+
+    with _users_lock:
+        cached = _users.get(user_id)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    user = get_user_model().objects.filter(
+        **{api_settings.USER_ID_FIELD: user_id}
+    ).first()
+
+    with _users_lock:
+        if len(_users) >= USER_CACHE_MAX_SIZE:
+            # Oldest entries first.
+            del _users[next(iter(_users))]
+        _users[user_id] = (now + settings.USER_CACHE_TTL, user)
+
+    return user
+
+
+def forget_cached_user(user_id: Any) -> None:
+    with _users_lock:
+        _users.pop(user_id, None)
+
+
+def has_user_claims(token) -> bool:
+    return STAFF_CLAIM in token
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """Authenticate as a ``TokenUser`` built from the token's claims,
+    without a query.
+
+    Tokens issued before the claims were added go through the user
+    cache instead. Users deactivated since their token was issued keep
+    access until it expires; refreshing checks them again.
+    """
+
+    def get_user(self, validated_token) -> Any:
+        if has_user_claims(validated_token):
+            return super().get_user(validated_token)
+
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            return super().get_user(validated_token)
+
+        user = get_cached_user(user_id)
+
+        if user is None:
+            raise AuthenticationFailed("User not found", code="user_not_found")
+        if not user.is_active:
+            raise AuthenticationFailed(
+                "User is inactive", code="user_inactive"
+            )
+
+        return user
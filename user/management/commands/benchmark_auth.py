@@ -0,0 +1,74 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+
+from book.permissions import IsAdminOrIfAuthenticatedReadOnly
+from user.authentication import StatelessJWTAuthentication
+from user.tokens import ClaimsTokenObtainPairSerializer
+
+
+class Command(BaseCommand):
+    """Django command to compare the time and queries the JWT
+    authentication and permission check add to every request"""
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        factory = APIRequestFactory()
+        permission = IsAdminOrIfAuthenticatedReadOnly()
+
+        with transaction.atomic():
+            user = get_user_model().objects.create_user(
+                "benchmark-auth@library.com", "benchmark"
+            )
+            plain_token = AccessToken.for_user(user)
+            claims_token = ClaimsTokenObtainPairSerializer.get_token(
+                user
+            ).access_token
+            cases = (
+                ("JWTAuthentication", JWTAuthentication(), plain_token),
+                (
+                    "Stateless, claims",
+                    StatelessJWTAuthentication(),
+                    claims_token,
+                ),
+                (
+                    "Stateless, cached user",
+                    StatelessJWTAuthentication(),
+                    plain_token,
+                ),
+            )
+
+            self.stdout.write(
+                f"{'authentication':<28}{'us/request':>12}"
+                f"{'queries/request':>18}"
+            )
+            for name, authentication, token in cases:
+                request = Request(
+                    factory.get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+                )
+
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    for _ in range(options["requests"]):
+                        request.user = authentication.authenticate(
+                            request
+                        )[0]
+                        permission.has_permission(request, None)
+                    elapsed = time.perf_counter() - started
+
+                self.stdout.write(
+                    f"{name:<28}"
+                    f"{elapsed / options['requests'] * 1e6:>12.1f}"
+                    f"{len(queries) / options['requests']:>18.2f}"
+                )
+
+            transaction.set_rollback(True)
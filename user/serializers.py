@@ -29,3 +29,12 @@ class UserSerializer(serializers.ModelSerializer):
             user.save()
 
         return user
+
+
+class UserSummarySerializer(serializers.Serializer):
+    active_loans = serializers.IntegerField()
+    overdue_loans = serializers.IntegerField()
+    outstanding_balance = serializers.DecimalField(
+        max_digits=10, decimal_places=2
+    )
+    next_due_date = serializers.DateField(allow_null=True)
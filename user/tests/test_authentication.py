@@ -0,0 +1,156 @@
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from book.models import Book
+from borrowing.models import Borrowing
+from user.authentication import StatelessJWTAuthentication, get_cached_user
+from user.tokens import ClaimsTokenObtainPairSerializer
+
+TOKEN_URL = reverse("user:token_obtain_pair")
+TOKEN_REFRESH_URL = reverse("user:token_refresh")
+BOOK_URL = reverse("library:book-list")
+BORROWING_URL = reverse("borrowing:borrowing-list")
+ME_URL = reverse("user:manage")
+
+
+class StatelessAuthenticationTests(TestCase):
+    def setUp(self) -> None:
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            "test@test.com",
+            "testpassword",
+            first_name="Test",
+            last_name="User",
+        )
+        self.factory = APIRequestFactory()
+
+    def authenticate(self, token) -> tuple:
+        request = self.factory.get(
+            "/", HTTP_AUTHORIZATION=f"Bearer {token}"
+        )
+        return StatelessJWTAuthentication().authenticate(request)
+
+    def token_user(self, user) -> TokenUser:
+        token = ClaimsTokenObtainPairSerializer.get_token(user).access_token
+        return TokenUser(token)
+
+    def test_obtained_tokens_carry_user_claims(self) -> None:
+        response = self.client.post(
+            TOKEN_URL, {"email": "test@test.com", "password": "testpassword"}
+        )
+        access = AccessToken(response.data["access"])
+
+        self.assertFalse(access["is_staff"])
+        self.assertEqual(access["full_name"], "Test User")
+
+    def test_claims_authenticate_without_queries(self) -> None:
+        token = ClaimsTokenObtainPairSerializer.get_token(
+            self.user
+        ).access_token
+
+        with self.assertNumQueries(0):
+            user, _ = self.authenticate(token)
+
+        self.assertIsInstance(user, TokenUser)
+        self.assertEqual(user.id, self.user.id)
+        self.assertFalse(user.is_staff)
+        self.assertEqual(user.full_name, "Test User")
+
+    def test_tokens_without_claims_use_the_user_cache(self) -> None:
+        token = AccessToken.for_user(self.user)
+
+        with self.assertNumQueries(1):
+            user, _ = self.authenticate(token)
+        with self.assertNumQueries(0):
+            self.authenticate(token)
+
+        self.assertEqual(user, self.user)
+
+    def test_tokens_without_claims_of_inactive_users_fail(self) -> None:
+        self.user.is_active = False
+        self.user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(AccessToken.for_user(self.user))
+
+    def test_saved_users_leave_the_cache(self) -> None:
+        get_cached_user(self.user.id)
+        self.user.first_name = "Changed"
+        self.user.save()
+
+        self.assertEqual(get_cached_user(self.user.id).first_name, "Changed")
+
+    def test_refresh_reads_claims_again(self) -> None:
+        refresh = ClaimsTokenObtainPairSerializer.get_token(self.user)
+        self.user.is_staff = True
+        self.user.save()
+
+        response = self.client.post(
+            TOKEN_REFRESH_URL, {"refresh": str(refresh)}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(AccessToken(response.data["access"])["is_staff"])
+
+    def test_refresh_fails_for_inactive_users(self) -> None:
+        refresh = RefreshToken.for_user(self.user)
+        self.user.is_active = False
+        self.user.save()
+
+        response = self.client.post(
+            TOKEN_REFRESH_URL, {"refresh": str(refresh)}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_staff_claim_grants_write_access(self) -> None:
+        payload = {"title": "test", "inventory": 1, "daily_fee": "1.00"}
+        self.client.force_authenticate(self.token_user(self.user))
+
+        response = self.client.post(BOOK_URL, payload)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.user.is_staff = True
+        self.client.force_authenticate(self.token_user(self.user))
+
+        response = self.client.post(BOOK_URL, payload)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_token_users_see_only_their_borrowings(self) -> None:
+        book = Book.objects.create(title="test", inventory=5, daily_fee=1)
+        other = get_user_model().objects.create_user(
+            "other@test.com", "testpassword"
+        )
+        for borrower in (self.user, other):
+            Borrowing.objects.create(
+                borrow_date=date.today(),
+                expected_return_date=date.today() + timedelta(days=3),
+                book=book,
+                borrower=borrower,
+            )
+        self.client.force_authenticate(self.token_user(self.user))
+
+        response = self.client.get(BORROWING_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
+
+    def test_token_users_read_and_update_their_profile(self) -> None:
+        self.client.force_authenticate(self.token_user(self.user))
+
+        response = self.client.get(ME_URL)
+        self.assertEqual(response.data["email"], "test@test.com")
+
+        response = self.client.patch(ME_URL, {"first_name": "New"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, "New")
@@ -0,0 +1,47 @@
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import Token
+
+STAFF_CLAIM = "is_staff"
+FULL_NAME_CLAIM = "full_name"
+
+
+def add_user_claims(token: Token, user) -> Token:
+    """Copy what the API needs to know about ``user`` into ``token``, so
+    requests can be authenticated without loading the user."""
+    token[STAFF_CLAIM] = user.is_staff
+    token[FULL_NAME_CLAIM] = user.full_name
+    return token
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user) -> Token:
+        return add_user_claims(super().get_token(user), user)
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """Read the claims from the user again on every refresh, so lost
+    staff rights and deactivated users last no longer than an access
+    token."""
+
+    def validate(self, attrs) -> dict:
+        refresh = self.token_class(attrs["refresh"])
+        user_id = refresh[api_settings.USER_ID_CLAIM]
+        user = get_user_model().objects.filter(
+            **{api_settings.USER_ID_FIELD: user_id}
+        ).first()
+
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(
+                "No active account found for this token", "user_inactive"
+            )
+
+        return super().validate(
+            {"refresh": str(add_user_claims(refresh, user))}
+        )
@@ -4,7 +4,12 @@ from rest_framework_simplejwt.views import (
     TokenRefreshView
 )
 
-from user.views import CreateUserView, ManageUserView
+from user.views import (
+    AdminUserSummaryView,
+    CreateUserView,
+    ManageUserView,
+    UserSummaryView,
+)
 
 app_name = "user"
 
@@ -14,4 +19,10 @@ urlpatterns = [
     path("token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("me/", ManageUserView.as_view(), name="manage"),
+    path("me/summary/", UserSummaryView.as_view(), name="summary"),
+    path(
+        "<int:pk>/summary/",
+        AdminUserSummaryView.as_view(),
+        name="user-summary",
+    ),
 ]
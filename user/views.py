@@ -1,8 +1,22 @@
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.http import Http404
+from drf_spectacular.utils import extend_schema
 from rest_framework import generics
-from rest_framework.permissions import IsAuthenticated
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework.generics import get_object_or_404
+from rest_framework.permissions import (
+    SAFE_METHODS,
+    IsAdminUser,
+    IsAuthenticated,
+)
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.models import TokenUser
 
-from user.serializers import UserSerializer
+from borrowing.summary import get_user_summary
+from user.authentication import get_cached_user
+from user.serializers import UserSerializer, UserSummarySerializer
 
 
 class CreateUserView(generics.CreateAPIView):
@@ -11,8 +25,46 @@ class CreateUserView(generics.CreateAPIView):
 
 class ManageUserView(generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
-    authentication_classes = (JWTAuthentication,)
     permission_classes = (IsAuthenticated,)
 
     def get_object(self):
-        return self.request.user
+        user = self.request.user
+
+        if not isinstance(user, TokenUser):
+            return user
+
+        if self.request.method in SAFE_METHODS:
+            user = get_cached_user(user.id)
+            if user is None:
+                raise Http404
+            return user
+
+        return get_object_or_404(get_user_model(), pk=user.id)
+
+
+class UserSummaryView(APIView):
+    """Active and overdue loans, outstanding balance and next due date
+    of the current user."""
+
+    permission_classes = (IsAuthenticated,)
+
+    def get_user_id(self) -> int:
+        return self.request.user.id
+
+    @extend_schema(responses=UserSummarySerializer)
+    def get(self, request, *args, **kwargs) -> Any:
+        summary = get_user_summary(self.get_user_id())
+
+        if summary is None:
+            raise Http404
+
+        return Response(UserSummarySerializer(summary).data)
+
+
+class AdminUserSummaryView(UserSummaryView):
+    """The summary of any user, for staff."""
+
+    permission_classes = (IsAdminUser,)
+
+    def get_user_id(self) -> int:
+        return self.kwargs["pk"]